@@ -1 +1,51 @@
+"""
+simpsons_rpg - A simple text-based RPG featuring The Simpsons characters
 
+Run the game with:
+    python -m simpsons_rpg
+
+Submodules are only imported when first used. The most common names can
+be taken straight from the package (e.g. simpsons_rpg.run_game or
+simpsons_rpg.Homer); the module behind each name is imported on first
+access (PEP 562 module __getattr__), so 'import simpsons_rpg' is cheap.
+"""
+
+# Public name -> submodule that defines it
+_LAZY_NAMES = {
+    "run_game": "game",
+    "Simpson": "base_characters",
+    "Homer": "simpson_characters",
+    "Marge": "simpson_characters",
+    "Bart": "simpson_characters",
+    "Lisa": "simpson_characters",
+    "Maggie": "simpson_characters",
+    "Resident": "simpson_characters",
+    "Family": "family",
+    "HomersCar": "vehicles",
+    "Engine": "vehicles",
+    "Wheel": "vehicles",
+    "DuffBeer": "items",
+    "Skateboard": "items",
+    "NuclearPlant": "items",
+    "Saxophone": "items",
+    "load_catalog": "catalog",
+    "Population": "population",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    """Imports the submodule behind a public name on first access."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module # Not at the top: keeps 'import simpsons_rpg' lean
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    """Lists the lazy names too, for tab completion."""
+    return sorted(set(globals()) | set(_LAZY_NAMES))
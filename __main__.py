@@ -0,0 +1,8 @@
+"""
+__main__.py - Lets the game be started with: python -m simpsons_rpg
+"""
+
+from simpsons_rpg.main import main
+
+if __name__ == "__main__":
+    main()
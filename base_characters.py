@@ -10,7 +10,11 @@ class Simpson(CanSpeak):
     Corresponds to the Simpson class in the UML diagram.
     Inherits from CanSpeak (like 'realizing' the interface).
     """
-    def __init__(self, name, age, secret):
+    # __slots__ lists the attributes up front, so instances need no __dict__.
+    # This makes each character much smaller when thousands are in memory.
+    __slots__ = ("name", "age", "_secret", "catchphrase")
+
+    def __init__(self, name, age, secret, catchphrase=None):
         """Initializes a Simpson character with basic attributes."""
         # Attributes: Data that describes an object
         # +String name (Public convention - no special prefix)
@@ -20,12 +24,16 @@ class Simpson(CanSpeak):
         # -String _secret (Private convention - using single underscore _ )
         # In Python, a single underscore is a convention meaning "internal use only".
         self._secret = secret # Changed from __secret for simplicity
+        # +String catchphrase (Public) - what speak() says; None means the class's own line
+        self.catchphrase = catchphrase
 
     # Implementation of the 'speak' method from CanSpeak
     def speak(self):
         """Generic speak method - intended to be overridden."""
         # This method is primarily here to satisfy the interface for the base class.
         # The specific character speaks are in the subclasses.
+        if self.catchphrase is not None:
+            return self.catchphrase
         return f"Hello from {self.name} (base Simpson)!"
 
     # Public method to access the "private" attribute
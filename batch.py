@@ -0,0 +1,72 @@
+"""
+batch.py - Runs many headless game sessions in one process
+
+Usage:
+    python -m simpsons_rpg.batch [sessions] [seed] [policy]
+where policy is one of the names in policies.POLICIES (default: uniform).
+"""
+
+import sys
+import time
+
+from simpsons_rpg.game import run_game
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.policies import POLICIES, UniformPolicy, policy_players
+
+
+class BatchResult:
+    """
+    The outcome of a batch of sessions.
+    Keeps every DayResult plus the wall time it took to play them.
+    """
+    def __init__(self, days, seconds):
+        """Initializes a batch result."""
+        self.days = days
+        self.seconds = seconds
+
+    @property
+    def sessions(self):
+        """Number of sessions played."""
+        return len(self.days)
+
+    @property
+    def sessions_per_second(self):
+        """Throughput of the batch."""
+        if self.seconds == 0:
+            return float("inf")
+        return self.sessions / self.seconds
+
+    def __str__(self):
+        """String representation of the batch result."""
+        return (f"{self.sessions} sessions in {self.seconds:.3f}s "
+                f"({self.sessions_per_second:,.0f} sessions/second)")
+
+
+def run_batch(sessions, make_player=None, sink=None):
+    """
+    Plays 'sessions' headless days back to back and times them.
+    make_player(i) builds the player for session i; by default session i
+    picks uniformly from day i's own random stream (see policies.py), so a
+    batch is reproducible.
+    The narration goes to 'sink' (see narration.py); by default it is discarded.
+    """
+    if make_player is None:
+        make_player = policy_players(UniformPolicy())
+    if sink is None:
+        sink = NullSink()
+
+    days = []
+    with use_sink(sink):
+        start = time.perf_counter()
+        for i in range(sessions):
+            days.append(run_game(make_player(i)))
+        seconds = time.perf_counter() - start
+    return BatchResult(days, seconds)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    base_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    policy = POLICIES[sys.argv[3] if len(sys.argv) > 3 else "uniform"]
+    result = run_batch(count, policy_players(policy, base_seed))
+    print(result)
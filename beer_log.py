@@ -0,0 +1,79 @@
+"""
+beer_log.py - Contains the containers that remember what Homer drank
+
+Both classes answer the same questions: how many beers in total, how many
+of a brand, and which were the last few. BeerList keeps every beer (the
+original list behavior); BeerTally only keeps counters and an optional
+bounded history, so its size does not grow over long sessions. BeerTally
+is not a list: it cannot give back every beer, so it has no len() or
+iteration. Code that works with both uses append() and the queries.
+"""
+
+from itertools import islice
+
+
+class BeerList(list):
+    """
+    Keeps every beer in a plain list (the original behavior).
+    Fine for small games; the queries scan the list.
+    """
+    __slots__ = ()
+
+    def total(self):
+        """Number of beers drunk."""
+        return len(self)
+
+    def count_brand(self, brand):
+        """Number of beers of a brand drunk."""
+        return sum(1 for beer in self if beer.brand == brand)
+
+    def brands(self):
+        """A {brand: count} dictionary of everything drunk."""
+        counts = {}
+        for beer in self:
+            counts[beer.brand] = counts.get(beer.brand, 0) + 1
+        return counts
+
+    def recent(self, n):
+        """The last n beers, oldest first."""
+        return self[max(len(self) - n, 0):] if n > 0 else []
+
+
+class BeerTally:
+    """
+    Keeps per-brand counters and a bounded ring buffer of recent beers.
+    Every query is O(1) (recent(n) is O(n) in the beers returned) and
+    memory stays constant however much Homer drinks.
+    """
+    __slots__ = ("_total", "_counts", "_recent")
+
+    def __init__(self, history=10):
+        """Initializes an empty tally that remembers the last 'history' beers."""
+        self._total = 0
+        self._counts = {}
+        from collections import deque # Only tallies need it
+        self._recent = deque(maxlen=history)
+
+    def append(self, beer):
+        """Counts a beer (same name as list.append, so Homer works with both)."""
+        self._total += 1
+        self._counts[beer.brand] = self._counts.get(beer.brand, 0) + 1
+        self._recent.append(beer)
+
+    def total(self):
+        """Number of beers drunk."""
+        return self._total
+
+    def count_brand(self, brand):
+        """Number of beers of a brand drunk."""
+        return self._counts.get(brand, 0)
+
+    def brands(self):
+        """A {brand: count} dictionary of everything drunk."""
+        return dict(self._counts)
+
+    def recent(self, n):
+        """The last n beers (at most 'history' of them), oldest first."""
+        latest_first = list(islice(reversed(self._recent), max(n, 0)))
+        latest_first.reverse()
+        return latest_first
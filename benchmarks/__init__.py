@@ -0,0 +1,6 @@
+"""
+benchmarks - Performance benchmarks for the Simpsons RPG
+
+Each module can be run on its own, e.g.:
+    python -m simpsons_rpg.benchmarks.narration
+"""
@@ -0,0 +1,68 @@
+"""
+catalog.py - Measures loading a large cast with and without the compiled cache
+
+Writes a catalog of 'count' generated residents to a temporary directory,
+then times a cold load (JSON parsing plus validation, which also writes
+the cache) against a warm load (hash the file, read the marshal cache),
+and the time to create every character from the loaded catalog.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.catalog [count]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from simpsons_rpg.catalog import load_catalog
+
+
+def _generated_catalog(count):
+    """Returns catalog data with 'count' residents in families of four."""
+    return {
+        "version": 1,
+        "places": {"plant": {"kind": "NuclearPlant", "name": "Springfield Nuclear Power Plant"}},
+        "items": {"duff": {"kind": "DuffBeer", "spec": "Regular"}},
+        "characters": [
+            {"name": f"Resident {i}", "class": "Resident", "age": 20 + i % 60,
+             "family": f"Family {i // 4}", "secret": f"Secret number {i}",
+             "catchphrase": f"Catchphrase number {i}!"}
+            for i in range(count)
+        ],
+    }
+
+
+def _best_of(func, repeat=5):
+    """Returns the fastest of 'repeat' timings of func(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count=500):
+    """Prints cold and warm load times for a catalog of 'count' residents."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.json")
+        with open(path, "w") as f:
+            json.dump(_generated_catalog(count), f)
+
+        cold = _best_of(lambda: load_catalog(path, use_cache=False))
+        load_catalog(path) # Writes the cache
+        warm = _best_of(lambda: load_catalog(path))
+        cast = load_catalog(path)
+        names = [record[1] for record in cast.characters]
+        create = _best_of(lambda: [cast.create(name) for name in names])
+
+    print(f"Catalog of {count:,} residents")
+    print(f"  parse + validate: {cold * 1e3:8.3f} ms")
+    print(f"  compiled cache:   {warm * 1e3:8.3f} ms  ({cold / warm:.1f}x faster)")
+    print(f"  create everyone:  {create * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
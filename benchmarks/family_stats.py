@@ -0,0 +1,89 @@
+"""
+family_stats.py - Measures a dashboard poll of family totals: full scan vs running totals
+
+A big household (Homers, Barts and Residents; some Homers have been
+drinking and some Barts own skateboards) is polled for its member counts
+by class, mean age, total beers and number of skateboard owners:
+  * scan: FamilyStats.from_members, one pass over every member;
+  * running: the family's own stats, kept up to date on every change.
+Also times the mutations that keep the totals up to date.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.family_stats [members]
+"""
+
+import sys
+import timeit
+
+from simpsons_rpg.family import Family, FamilyStats
+from simpsons_rpg.items import get_duff_beer, get_skateboard
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.simpson_characters import Homer, Bart, Resident
+
+
+def build_family(size):
+    """Returns a Family of 'size' members with some beers and skateboards."""
+    beer = get_duff_beer("Duff")
+    skateboard = get_skateboard("Krusty")
+    members = []
+    for i in range(size):
+        kind = i % 3
+        if kind == 0:
+            member = Homer(f"Homer {i}", 20 + i % 50, None)
+            for _ in range(i % 4):
+                member.drunk_beers.append(beer)
+        elif kind == 1:
+            member = Bart(f"Bart {i}", 5 + i % 10, None)
+            if i % 2:
+                member.skateboard = skateboard
+        else:
+            member = Resident(f"Resident {i}", i % 90, None)
+        members.append(member)
+    family = Family("Springfield")
+    with use_sink(NullSink()):
+        family.add_members(members)
+    return family
+
+
+def poll(stats):
+    """What a dashboard reads."""
+    return (stats.count(Homer), stats.count(Bart), stats.count(Resident),
+            stats.mean_age, stats.beers, len(stats.skateboarders))
+
+
+def main(size=100_000):
+    """Prints the cost of a poll both ways, and of the mutations."""
+    family = build_family(size)
+    family.verify_stats()
+    assert poll(family.stats) == poll(FamilyStats.from_members(family.members))
+
+    number = 5
+    scan = min(timeit.repeat(lambda: poll(FamilyStats.from_members(family.members)),
+                             number=number, repeat=5)) / number
+    number = 100_000
+    running = min(timeit.repeat(lambda: poll(family.stats), number=number, repeat=5)) / number
+    print(f"{size:,} members, one poll:")
+    print(f"  scan:    {scan * 1e3:10.3f} ms")
+    print(f"  running: {running * 1e3:10.4f} ms ({scan / running:,.0f}x faster)")
+
+    homer, bart = family.get("Homer 0"), family.get("Bart 1")
+    beer = get_duff_beer("Duff")
+    skateboard = get_skateboard("Krusty")
+    with use_sink(NullSink()):
+        drink = min(timeit.repeat(lambda: homer.drink(beer), number=number, repeat=5)) / number
+        toggle = min(timeit.repeat(lambda: (bart.set_skateboard(None), bart.set_skateboard(skateboard)),
+                                   number=number, repeat=5)) / number / 2
+        extra = Resident("Visitor", 40, None)
+        churn = min(timeit.repeat(lambda: (family.add_member(extra), family.remove_member(extra)),
+                                  number=number, repeat=5)) / number
+    # Assigning a plain list still works (it becomes a BeerList) and is counted
+    homer.drunk_beers = [beer] * 3
+    family.verify_stats()
+    print("Keeping the totals up to date:")
+    print(f"  Homer.drink:         {drink * 1e6:8.2f} us")
+    print(f"  Bart.set_skateboard: {toggle * 1e6:8.2f} us")
+    print(f"  add + remove member: {churn * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,139 @@
+"""
+loadgen.py - Load generator for the game server
+
+Starts server.py in a subprocess, then either:
+  * plays many sessions at once and reports the round-trip latency of
+    every prompt (p50/p99) and sessions per second, or
+  * (--idle) opens many connections that never answer and reports the
+    server's memory per idle session (from /proc/<pid>/status, Linux only).
+
+Usage:
+    python -m simpsons_rpg.benchmarks.loadgen [--sessions 1000] [--concurrency 100]
+    python -m simpsons_rpg.benchmarks.loadgen --idle 10000
+    python -m simpsons_rpg.benchmarks.loadgen --unix /tmp/springfield.sock
+Opening 10k connections needs 'ulimit -n' above 10k for both processes.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from simpsons_rpg.server import PROMPT_PREFIX
+
+PROMPT = PROMPT_PREFIX.encode()
+
+
+def _percentile(sorted_values, fraction):
+    """Returns the value at 'fraction' (0..1) of a sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _server_rss_kb(pid):
+    """Returns the resident memory of a process in kB (Linux only)."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def _connect(args):
+    """Opens one connection to the server."""
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def _play_session(args, latencies):
+    """Plays one whole session, answering '1' to every prompt."""
+    reader, writer = await _connect(args)
+    try:
+        sent = None
+        async for line in reader: # Narration lines, then a prompt
+            if line.startswith(PROMPT):
+                if sent is not None:
+                    latencies.append(time.perf_counter() - sent)
+                sent = time.perf_counter()
+                writer.write(b"1\n")
+                await writer.drain()
+    finally:
+        writer.close()
+
+
+async def _run_sessions(args):
+    """Plays args.sessions sessions, at most args.concurrency at a time."""
+    latencies = []
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with limit:
+            await _play_session(args, latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.sessions)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    print(f"{args.sessions} sessions in {seconds:.2f}s "
+          f"({args.sessions / seconds:,.0f} sessions/s, concurrency {args.concurrency})")
+    print(f"Prompt round trip: p50 {_percentile(latencies, 0.50) * 1e3:.3f} ms, "
+          f"p99 {_percentile(latencies, 0.99) * 1e3:.3f} ms, "
+          f"max {latencies[-1] * 1e3 if latencies else 0:.3f} ms")
+
+
+async def _hold_idle(args, server_pid):
+    """Opens args.idle connections that stop at the first prompt, then measures memory."""
+    before = _server_rss_kb(server_pid)
+    connections = []
+    for _ in range(args.idle):
+        reader, writer = await _connect(args)
+        await reader.readuntil(PROMPT) # The session is now waiting for us
+        connections.append(writer)
+    await asyncio.sleep(0.5)
+    after = _server_rss_kb(server_pid)
+    print(f"{args.idle} idle sessions: server RSS {before:,} kB -> {after:,} kB "
+          f"({(after - before) * 1024 / args.idle:,.0f} bytes per session)")
+    for writer in connections:
+        writer.close()
+
+
+def _start_server(args):
+    """Starts the server in a subprocess and waits until it is listening."""
+    command = [sys.executable, "-m", "simpsons_rpg.server"]
+    command += ["--unix", args.unix] if args.unix else ["--host", args.host, "--port", str(args.port)]
+    if args.unix and os.path.exists(args.unix):
+        os.unlink(args.unix)
+    server = subprocess.Popen(command, stdout=subprocess.PIPE)
+    server.stdout.readline() # "Springfield is open on ..."
+    return server
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simpsons RPG server load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--idle", type=int, metavar="N",
+                        help="measure memory with N idle sessions instead")
+    args = parser.parse_args(argv)
+
+    server = _start_server(args)
+    try:
+        if args.idle:
+            asyncio.run(_hold_idle(args, server.pid))
+        else:
+            asyncio.run(_run_sessions(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
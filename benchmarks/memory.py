@@ -0,0 +1,100 @@
+"""
+memory.py - Measures bytes per family and per car
+
+Compares the slotted classes (and the CarFleet struct-of-arrays store)
+with the original layout, where every object carried a __dict__. The
+original layout is rebuilt here with plain classes holding the same
+attributes, so both sides store exactly the same data.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.memory [count]
+"""
+
+import sys
+import tracemalloc
+
+from simpsons_rpg.family import Family
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie
+from simpsons_rpg.vehicles import CarFleet, HomersCar
+
+
+def _dict_class(name, fields):
+    """Builds a plain (unslotted) class that stores 'fields' in its __dict__."""
+    def __init__(self, *values):
+        for field, value in zip(fields, values):
+            setattr(self, field, value)
+    return type(name, (), {"__init__": __init__})
+
+
+# The original layout: same attributes, one __dict__ per instance
+_DictFamily = _dict_class("Family", ("lastName", "members"))
+_DictHomer = _dict_class("Homer", ("name", "age", "_secret", "drunk_beers", "car"))
+_DictBart = _dict_class("Bart", ("name", "age", "_secret", "skateboard"))
+_DictSimpson = _dict_class("Simpson", ("name", "age", "_secret"))
+_DictCar = _dict_class("HomersCar", ("model", "color", "engine", "wheels", "occupants", "driver"))
+_DictEngine = _dict_class("Engine", ("type",))
+_DictWheel = _dict_class("Wheel", ("size",))
+
+
+def _dict_family():
+    """Builds one family in the original layout."""
+    family = _DictFamily("Simpson", [])
+    family.members.extend([
+        _DictHomer("Homer", 39, "I love donuts more than Marge", [], None),
+        _DictSimpson("Marge", 36, "I once almost had an affair"),
+        _DictBart("Bart", 10, "I'm actually a good student but hide it", None),
+        _DictSimpson("Lisa", 8, "I sometimes wish I wasn't so smart"),
+        _DictSimpson("Maggie", 1, "I shot Mr. Burns"),
+    ])
+    return family
+
+
+def _slotted_family():
+    """Builds one family with the current (slotted) classes."""
+    family = Family("Simpson")
+    family.add_members([
+        Homer("Homer", 39, "I love donuts more than Marge"),
+        Marge("Marge", 36, "I once almost had an affair"),
+        Bart("Bart", 10, "I'm actually a good student but hide it"),
+        Lisa("Lisa", 8, "I sometimes wish I wasn't so smart"),
+        Maggie("Maggie", 1, "I shot Mr. Burns"),
+    ])
+    return family
+
+
+def _dict_car():
+    """Builds one car in the original layout."""
+    return _DictCar("Sedan", "Pink", _DictEngine("V8"),
+                    [_DictWheel(16) for _ in range(4)], [], None)
+
+
+def _bytes_per_object(build, count):
+    """Returns the bytes allocated per object when building 'count' of them."""
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        keep.append(build())
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def run(count=10000):
+    """Returns {case: bytes per object}."""
+    fleet = CarFleet()
+    with use_sink(NullSink()):
+        return {
+            "family, __dict__ (original)": _bytes_per_object(_dict_family, count),
+            "family, __slots__": _bytes_per_object(_slotted_family, count),
+            "car, __dict__ (original)": _bytes_per_object(_dict_car, count),
+            "car, __slots__": _bytes_per_object(lambda: HomersCar("Sedan", "Pink"), count),
+            "car, CarFleet arrays": _bytes_per_object(lambda: fleet.add_car("Sedan", "Pink"), count),
+        }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for case, size in run(count).items():
+        print(f"{case:>28}: {size:8.1f} bytes")
@@ -0,0 +1,37 @@
+"""
+narration.py - Benchmarks headless days with each narration sink
+
+Compares the original behavior (one print() per line) with the buffered,
+in-memory and null sinks. Output goes to os.devnull so the terminal does
+not skew the numbers.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.narration [sessions]
+"""
+
+import contextlib
+import os
+import sys
+
+from simpsons_rpg.batch import run_batch
+from simpsons_rpg.narration import BufferedSink, ListSink, NullSink, PrintSink
+
+
+def run(sessions=5000):
+    """Runs the same batch once per sink and returns {sink name: BatchResult}."""
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results["print (original)"] = run_batch(sessions, sink=PrintSink())
+        results["buffered"] = run_batch(sessions, sink=BufferedSink(devnull))
+        results["list"] = run_batch(sessions, sink=ListSink())
+        results["null (narration off)"] = run_batch(sessions, sink=NullSink())
+    return results
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = run(sessions)
+    baseline = results["print (original)"].sessions_per_second
+    for name, result in results.items():
+        speedup = result.sessions_per_second / baseline
+        print(f"{name:>22}: {result}  x{speedup:.2f}")
@@ -0,0 +1,84 @@
+"""
+population.py - Measures a town's day as objects and as a columnar Population
+
+The object version gives every resident a Homer object (so they can work
+and drink) and every household a HomersCar, and calls the methods one by
+one with the narration discarded. The columnar version runs
+Population.day_step on the same number of residents. The object version
+is timed on a smaller town and scaled up, since a million objects would
+take minutes.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.population [residents] [object_residents]
+Needs NumPy.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from simpsons_rpg.items import NuclearPlant, get_duff_beer
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.population import WORKING_AGES, Population
+from simpsons_rpg.simpson_characters import Homer
+from simpsons_rpg.vehicles import HomersCar
+
+
+def _object_town(population):
+    """Builds Homer and HomersCar objects matching a (small) Population."""
+    cars = [HomersCar("Sedan", "Pink") for _ in range(population.car_count)]
+    residents = []
+    for i in range(len(population)):
+        resident = Homer(f"Resident {i}", int(population.ages[i]), None)
+        car = int(population.cars[i])
+        resident.car = cars[car] if car >= 0 else None
+        residents.append(resident)
+    return residents, cars
+
+
+def _object_day(residents, cars, plant, beer, rng, drink_probability=0.3):
+    """The same day as Population.day_step, one method call at a time."""
+    low, high = WORKING_AGES
+    drinks = rng.random(len(residents)) < drink_probability
+    for resident in residents:
+        if low <= resident.age < high:
+            resident.go_to_work(plant)
+    for resident, drinks_today in zip(residents, drinks):
+        if drinks_today and resident.age >= 21:
+            resident.drink(beer)
+    for resident in residents:
+        if resident.car is not None:
+            resident.car.add_occupant(resident)
+    for car in cars:
+        for occupant in list(car.occupants):
+            car.remove_occupant(occupant)
+
+
+def main(size=1_000_000, object_size=20_000):
+    """Prints seconds per day-step for both layouts."""
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    town = Population.generate(size, seed=0)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    result = town.day_step(rng)
+    columnar = time.perf_counter() - start
+
+    small = Population.generate(object_size, seed=0)
+    plant, beer = NuclearPlant("Springfield Nuclear Power Plant"), get_duff_beer("Regular")
+    with use_sink(NullSink()):
+        residents, cars = _object_town(small)
+        start = time.perf_counter()
+        _object_day(residents, cars, plant, beer, rng)
+        objects = (time.perf_counter() - start) * size / object_size
+
+    print(f"{town} (built in {built:.2f}s)")
+    print(f"  columnar day-step: {columnar:8.3f} s  {result}")
+    print(f"  objects (scaled from {object_size:,}): {objects:8.3f} s  "
+          f"({objects / columnar:,.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
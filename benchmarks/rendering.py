@@ -0,0 +1,104 @@
+"""
+rendering.py - Micro-benchmark of string rendering on narration-heavy paths
+
+"before" swaps the original __str__ methods back in, which formatted the
+string on every call; "after" uses the cached renderings. The narration
+paths (_drive, drink, pay_for_item, play) are timed with a ListSink, so
+every line is really built.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.rendering [number]
+"""
+
+import contextlib
+import sys
+import timeit
+
+from simpsons_rpg.beer_log import BeerTally
+from simpsons_rpg.items import (DuffBeer, NuclearPlant, Saxophone, Skateboard,
+                                get_duff_beer, get_saxophone, get_skateboard)
+from simpsons_rpg.narration import ListSink, use_sink
+from simpsons_rpg.simpson_characters import Homer, Lisa
+from simpsons_rpg.vehicles import HomersCar
+
+
+# --- The original (uncached) renderings ---
+def _original_beer(beer):
+    """The original DuffBeer.__str__."""
+    return f"Duff {beer.brand} Beer"
+
+
+def _original_skateboard(skateboard):
+    """The original Skateboard.__str__."""
+    return f"{skateboard.model} Skateboard"
+
+
+def _original_saxophone(sax):
+    """The original Saxophone.__str__."""
+    return f"{sax.type} Saxophone"
+
+
+def _original_car(car):
+    """The original HomersCar.__str__."""
+    engine = f"{car.engine.type} Engine"
+    wheel = f"{car.wheels[0].size}-inch Wheels"
+    return f"{car.color} {car.model} with {engine} and {len(car.wheels)} {wheel}"
+
+
+# Classes whose __str__ is swapped for the original one during "before"
+_ORIGINALS = {DuffBeer: _original_beer, Skateboard: _original_skateboard,
+              Saxophone: _original_saxophone, HomersCar: _original_car}
+
+
+@contextlib.contextmanager
+def _original_rendering():
+    """Temporarily puts the original, uncached __str__ methods back."""
+    cached = {cls: cls.__str__ for cls in _ORIGINALS}
+    for cls, original in _ORIGINALS.items():
+        cls.__str__ = original
+    try:
+        yield
+    finally:
+        for cls, method in cached.items():
+            cls.__str__ = method
+
+
+def run(number=100000):
+    """Returns {case: (before microseconds, after microseconds)} per call."""
+    homer = Homer("Homer", 39, "I love donuts more than Marge", BeerTally(history=0))
+    lisa = Lisa("Lisa", 8, "I sometimes wish I wasn't so smart")
+    car = HomersCar("Sedan", "Pink")
+    plant = NuclearPlant("Springfield Nuclear Power Plant")
+    duff = get_duff_beer("Regular")
+    skate = get_skateboard("Thrashmaster 3000")
+    sax = get_saxophone("Baritone")
+    sink = ListSink()
+
+    cases = {
+        "str(car)": lambda: str(car),
+        "str(beer)": lambda: str(duff),
+        "str(skateboard)": lambda: str(skate),
+        "str(saxophone)": lambda: str(sax),
+        "Homer._drive": lambda: homer._drive(car),
+        "Homer.drink": lambda: homer.drink(duff),
+        "Homer.pay_for_item": lambda: homer.pay_for_item(skate, plant),
+        "Lisa.play": lambda: lisa.play(sax),
+    }
+
+    results = {}
+    with use_sink(sink):
+        for name, func in cases.items():
+            with _original_rendering():
+                before = min(timeit.repeat(func, number=number, repeat=3))
+            sink.lines.clear()
+            after = min(timeit.repeat(func, number=number, repeat=3))
+            sink.lines.clear()
+            results[name] = (before / number * 1e6, after / number * 1e6)
+    return results
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'case':>20}  {'before':>8}  {'after':>8}  (microseconds per call)")
+    for name, (before, after) in run(number).items():
+        print(f"{name:>20}  {before:8.3f}  {after:8.3f}")
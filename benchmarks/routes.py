@@ -0,0 +1,91 @@
+"""
+routes.py - Measures route queries per second on a SpringfieldMap, with and without its cache
+
+Three measurements, each with caching on and off (the cached queries are
+timed once every trip has been asked for once, i.e. with a warm cache):
+  * queries on the shipped map of Springfield (7 places);
+  * queries on a generated grid town (width x width places, random
+    road lengths), where every uncached query is a full Dijkstra run;
+  * a commute tick: many HomersCars on the shipped map each drive to the
+    plant and home again, with the narration discarded.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.routes [grid_width] [cars]
+"""
+
+import random
+import sys
+import time
+
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.springfield_map import HOME, SpringfieldMap, create_springfield_map
+from simpsons_rpg.vehicles import HomersCar
+
+PLANT = "Springfield Nuclear Power Plant"
+
+
+def grid_map(width, seed=0, caching=True):
+    """A width x width grid of blocks joined by roads of 1 to 9 minutes."""
+    rng = random.Random(seed)
+    springfield = SpringfieldMap(caching)
+    for x in range(width):
+        for y in range(width):
+            if x + 1 < width:
+                springfield.add_road(f"{x},{y}", f"{x + 1},{y}", rng.randint(1, 9))
+            if y + 1 < width:
+                springfield.add_road(f"{x},{y}", f"{x},{y + 1}", rng.randint(1, 9))
+    return springfield
+
+
+def queries_per_second(springfield, pairs, seconds=1.0):
+    """Runs route() over 'pairs' (repeatedly) for about 'seconds'; returns queries/s."""
+    done = 0
+    start = time.perf_counter()
+    while True:
+        for a, b in pairs:
+            springfield.route(a, b)
+        done += len(pairs)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return done / elapsed
+
+
+def commute_tick(springfield, cars):
+    """Returns the seconds it takes 'cars' cars to drive to the plant and back."""
+    fleet = []
+    for _ in range(cars):
+        car = HomersCar("Sedan", "Pink")
+        car.map, car.location = springfield, HOME
+        fleet.append(car)
+    with use_sink(NullSink()):
+        start = time.perf_counter()
+        for car in fleet:
+            car.drive_to(PLANT)
+        for car in fleet:
+            car.drive_to(HOME)
+        return time.perf_counter() - start
+
+
+def main(width=40, cars=10_000):
+    """Prints route throughput with and without the cache."""
+    rng = random.Random(1)
+    for label, make in (("Springfield", lambda caching: create_springfield_map(caching=caching)),
+                        (f"{width}x{width} grid", lambda caching: grid_map(width, caching=caching))):
+        places = make(True).places()
+        # Commuter-like traffic: a few hundred distinct trips asked over and over
+        pairs = [(rng.choice(places), rng.choice(places)) for _ in range(500)]
+        warm = make(True)
+        queries_per_second(warm, pairs, seconds=0) # One pass fills the cache
+        cached = queries_per_second(warm, pairs)
+        uncached = queries_per_second(make(False), pairs[:50])
+        print(f"{label:>16}: {cached:12,.0f} queries/s cached, {uncached:10,.0f} uncached "
+              f"({cached / uncached:,.0f}x)")
+
+    for caching in (True, False):
+        seconds = commute_tick(create_springfield_map(caching=caching), cars)
+        print(f"{cars:,} cars to work and back, cache {'on ' if caching else 'off'}: "
+              f"{seconds * 1e3:8.1f} ms ({2 * cars / seconds:,.0f} trips/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
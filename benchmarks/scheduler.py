@@ -0,0 +1,60 @@
+"""
+scheduler.py - Measures the event-queue scheduler in events per second
+
+Two measurements:
+  * raw queue throughput: schedule N no-op actions at random times, then
+    run them all (N = 10k and 1M by default), so every push and pop works
+    against a heap of up to N entries;
+  * a town: many Simpson households living a 30-day month of routines,
+    with the narration discarded.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.scheduler [sizes ...]
+"""
+
+import random
+import sys
+import time
+
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.scheduler import MINUTES_PER_DAY, Scheduler, simulate_town
+
+
+def _no_op():
+    """The cheapest possible action."""
+    pass
+
+
+def queue_throughput(size, seed=0):
+    """Returns (schedule events/s, run events/s) for 'size' actions."""
+    rng = random.Random(seed)
+    times = [rng.randrange(30 * MINUTES_PER_DAY) for _ in range(size)]
+    scheduler = Scheduler()
+    start = time.perf_counter()
+    for at in times:
+        scheduler.schedule(at, _no_op)
+    scheduled = time.perf_counter() - start
+    with use_sink(NullSink()):
+        start = time.perf_counter()
+        scheduler.run()
+        ran = time.perf_counter() - start
+    return size / scheduled, size / ran
+
+
+def main(sizes=(10_000, 1_000_000)):
+    """Prints scheduler throughput for each size and for a month in town."""
+    for size in sizes:
+        push, run = queue_throughput(size)
+        print(f"{size:>10,} actions: schedule {push:12,.0f} events/s, run {run:12,.0f} events/s")
+
+    for families in (100, 1000):
+        with use_sink(NullSink()):
+            start = time.perf_counter()
+            scheduler = simulate_town(30, families)
+            seconds = time.perf_counter() - start
+        print(f"{families:>10,} families x 30 days: {scheduler.processed:,} routines in "
+              f"{seconds:.2f}s ({scheduler.processed / seconds:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 1_000_000))
@@ -0,0 +1,98 @@
+"""
+shared_state.py - Measures handing a town to worker processes: pickled objects vs shared memory
+
+Builds a town of Simpson households (seated in their cars, Homers with a
+few beers, some Barts with skateboards) and has a process pool compute
+the same summary in every worker, two ways:
+  * objects: the character and car lists are sent to each task, so they
+    are pickled in this process and unpickled in the worker;
+  * shared: the numbers are exported once with export_state and each
+    task only receives the name of the shared memory.
+Also prints the one-off costs: pickle size and time against export time.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.shared_state [families] [tasks] [workers]
+"""
+
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from simpsons_rpg.items import get_duff_beer, get_skateboard
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.scheduler import create_town
+from simpsons_rpg.shared_state import export_state, summarize
+from simpsons_rpg.simpson_characters import Homer, Bart
+
+
+def build_town(families):
+    """Returns (characters, cars) of a town with everyone seated."""
+    beer = get_duff_beer("Duff")
+    with use_sink(NullSink()):
+        town = create_town(families)
+        for number, (family, car) in enumerate(town):
+            car.add_occupants(family.members)
+            for member in family.members:
+                if isinstance(member, Homer):
+                    for _ in range(number % 4):
+                        member.drink(beer)
+                elif isinstance(member, Bart) and number % 2:
+                    member.set_skateboard(get_skateboard("Krusty"))
+    characters = [member for family, _ in town for member in family.members]
+    return characters, [car for _, car in town]
+
+
+def summarize_objects(characters, cars):
+    """Worker task: the same summary as SharedWorldState.summary, from objects."""
+    known = [character.age for character in characters if character.age is not None]
+    return {
+        "characters": len(characters),
+        "cars": len(cars),
+        "mean_age": sum(known) / len(known) if known else 0.0,
+        "beers": sum(character.drunk_beers.total() for character in characters
+                     if isinstance(character, Homer)),
+        "skateboards": sum(1 for character in characters
+                           if isinstance(character, Bart) and character.skateboard is not None),
+        "seated": sum(len(car.occupants) for car in cars),
+    }
+
+
+def main(families=10_000, tasks=8, workers=2):
+    """Prints the cost of both ways of reaching the workers."""
+    characters, cars = build_town(families)
+    print(f"{families:,} families: {len(characters):,} characters, {len(cars):,} cars")
+
+    start = time.perf_counter()
+    data = pickle.dumps((characters, cars), pickle.HIGHEST_PROTOCOL)
+    dumped = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)
+    loaded = time.perf_counter() - start
+    print(f"  pickle: {len(data):>12,} bytes, dumps {dumped * 1e3:8.1f} ms, loads {loaded * 1e3:8.1f} ms")
+
+    start = time.perf_counter()
+    state = export_state(characters, cars)
+    exported = time.perf_counter() - start
+    print(f"  shared: {len(state):>12,} bytes, export {exported * 1e3:7.1f} ms (once)")
+
+    with state, ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(summarize, [state.name] * workers)) # Start the workers
+
+        start = time.perf_counter()
+        by_objects = list(pool.map(summarize_objects, [characters] * tasks, [cars] * tasks))
+        objects_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        by_name = list(pool.map(summarize, [state.name] * tasks))
+        shared_seconds = time.perf_counter() - start
+
+    assert by_objects == by_name, (by_objects[0], by_name[0])
+    print(f"{tasks} reporting tasks on {workers} workers:")
+    print(f"  objects: {objects_seconds:.3f}s")
+    print(f"  shared:  {shared_seconds:.3f}s ({objects_seconds / shared_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,97 @@
+"""
+startup.py - Tracks interpreter start-up plus import time
+
+Runs fresh interpreters with 'python -X importtime' and reports the
+cumulative import time of the package and of the game module, plus the
+wall time of starting an interpreter that imports the game compared with
+one that imports nothing. Results can be written to JSON to track them.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.startup [--runs 20] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import simpsons_rpg
+
+# The directory that contains the package, so child interpreters can import it
+_PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(simpsons_rpg.__file__)))
+
+# Imports measured in child interpreters
+TARGETS = {
+    "package": "import simpsons_rpg",
+    "game": "import simpsons_rpg.game",
+}
+
+
+def _child_env():
+    """Environment for child interpreters: the package is importable, no bytecode writes."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_PARENT, env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def import_times(code):
+    """
+    Runs 'code' under -X importtime and returns {module: cumulative microseconds}
+    for the modules of this package.
+    """
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                           env=_child_env(), capture_output=True, text=True, check=True)
+    times = {}
+    for line in child.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        module = parts[2].strip()
+        if module.startswith("simpsons_rpg") and parts[1].strip().isdigit():
+            times[module] = int(parts[1])
+    return times
+
+
+def wall_time(code, runs):
+    """Best wall time in seconds of starting an interpreter that runs 'code'."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=_child_env(), check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(runs=20):
+    """Returns the start-up measurements as a dictionary."""
+    # Warm the bytecode cache once so the first measurement is not a compile
+    subprocess.run([sys.executable, "-c", TARGETS["game"]],
+                   env=dict(_child_env(), PYTHONDONTWRITEBYTECODE=""), check=True)
+    results = {"interpreter_seconds": wall_time("pass", runs)}
+    for name, code in TARGETS.items():
+        times = min((import_times(code) for _ in range(runs)),
+                    key=lambda t: t.get(code.split()[-1], 0))
+        results[f"{name}_import_us"] = times.get(code.split()[-1])
+        results[f"{name}_modules"] = times
+        results[f"{name}_seconds"] = wall_time(code, runs)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simpsons RPG start-up benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="interpreters started per measurement")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    print(f"bare interpreter:          {results['interpreter_seconds'] * 1000:7.1f} ms")
+    for name in TARGETS:
+        print(f"import {name:<8} (wall):     {results[f'{name}_seconds'] * 1000:7.1f} ms")
+        print(f"import {name:<8} (importtime): {results[f'{name}_import_us'] / 1000:5.1f} ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
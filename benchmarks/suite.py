@@ -0,0 +1,164 @@
+"""
+suite.py - Benchmark suite for the hot paths of the Simpsons RPG
+
+Times object construction, relationship wiring, Homer's work routine and
+a full headless day with timeit, and writes the results to a JSON file.
+Comparing against an earlier JSON file flags the cases that got slower.
+
+Usage:
+    python -m simpsons_rpg.benchmarks.suite [--output results.json]
+                                            [--compare baseline.json] [--threshold 0.10]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+from simpsons_rpg.family import Family
+from simpsons_rpg.game import run_game
+from simpsons_rpg.items import NuclearPlant
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.players import ScriptedPlayer
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie
+from simpsons_rpg.vehicles import HomersCar
+
+
+def _build_characters():
+    """Constructs the five Simpsons."""
+    return (Homer("Homer", 39, "I love donuts more than Marge"),
+            Marge("Marge", 36, "I once almost had an affair"),
+            Bart("Bart", 10, "I'm actually a good student but hide it"),
+            Lisa("Lisa", 8, "I sometimes wish I wasn't so smart"),
+            Maggie("Maggie", 1, "I shot Mr. Burns"))
+
+
+def _family_of(size):
+    """Returns a function that builds a family of 'size' members one add_member at a time."""
+    members = [Marge(f"Resident {i}", 30, "") for i in range(size)]
+
+    def build():
+        family = Family("Simpson")
+        for member in members:
+            family.add_member(member)
+        return family
+    return build
+
+
+def _occupant_churn():
+    """Returns a function that fills a car and empties it again."""
+    car = HomersCar("Sedan", "Pink")
+    family = _build_characters()
+
+    def churn():
+        for member in family:
+            car.add_occupant(member)
+        for member in family:
+            car.remove_occupant(member)
+    return churn
+
+
+def _go_to_work():
+    """Returns a function that runs Homer's go_to_work chain."""
+    homer = Homer("Homer", 39, "I love donuts more than Marge")
+    homer.car = HomersCar("Sedan", "Pink")
+    plant = NuclearPlant("Springfield Nuclear Power Plant")
+    return lambda: homer.go_to_work(plant)
+
+
+def _headless_day():
+    """Plays one full day with scripted answers (Duff, then Marge first)."""
+    return run_game(ScriptedPlayer(["1", "1"]))
+
+
+# name -> (function factory, calls per timing, timings)
+CASES = {
+    "construct_characters": (lambda: _build_characters, 20000, 5),
+    "construct_car": (lambda: lambda: HomersCar("Sedan", "Pink"), 20000, 5),
+    "family_add_member_10": (lambda: _family_of(10), 2000, 5),
+    "family_add_member_1k": (lambda: _family_of(1000), 20, 5),
+    "family_add_member_100k": (lambda: _family_of(100000), 1, 3),
+    "car_occupant_churn": (_occupant_churn, 10000, 5),
+    "homer_go_to_work": (_go_to_work, 10000, 5),
+    "headless_day": (lambda: _headless_day, 1000, 5),
+}
+
+
+def run(cases=None, scale=1.0):
+    """
+    Runs the benchmark cases (all by default) with the narration discarded.
+    'scale' multiplies the number of calls (e.g. 0.1 for a quick run).
+    Returns {case: {"seconds_per_call", "calls_per_second", "number", "repeat"}}.
+    """
+    results = {}
+    with use_sink(NullSink()):
+        for name in cases or CASES:
+            factory, number, repeat = CASES[name]
+            number = max(1, int(number * scale))
+            func = factory()
+            best = min(timeit.repeat(func, number=number, repeat=repeat))
+            results[name] = {
+                "seconds_per_call": best / number,
+                "calls_per_second": number / best if best else float("inf"),
+                "number": number,
+                "repeat": repeat,
+            }
+    return results
+
+
+def compare(baseline, results, threshold=0.10):
+    """Returns [(case, ratio)] for cases more than 'threshold' slower than the baseline."""
+    slower = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before:
+            ratio = result["seconds_per_call"] / before["seconds_per_call"]
+            if ratio > 1 + threshold:
+                slower.append((name, ratio))
+    return slower
+
+
+def main(argv=None):
+    """Command line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(description="Simpsons RPG benchmark suite")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown that counts as a regression (default 0.10 = 10%%)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the number of calls per case")
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.scale)
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:>24}: {result['seconds_per_call'] * 1e6:12.2f} us/call "
+              f"({result['calls_per_second']:,.0f}/s)")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        slower = compare(baseline, results, args.threshold)
+        for name, ratio in slower:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than {args.compare}")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
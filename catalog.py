@@ -0,0 +1,227 @@
+"""
+catalog.py - Loads character, place and item definitions from a data file
+
+The cast of Springfield (names, ages, secrets, catchphrases and families),
+its places, its items and its roads live in data/catalog.json instead of
+in the code.
+The first load parses and validates the JSON and saves a precompiled copy
+(plain tuples, written with marshal) in __pycache__ next to it, keyed by a hash of the
+file. Later loads hash the file, find a matching cache and skip both the
+JSON parsing and the validation. Editing the file changes its hash, so
+the cache is rebuilt automatically.
+
+Characters whose class is "Resident" are built from data alone; the
+Simpsons keep their own classes, but what they say (their catchphrase)
+is data too. A Simpson without a catchphrase in the file speaks its
+class's line from messages.py.
+"""
+
+import marshal
+import os
+
+from simpsons_rpg.family import Family
+from simpsons_rpg.items import NuclearPlant, get_duff_beer, get_saxophone, get_skateboard
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie, Resident
+
+# The catalog shipped with the game
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog.json")
+
+# Bump when the compiled layout changes, so old caches are ignored
+CACHE_FORMAT = 2
+
+# The classes and item kinds a catalog may name
+CHARACTER_CLASSES = {cls.__name__: cls for cls in (Homer, Marge, Bart, Lisa, Maggie, Resident)}
+ITEM_KINDS = {"DuffBeer": get_duff_beer, "Skateboard": get_skateboard, "Saxophone": get_saxophone}
+PLACE_KINDS = {"NuclearPlant": NuclearPlant}
+
+
+class Catalog:
+    """
+    A validated catalog, ready to create objects from.
+    Characters are kept as (class name, name, age, secret, catchphrase, family)
+    tuples; every create() call builds a fresh character from one.
+    """
+    __slots__ = ("characters", "places", "items", "roads", "_by_name")
+
+    def __init__(self, characters, places, items, roads=()):
+        """Initializes a catalog from compiled (already validated) records."""
+        self.characters = characters
+        self.places = places # key -> (kind, name)
+        self.items = items   # key -> (kind, spec)
+        self.roads = roads   # (place, place, minutes) tuples for the map
+        self._by_name = {record[1]: record for record in characters}
+
+    # +create(name) (Public method)
+    def create(self, name):
+        """Creates a new character from its catalog entry."""
+        class_name, name, age, secret, catchphrase, _family = self._by_name[name]
+        return CHARACTER_CLASSES[class_name](name, age, secret, catchphrase=catchphrase)
+
+    # +item(key) (Public method)
+    def item(self, key):
+        """Returns the (shared) item for a key, e.g. "duff"."""
+        kind, spec = self.items[key]
+        return ITEM_KINDS[kind](spec)
+
+    # +place(key) (Public method)
+    def place(self, key):
+        """Creates the place for a key, e.g. "plant"."""
+        kind, name = self.places[key]
+        return PLACE_KINDS[kind](name)
+
+    # +family_names() (Public method)
+    def family_names(self):
+        """Returns the last names of all families, in catalog order."""
+        return list(dict.fromkeys(record[5] for record in self.characters if record[5]))
+
+    # +create_family(last_name) (Public method)
+    def create_family(self, last_name):
+        """Creates a family with all of its members (one narration line)."""
+        family = Family(last_name)
+        family.add_members([self.create(record[1]) for record in self.characters
+                            if record[5] == last_name])
+        return family
+
+    def __contains__(self, name):
+        """Checks whether a character is in the catalog."""
+        return name in self._by_name
+
+    def __len__(self):
+        """Returns the number of characters."""
+        return len(self.characters)
+
+    def __str__(self):
+        """String representation of the Catalog."""
+        return (f"Catalog of {len(self.characters)} characters, {len(self.places)} places, "
+                f"{len(self.items)} items and {len(self.roads)} roads")
+
+
+# --- Validation (only when the cache misses) ---
+def _require(condition, where, message):
+    """Raises a ValueError that says which entry is wrong."""
+    if not condition:
+        raise ValueError(f"Invalid catalog: {where}: {message}")
+
+
+def _is_text(value):
+    """Checks for a non-empty string."""
+    return type(value) is str and value != ""
+
+
+def compile_catalog(raw):
+    """
+    Validates parsed catalog data and returns it in compiled form:
+    (characters, places, items, roads) made only of tuples, dicts, strings
+    and numbers.
+    """
+    _require(type(raw) is dict, "catalog", "must be a JSON object")
+    _require(raw.get("version") == 1, "version", "must be 1")
+
+    places = {}
+    for key, entry in raw.get("places", {}).items():
+        where = f"places.{key}"
+        _require(type(entry) is dict, where, "must be an object")
+        _require(entry.get("kind") in PLACE_KINDS, where, f"kind must be one of {sorted(PLACE_KINDS)}")
+        _require(_is_text(entry.get("name")), where, "needs a name")
+        places[key] = (entry["kind"], entry["name"])
+
+    items = {}
+    for key, entry in raw.get("items", {}).items():
+        where = f"items.{key}"
+        _require(type(entry) is dict, where, "must be an object")
+        _require(entry.get("kind") in ITEM_KINDS, where, f"kind must be one of {sorted(ITEM_KINDS)}")
+        _require(_is_text(entry.get("spec")), where, "needs a spec")
+        items[key] = (entry["kind"], entry["spec"])
+
+    roads = []
+    for i, entry in enumerate(raw.get("roads", [])):
+        where = f"roads[{i}]"
+        _require(type(entry) is dict, where, "must be an object")
+        _require(_is_text(entry.get("from")) and _is_text(entry.get("to")), where,
+                 "needs the places it goes 'from' and 'to'")
+        _require(entry["from"] != entry["to"], where, "must join two different places")
+        minutes = entry.get("minutes")
+        _require(type(minutes) is int and minutes > 0, where, "minutes must be a whole number > 0")
+        roads.append((entry["from"], entry["to"], minutes))
+
+    characters = []
+    seen = set()
+    for i, entry in enumerate(raw.get("characters", [])):
+        where = f"characters[{i}]"
+        _require(type(entry) is dict, where, "must be an object")
+        name = entry.get("name")
+        _require(_is_text(name), where, "needs a name")
+        where = f"characters[{i}] ({name})"
+        _require(name not in seen, where, "name is used twice")
+        seen.add(name)
+        class_name = entry.get("class", "Resident")
+        _require(class_name in CHARACTER_CLASSES, where,
+                 f"class must be one of {sorted(CHARACTER_CLASSES)}")
+        age = entry.get("age")
+        _require(type(age) is int and age >= 0, where, "age must be a whole number >= 0")
+        secret = entry.get("secret")
+        _require(secret is None or type(secret) is str, where, "secret must be text")
+        catchphrase = entry.get("catchphrase")
+        if class_name == "Resident":
+            _require(_is_text(catchphrase), where, "a Resident needs a catchphrase")
+        else: # Optional: without one, the class's own line is used
+            _require(catchphrase is None or _is_text(catchphrase), where, "catchphrase must be text")
+        family = entry.get("family")
+        _require(family is None or _is_text(family), where, "family must be a last name")
+        characters.append((class_name, name, age, secret, catchphrase, family))
+
+    return tuple(characters), places, items, tuple(roads)
+
+
+# --- Loading ---
+def _cache_path(path):
+    """Returns where the compiled copy of a catalog file is kept."""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, "__pycache__", filename + ".bin")
+
+
+def load_catalog(path=DEFAULT_PATH, use_cache=True):
+    """
+    Loads a catalog file, from its compiled cache when the file is unchanged.
+    A cache that cannot be written (e.g. a read-only install) is skipped.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    import hashlib # Not at the top: only loading a catalog needs it
+    digest = hashlib.sha256(data).digest()
+    cache_path = _cache_path(path)
+
+    if use_cache:
+        try:
+            with open(cache_path, "rb") as f:
+                # One read plus marshal.loads; marshal.load(f) reads in small pieces
+                cache_format, cached_digest, compiled = marshal.loads(f.read())
+            if cache_format == CACHE_FORMAT and cached_digest == digest:
+                return Catalog(*compiled)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass # No cache yet, or an unreadable one: rebuild it
+
+    import json # Only needed when the cache misses
+    compiled = compile_catalog(json.loads(data))
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(marshal.dumps((CACHE_FORMAT, digest, compiled)))
+            os.replace(temp_path, cache_path) # Readers never see half a file
+        except OSError:
+            pass
+    return Catalog(*compiled)
+
+
+# The shipped catalog, loaded on first use
+_default_catalog = None
+
+
+def default_catalog():
+    """Returns the shipped catalog (loaded once per process)."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = load_catalog()
+    return _default_catalog
@@ -0,0 +1,361 @@
+"""
+events.py - Contains the typed game events and their binary log format
+
+Domain methods record what happened as small event objects (DrankBeer,
+OccupantAdded, ClockedIn, ...). Nothing is recorded unless a recorder is
+attached, so the events cost a single list check when nobody listens.
+
+Binary log format (append-only):
+    file   := MAGIC record*
+    record := varint(len(body)) body
+    body   := kind:byte field*
+Every string field is stored as a varint ID. The first time a string is
+used, an intern record (kind 0, body = UTF-8 text) is written before the
+event, so names and brands are stored once per log. ID 0 means None.
+Integer fields are stored as varint(value + 1), so 0 means None there too.
+
+Several sessions can be appended to one log: every writer starts with a
+SessionStarted record, and replay rebuilds one session at a time. Cars
+are identified by a number given on their first event (car_id), since two
+cars can share a color and model. A record cut short (a process killed
+mid-write) ends the log: readers stop before it and open_log cuts it off.
+"""
+
+import os
+from itertools import count
+
+MAGIC = b"SRPGEV2\n"
+
+
+# --- Event Types ---
+class Event:
+    """
+    Base class for game events.
+    Subclasses list their fields and field types ('s' string, 'i' integer).
+    """
+    kind = None
+    fields = ()
+    types = ""
+
+    def __init__(self, *values):
+        """Initializes an event from its field values, in order."""
+        for field, value in zip(self.fields, values):
+            setattr(self, field, value)
+
+    def values(self):
+        """Returns the field values, in order."""
+        return tuple(getattr(self, field) for field in self.fields)
+
+    def __eq__(self, other):
+        """Events are equal when they have the same type and values."""
+        return type(self) is type(other) and self.values() == other.values()
+
+    def __repr__(self):
+        """Developer representation, e.g. DrankBeer('Homer', 'Regular')."""
+        return f"{type(self).__name__}{self.values()!r}"
+
+
+class MemberAdded(Event):
+    """A Simpson joined a family."""
+    kind = 1
+    fields = ("family", "member", "character", "age")
+    types = "sssi"
+
+
+class CarBuilt(Event):
+    """A HomersCar was built. Cars are identified by their car_id number."""
+    kind = 2
+    fields = ("car", "model", "color")
+    types = "iss"
+
+
+class DriverSet(Event):
+    """A car got a driver (or lost it, when driver is None)."""
+    kind = 3
+    fields = ("car", "driver")
+    types = "is"
+
+
+class OccupantAdded(Event):
+    """A Simpson got in a car."""
+    kind = 4
+    fields = ("car", "member")
+    types = "is"
+
+
+class OccupantRemoved(Event):
+    """A Simpson got out of a car."""
+    kind = 5
+    fields = ("car", "member")
+    types = "is"
+
+
+class SkateboardSet(Event):
+    """Bart got a skateboard (or lost it, when skateboard is None)."""
+    kind = 6
+    fields = ("bart", "skateboard")
+    types = "ss"
+
+
+class DrankBeer(Event):
+    """Homer drank a Duff Beer."""
+    kind = 7
+    fields = ("homer", "brand")
+    types = "ss"
+
+
+class AteDonuts(Event):
+    """Homer ate donuts."""
+    kind = 8
+    fields = ("homer",)
+    types = "s"
+
+
+class ClockedIn(Event):
+    """Homer clocked in at the plant."""
+    kind = 9
+    fields = ("homer", "plant")
+    types = "ss"
+
+
+class Played(Event):
+    """Lisa played an instrument."""
+    kind = 10
+    fields = ("lisa", "instrument")
+    types = "ss"
+
+
+class PaidForItem(Event):
+    """Homer paid for an item with money from the plant."""
+    kind = 11
+    fields = ("homer", "item", "plant")
+    types = "sss"
+
+
+class MemberRemoved(Event):
+    """A Simpson left a family."""
+    kind = 12
+    fields = ("family", "member")
+    types = "ss"
+
+
+class SessionStarted(Event):
+    """A new session begins; the events after it belong to it."""
+    kind = 13
+    fields = ("session",)
+    types = "i"
+
+
+EVENT_TYPES = {cls.kind: cls for cls in
+               (MemberAdded, CarBuilt, DriverSet, OccupantAdded, OccupantRemoved,
+                SkateboardSet, DrankBeer, AteDonuts, ClockedIn, Played, PaidForItem,
+                MemberRemoved, SessionStarted)}
+
+
+# --- Recording ---
+# The attached recorders. Domain code checks this list before building an event.
+recorders = []
+
+
+def record(event):
+    """Hands an event to every attached recorder."""
+    for recorder in recorders:
+        recorder.record(event)
+
+
+# Car numbers are handed out once per process, so they never repeat in a session
+_car_numbers = count(1)
+
+
+def car_id(car):
+    """Returns the number that identifies a car in events (given on first use)."""
+    if not car._event_id:
+        car._event_id = next(_car_numbers)
+    return car._event_id
+
+
+class recording:
+    """Attaches a recorder inside a with-block."""
+    def __init__(self, recorder):
+        """Remembers the recorder to attach."""
+        self.recorder = recorder
+
+    def __enter__(self):
+        """Attaches the recorder."""
+        recorders.append(self.recorder)
+        return self.recorder
+
+    def __exit__(self, *exc_info):
+        """Detaches the recorder."""
+        recorders.remove(self.recorder)
+
+
+class EventList:
+    """
+    Keeps recorded events in memory, in order.
+    """
+    def __init__(self):
+        """Initializes an empty event list."""
+        self.events = []
+
+    def record(self, event):
+        """Stores an event."""
+        self.events.append(event)
+
+
+# --- Binary Encoding ---
+def _varint(number):
+    """Encodes a non-negative integer as a little-endian base-128 varint."""
+    out = bytearray()
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+    return bytes(out)
+
+
+def _read_varint(data, pos):
+    """Decodes a varint at data[pos]; returns (value, new position)."""
+    result = shift = 0
+    while True:
+        byte = data[pos] # IndexError if the data ends inside the varint
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _records(data):
+    """
+    Yields (start, end) of each complete record body after the header.
+    Stops at a record that is cut short, so a partly written tail is ignored.
+    """
+    pos = len(MAGIC)
+    while pos < len(data):
+        try:
+            length, start = _read_varint(data, pos)
+        except IndexError:
+            return
+        end = start + length
+        if length == 0 or end > len(data):
+            return
+        yield start, end
+        pos = end
+
+
+def _complete_length(data):
+    """Returns how many bytes of a log hold complete records (the rest is a cut-off tail)."""
+    end = len(MAGIC)
+    for _, end in _records(data):
+        pass
+    return end
+
+
+class EventLogWriter:
+    """
+    Records events into an append-only binary stream.
+    Strings are interned: each distinct name or brand is written once.
+    """
+    def __init__(self, stream, interned=None, sessions=0):
+        """
+        Initializes a writer on a binary stream and starts a session.
+        'interned' is the string table of an existing log being appended to
+        and 'sessions' the number of sessions already in it; when interned
+        is None a new log (with its header) is started.
+        """
+        self.stream = stream
+        self._ids = dict(interned or {})
+        self.session = sessions
+        if interned is None:
+            stream.write(MAGIC)
+        self.start_session()
+
+    # +close() (Public method)
+    def close(self):
+        """Closes the stream the log is written to."""
+        self.stream.close()
+
+    def __enter__(self):
+        """Uses the writer in a with-block; the log is closed at the end."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the log."""
+        self.close()
+
+    # +start_session() (Public method)
+    def start_session(self):
+        """Marks the start of a new session; later events belong to it."""
+        self.session += 1
+        self.record(SessionStarted(self.session))
+
+    def _intern(self, text):
+        """Returns the ID of a string, writing an intern record the first time."""
+        if text is None:
+            return 0
+        text_id = self._ids.get(text)
+        if text_id is None:
+            text_id = self._ids[text] = len(self._ids) + 1
+            body = b"\x00" + text.encode("utf-8")
+            self.stream.write(_varint(len(body)) + body)
+        return text_id
+
+    def record(self, event):
+        """Encodes and appends one event."""
+        body = bytearray((event.kind,))
+        for kind, value in zip(event.types, event.values()):
+            if kind == "s":
+                body += _varint(self._intern(value))
+            else:
+                body += _varint(0 if value is None else value + 1)
+        self.stream.write(_varint(len(body)) + body)
+
+
+def read_events(data):
+    """Decodes a binary event log (bytes) and yields its events in order."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a Simpsons RPG event log")
+    strings = [None] # ID 0 is None
+    for pos, end in _records(data):
+        kind = data[pos]
+        if kind == 0:
+            strings.append(data[pos + 1:end].decode("utf-8"))
+        else:
+            cls = EVENT_TYPES[kind]
+            values = []
+            field_pos = pos + 1
+            for field_type in cls.types:
+                value, field_pos = _read_varint(data, field_pos)
+                if field_type == "s":
+                    values.append(strings[value])
+                else:
+                    values.append(None if value == 0 else value - 1)
+            yield cls(*values)
+
+
+def open_log(path):
+    """
+    Opens an event log file for appending and returns an EventLogWriter,
+    which starts a new session. If the file already exists, its string
+    table is loaded first so that new records keep using the same IDs, and
+    a record cut short at its end (left by a killed process) is cut off.
+    """
+    interned = None
+    sessions = 0
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        interned = {}
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a Simpsons RPG event log")
+        for start, end in _records(data):
+            if data[start] == 0:
+                interned[data[start + 1:end].decode("utf-8")] = len(interned) + 1
+            elif data[start] == SessionStarted.kind:
+                sessions += 1
+        complete = _complete_length(data)
+        if complete < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(complete)
+    return EventLogWriter(open(path, "ab"), interned, sessions)
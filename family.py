@@ -2,6 +2,103 @@
 family.py - Contains the Family class for the Simpsons RPG
 """
 
+import weakref
+
+from simpsons_rpg import events
+from simpsons_rpg.messages import MESSAGES, NameList, say
+
+# Narration templates (see messages.py)
+_ALREADY_MEMBER = MESSAGES["family.already_member"]
+_MEMBER_ADDED = MESSAGES["family.member_added"]
+_MEMBERS_ADDED = MESSAGES["family.members_added"]
+_MEMBER_REMOVED = MESSAGES["family.member_removed"]
+_NOT_MEMBER = MESSAGES["family.not_member"]
+
+
+class FamilyStats:
+    """
+    Running totals over a family's members, so reading them never scans
+    the members: how many of each character class, their mean age, the
+    beers drunk by all Homers and who owns a skateboard.
+    Family keeps the totals up to date as members join and leave; Homer
+    and Bart report each beer and skateboard change to the stats of the
+    families they belong to (their _stats, weak references, so a family
+    that is dropped is not kept alive by its members). Every update is O(1).
+    Ages are counted when members join, so a member's age should not be
+    changed while they are in a family; Family.verify_stats() catches
+    anything that was changed behind the family's back.
+    """
+    __slots__ = ("size", "_by_class", "_age_total", "_aged", "beers", "skateboarders", "__weakref__")
+
+    def __init__(self):
+        """Initializes the totals of an empty family."""
+        self.size = 0
+        self._by_class = {} # Exact class -> number of members
+        self._age_total = 0
+        self._aged = 0 # Members with a known age
+        self.beers = 0
+        self.skateboarders = set() # Members who own a skateboard
+
+    @classmethod
+    def from_members(cls, members):
+        """Computes the totals from scratch (the full scan the running totals avoid)."""
+        stats = cls()
+        for member in members:
+            stats.add(member)
+        return stats
+
+    def add(self, member):
+        """Counts a member who joined."""
+        self.size += 1
+        cls = type(member)
+        self._by_class[cls] = self._by_class.get(cls, 0) + 1
+        if member.age is not None:
+            self._age_total += member.age
+            self._aged += 1
+        beers = getattr(member, "drunk_beers", None) # Homers
+        if beers is not None:
+            self.beers += beers.total()
+        if getattr(member, "skateboard", None) is not None: # Barts
+            self.skateboarders.add(member)
+
+    def remove(self, member):
+        """Stops counting a member who left."""
+        self.size -= 1
+        cls = type(member)
+        self._by_class[cls] -= 1
+        if not self._by_class[cls]:
+            del self._by_class[cls]
+        if member.age is not None:
+            self._age_total -= member.age
+            self._aged -= 1
+        beers = getattr(member, "drunk_beers", None)
+        if beers is not None:
+            self.beers -= beers.total()
+        self.skateboarders.discard(member)
+
+    def count(self, character_class=None):
+        """Number of members that are instances of a character class (all members by default)."""
+        if character_class is None:
+            return self.size
+        return sum(count for cls, count in self._by_class.items()
+                   if issubclass(cls, character_class))
+
+    @property
+    def mean_age(self):
+        """Mean age of the members (0.0 for an empty family)."""
+        return self._age_total / self._aged if self._aged else 0.0
+
+    def as_dict(self):
+        """Returns the totals as a plain dictionary (e.g. for a dashboard)."""
+        return {
+            "members": self.size,
+            "by_class": {cls.__name__: count for cls, count in sorted(
+                self._by_class.items(), key=lambda item: item[0].__name__)},
+            "mean_age": self.mean_age,
+            "beers": self.beers,
+            "skateboards": sorted(member.name for member in self.skateboarders),
+        }
+
 # Aggregation Class (Whole in Family aggregation)
 # Aggregates 1..* Simpson members.
 class Family:
@@ -9,26 +106,206 @@ class Family:
     Represents a Family unit.
     Corresponds to the Family class in the UML diagram.
     Aggregates 1..* Simpson members (the parts).
+    Members are kept in a dictionary keyed by the member object (its id())
+    and indexed by name, so lookups, duplicate checks and removals are O(1)
+    even for very large families. The member dictionary also keeps the
+    order members joined in. Renaming a member is safe: membership and
+    removal go by the object. The name index is re-keyed as soon as a
+    lookup meets the old name (until then, the new name is not found by name).
+    'stats' keeps running totals over the members (see FamilyStats); they
+    are only built the first time they are read, so a family nobody polls
+    costs nothing extra.
     """
+    __slots__ = ("_lastName", "_members", "_by_name", "_by_class", "_str", "_listed", "_stats")
+
     def __init__(self, lastName):
         """Initializes a Family."""
-        # Attribute: lastName (Public)
-        self.lastName = lastName
+        # Attribute: lastName (Public, via the property below)
+        self._lastName = lastName
         # Aggregation: Family has 1..* Simpson members
-        # This is implemented by holding a list of Simpson objects.
-        self.members = [] # Start with an empty list
+        # This is implemented by a dictionary of Simpson objects keyed by id()
+        # (dictionaries keep insertion order, so it is also the join order).
+        # Keying by the object, not its name, keeps membership right when a
+        # member is renamed.
+        self._members = {} # Start with no members
+        # Name index for lookups by name: name -> member (see _named)
+        self._by_name = {}
+        # Index by class: class -> {member: None}, an ordered set
+        # (only built once members_of_type is first used)
+        self._by_class = None
+        # Cached string representation (None until needed, reset on change)
+        self._str = None
+        # Cached tuple of the members for 'members' (None until needed, reset on change)
+        self._listed = None
+        # Running totals over the members (None until 'stats' is first read)
+        self._stats = None
+
+    @property
+    def lastName(self):
+        """The family's last name."""
+        return self._lastName
+
+    @lastName.setter
+    def lastName(self, lastName):
+        self._lastName = lastName
+        self._str = None # The cached string shows the last name
+
+    @property
+    def members(self):
+        """
+        The members, in the order they joined, as a tuple: it can be indexed
+        and sliced, but add and remove members with the methods below.
+        """
+        if self._listed is None:
+            self._listed = tuple(self._members.values())
+        return self._listed
+
+    @property
+    def stats(self):
+        """The running totals over the members (a FamilyStats), built on first use."""
+        if self._stats is None:
+            self._stats = FamilyStats()
+            for member in self._members.values():
+                self._track(member)
+        return self._stats
+
+    def _index(self, member):
+        """Internal step: adds a member to the indexes."""
+        self._members[id(member)] = member
+        self._by_name[member.name] = member
+        if self._by_class is not None:
+            self._by_class.setdefault(type(member), {})[member] = None
+        self._str = self._listed = None
+        if self._stats is not None:
+            self._track(member)
+        if events.recorders:
+            events.record(events.MemberAdded(self._lastName, member.name,
+                                             type(member).__name__, member.age))
+
+    def _named(self, name):
+        """
+        Internal step: returns the member called 'name', or None.
+        A member renamed since joining is still filed under the old name;
+        finding such an entry re-keys the whole name index (O(n), once per rename).
+        """
+        member = self._by_name.get(name)
+        if member is not None and member.name != name:
+            self._by_name = {member.name: member for member in self._members.values()}
+            member = self._by_name.get(name)
+        return member
+
+    def _track(self, member):
+        """Internal step: counts a member in the stats and lets them report changes."""
+        self._stats.add(member)
+        if hasattr(member, "_stats"): # Homer and Bart report beers and skateboards
+            member._stats += (weakref.ref(self._stats),)
 
     # +add_member(member) (Public method)
     def add_member(self, member):
-        """Adds a member to the family."""
+        """Adds a member to the family. Returns False if already a member."""
         # This method demonstrates aggregation - Family "has" members
-        self.members.append(member)
-        # Note: In a more complex implementation, we might check if the member
-        # is already in the family, or enforce other constraints.
-        print(f"{member.name} is now part of the {self.lastName} family.")
+        # Members are unique by name - a dictionary lookup, not a list scan
+        if id(member) in self._members or self._named(member.name) is not None:
+            say(_ALREADY_MEMBER, member.name, self._lastName)
+            return False
+        self._index(member)
+        say(_MEMBER_ADDED, member.name, self._lastName)
+        return True
+
+    # +add_members(members) (Public method)
+    def add_members(self, members):
+        """
+        Adds many members at once and returns the ones actually added.
+        Members already in the family are skipped. Only one narration
+        line is produced for the whole batch.
+        """
+        added = []
+        for member in members:
+            if id(member) not in self._members and self._named(member.name) is None:
+                self._index(member)
+                added.append(member)
+        if len(added) == 1:
+            say(_MEMBER_ADDED, added[0].name, self._lastName)
+        elif added:
+            say(_MEMBERS_ADDED, NameList(added), self._lastName)
+        return added
+
+    # +remove_member(member) (Public method)
+    def remove_member(self, member):
+        """Removes a member (or the member with this name). Returns False if not a member."""
+        if member not in self:
+            say(_NOT_MEMBER, member if isinstance(member, str) else member.name, self._lastName)
+            return False
+        if isinstance(member, str):
+            member = self._named(member)
+        del self._members[id(member)] # O(1), and the join order of the others is kept
+        if self._by_name.get(member.name) is member:
+            del self._by_name[member.name]
+        if self._by_class is not None:
+            del self._by_class[type(member)][member]
+        self._str = self._listed = None
+        if self._stats is not None:
+            self._stats.remove(member)
+            if hasattr(member, "_stats"):
+                member._stats = tuple(ref for ref in member._stats if ref() is not self._stats)
+        if events.recorders:
+            events.record(events.MemberRemoved(self._lastName, member.name))
+        say(_MEMBER_REMOVED, member.name, self._lastName)
+        return True
+
+    # +verify_stats() (Public method)
+    def verify_stats(self):
+        """
+        Checks the running totals against a full recompute over the members.
+        Returns True, or raises ValueError naming the totals that differ.
+        """
+        expected = FamilyStats.from_members(self._members.values()).as_dict()
+        actual = self.stats.as_dict()
+        wrong = [key for key in expected if expected[key] != actual[key]]
+        if wrong:
+            raise ValueError("Family stats out of date: " + ", ".join(
+                f"{key} is {actual[key]!r}, should be {expected[key]!r}" for key in wrong))
+        return True
+
+    def get(self, name):
+        """Returns the member with this name, or None."""
+        return self._named(name)
+
+    def members_between(self, min_age, max_age):
+        """
+        Returns the members whose age is between min_age and max_age (inclusive).
+        Members whose age is unknown (None) are skipped, as FamilyStats does.
+        """
+        return [member for member in self._members.values()
+                if member.age is not None and min_age <= member.age <= max_age]
+
+    def members_of_type(self, character_class):
+        """Returns the members that are instances of a character class (e.g. Homer)."""
+        if self._by_class is None:
+            self._by_class = {}
+            for member in self._members.values():
+                self._by_class.setdefault(type(member), {})[member] = None
+        found = []
+        for cls, members in self._by_class.items():
+            if issubclass(cls, character_class):
+                found.extend(members)
+        return found
+
+    def __contains__(self, member):
+        """Membership test by name or by member object: 'Bart' in family."""
+        if isinstance(member, str):
+            return self._named(member) is not None
+        return id(member) in self._members
+
+    def __len__(self):
+        """Number of members."""
+        return len(self._members)
 
     def __str__(self):
         """String representation of the Family."""
         # List all family members in the string representation
-        member_names = [member.name for member in self.members]
-        return f"The {self.lastName} Family: {', '.join(member_names)}"
+        # Built once and reused until the membership or last name changes
+        if self._str is None:
+            member_names = [member.name for member in self._members.values()]
+            self._str = f"The {self._lastName} Family: {', '.join(member_names)}"
+        return self._str
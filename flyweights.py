@@ -0,0 +1,89 @@
+"""
+flyweights.py - Contains the flyweight base class and intern registry
+
+Items and car parts are small values: a Duff Regular is a Duff Regular.
+Instead of creating a new object for every beer or wheel, the registry
+hands out one shared instance per spec. Shared instances must never
+change, so flyweights are immutable once created.
+"""
+
+
+class Flyweight:
+    """
+    Base class for immutable value objects that can be shared.
+    Subclasses list their attributes in __slots__ and set them in __init__
+    with object.__setattr__; after that any assignment raises AttributeError.
+    Because a flyweight never changes, its string can be rendered once:
+    subclasses store it in _str from __init__ and return it from __str__.
+    """
+    # The rendered string (the spec is the subclass's own __slots__, not this)
+    __slots__ = ("_str",)
+
+    def __setattr__(self, name, value):
+        """Flyweights are shared, so they cannot be changed."""
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name):
+        """Flyweights are shared, so they cannot be changed."""
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def spec(self):
+        """Returns the attribute values that identify this object."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        """Flyweights are equal when they have the same type and spec."""
+        return type(self) is type(other) and self.spec() == other.spec()
+
+    def __hash__(self):
+        """Flyweights can be used as dictionary keys and in sets."""
+        return hash((type(self), self.spec()))
+
+    def __reduce__(self):
+        """Lets copy and pickle rebuild the object through __init__."""
+        return type(self), self.spec()
+
+
+class FlyweightRegistry:
+    """
+    Hands out one shared instance per spec, created on first use.
+    The registry is bounded: when it holds more than 'maxsize' instances,
+    the least recently used one is evicted (objects still in use elsewhere
+    are unaffected - they simply stop being shared with new requests).
+    """
+    def __init__(self, factory, maxsize=1024):
+        """Initializes a registry that builds instances with factory(spec)."""
+        self.factory = factory
+        self.maxsize = maxsize
+        # A plain dict keeps insertion order, which is enough for LRU:
+        # a hit is moved to the end, eviction takes the first key.
+        self._instances = {}
+        self.hits = 0
+        self.misses = 0
+
+    # +get(spec) (Public method)
+    def get(self, spec):
+        """Returns the shared instance for 'spec', creating it if needed."""
+        instance = self._instances.get(spec)
+        if instance is not None:
+            self.hits += 1
+            del self._instances[spec]
+            self._instances[spec] = instance # Move to the end (most recently used)
+            return instance
+        self.misses += 1
+        instance = self._instances[spec] = self.factory(spec)
+        if len(self._instances) > self.maxsize:
+            del self._instances[next(iter(self._instances))] # Evict the least recently used
+        return instance
+
+    def clear(self):
+        """Forgets every shared instance."""
+        self._instances.clear()
+
+    def __len__(self):
+        """Number of instances currently held."""
+        return len(self._instances)
+
+    def __contains__(self, spec):
+        """Whether an instance for 'spec' is currently held."""
+        return spec in self._instances
@@ -3,50 +3,93 @@ game.py - Main game file for the Simpsons RPG
 Contains the game logic and interactive elements
 """
 
-import time
-from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie
-from simpsons_rpg.items import DuffBeer, Skateboard, NuclearPlant, Saxophone
+from simpsons_rpg.catalog import default_catalog
 from simpsons_rpg.vehicles import HomersCar
 from simpsons_rpg.family import Family
-
-# --- Helper Function for RPG Interaction ---
-def wait_for_player(message="Press Enter to continue..."):
-    """Pauses the game and waits for the player to press Enter."""
-    input(message)
-
-# --- Main Game Function ---
-def run_game():
-    """Runs the main Simpsons RPG game."""
-    print("--- The Simpsons: A Simple RPG Day in Springfield ---")
-    print("Based on the UML Class Diagram")
-
-    wait_for_player("Press Enter to start...")
+from simpsons_rpg.messages import MESSAGES, say
+from simpsons_rpg.narration import narrate
+from simpsons_rpg.players import ConsolePlayer
+
+
+class DayResult:
+    """
+    The outcome of one day in Springfield.
+    Returned by run_game so that headless runs can be inspected afterwards.
+    """
+    def __init__(self, evening_choice, seating):
+        """Initializes a day result."""
+        # The raw answer given at the evening menu ('1', '2' or anything else)
+        self.evening_choice = evening_choice
+        # Names of the car occupants, in the order they got in
+        self.seating = seating
+
+    def __str__(self):
+        """String representation of the day result."""
+        return f"Evening choice {self.evening_choice!r}, seating {', '.join(self.seating)}"
+
+
+# --- Prompts ---
+# The day itself never calls input(). It yields one of these prompts and
+# whoever drives the day (run_game, or the async server) gets the answer.
+class Pause:
+    """A pause: the player only has to press Enter."""
+    __slots__ = ("message",)
+
+    def __init__(self, message="Press Enter to continue..."):
+        """Initializes a pause prompt."""
+        self.message = message
+
+
+class Choice:
+    """A menu: the player picks one of the options (or types anything else)."""
+    __slots__ = ("prompt", "options")
+
+    def __init__(self, prompt, options):
+        """Initializes a choice prompt."""
+        self.prompt = prompt
+        self.options = options
+
+
+# --- The Day ---
+def play_day():
+    """
+    The day in Springfield as a generator.
+    Yields a Pause or Choice at every point where the player is needed and
+    expects the answer to be sent back; returns a DayResult at the end.
+    """
+    narrate("--- The Simpsons: A Simple RPG Day in Springfield ---")
+    narrate("Based on the UML Class Diagram")
+
+    yield Pause("Press Enter to start...")
 
     # --- 1. Object Creation ---
-    print("\n--- Creating Characters and Objects ---")
+    narrate("\n--- Creating Characters and Objects ---")
     
+    # Names, ages, secrets and item specs come from the catalog (data/catalog.json)
+    cast = default_catalog()
+
     # Create Simpson characters (instances of the subclasses)
-    homer = Homer("Homer", 39, "I love donuts more than Marge")
-    marge = Marge("Marge", 36, "I once almost had an affair")
-    bart = Bart("Bart", 10, "I'm actually a good student but hide it")
-    lisa = Lisa("Lisa", 8, "I sometimes wish I wasn't so smart")
-    maggie = Maggie("Maggie", 1, "I shot Mr. Burns")
+    homer = cast.create("Homer")
+    marge = cast.create("Marge")
+    bart = cast.create("Bart")
+    lisa = cast.create("Lisa")
+    maggie = cast.create("Maggie")
     
     # Create other objects
-    plant = NuclearPlant("Springfield Nuclear Power Plant")
-    duff = DuffBeer("Regular")
-    skate = Skateboard("Thrashmaster 3000")
-    sax = Saxophone("Baritone")
+    plant = cast.place("plant")
+    duff = cast.item("duff")                 # Items are shared flyweights
+    skate = cast.item("skateboard")
+    sax = cast.item("saxophone")
     h_car = HomersCar("Sedan", "Pink")
     
     # Create the family object
     simpsons_family = Family("Simpson")
     
-    print("Characters and objects created!")
-    wait_for_player()
+    narrate("Characters and objects created!")
+    yield Pause()
     
     # --- 2. Establishing Relationships ---
-    print("\n--- Establishing Relationships ---")
+    narrate("\n--- Establishing Relationships ---")
     
     # Family Aggregation: Adding members to the Family object
     simpsons_family.add_member(homer)
@@ -62,71 +105,73 @@ def run_game():
     homer.car = h_car
     h_car.set_driver(homer)
     
-    print("\n--- Morning in Springfield ---")
+    narrate("\n--- Morning in Springfield ---")
 
     # Characters Speak (Inheritance, Realization)
-    print(f"{homer.name}: {homer.speak()}")
-    print(f"{lisa.name}: {lisa.speak()}")
-    print(f"{bart.name}: {bart.speak()}")
-    print(f"{marge.name}: {marge.speak()}")
-    print(f"{maggie.name}: {maggie.speak()}")
+    speaks = MESSAGES["game.speaks"]
+    say(speaks, homer.name, homer.speak())
+    say(speaks, lisa.name, lisa.speak())
+    say(speaks, bart.name, bart.speak())
+    say(speaks, marge.name, marge.speak())
+    say(speaks, maggie.name, maggie.speak())
 
-    wait_for_player()
+    yield Pause()
 
     # Homer goes to work (Dependency on Plant, Abstraction)
-    print(f"\nTime for work!")
+    narrate("\nTime for work!")
     homer.go_to_work(plant) # This method call includes driving the car and entering the plant
 
-    wait_for_player()
+    yield Pause()
 
     # Lisa plays (Dependency on Saxophone)
-    print(f"\nLisa feels musical.")
+    narrate("\nLisa feels musical.")
     lisa.play(sax) # Depends on 'sax' object
 
-    wait_for_player()
+    yield Pause()
 
     # Homer pays for items (Dependency chain: Item -> Homer -> Plant)
     # This method call demonstrates dependencies on 'item' and 'plant'
-    print(f"\nUh oh, bills are due!")
+    narrate("\nUh oh, bills are due!")
     homer.pay_for_item(bart.skateboard, plant) # Skateboard depends on Homer, Homer depends on Plant
     homer.pay_for_item(sax, plant)             # Saxophone depends on Homer, Homer depends on Plant
 
-    wait_for_player()
+    yield Pause()
 
     # --- Evening Actions with a Choice ---
-    print(f"\n--- Evening ---")
+    narrate("\n--- Evening ---")
 
     # Simple Choice 1: What does Homer do after work? (Relates to Homer's methods/associations)
-    print("Homer is home from work. What does he do?")
-    print("1. Drink a Duff Beer")
-    print("2. Eat some donuts")
+    narrate("Homer is home from work. What does he do?")
+    narrate("1. Drink a Duff Beer")
+    narrate("2. Eat some donuts")
 
-    choice1 = input("Enter choice (1 or 2): ")
+    choice1 = yield Choice("Enter choice (1 or 2): ", ["1", "2"])
 
     if choice1 == '1':
         homer.drink(duff) # Calls the drink method (Association with DuffBeer)
     elif choice1 == '2':
         homer.eat_donuts() # Calls the eat_donuts method
     else:
-        print("Homer just sighs and sits on the couch.") # Default action
+        narrate("Homer just sighs and sits on the couch.") # Default action
 
-    wait_for_player()
+    yield Pause()
 
     # --- Family Car Ride ---
-    print("\nTime for a family outing!")
+    narrate("\nTime for a family outing!")
     # Homer is already linked to the car as the driver via association established earlier.
 
     # Aggregation (Carries Occupants), Multiplicity 1..5 with a simple choice
-    print(f"{homer.name} is in the car.")
+    say(MESSAGES["game.in_car"], homer.name)
     remaining_family = [marge, bart, lisa, maggie]
     available_seats = 5 - 1 # 5 total, Homer is one
 
-    print(f"There are {available_seats} spots left. Who gets in first?")
+    say(MESSAGES["game.spots_left"], available_seats)
     for i, member in enumerate(remaining_family):
-        print(f"{i + 1}. {member.name}")
+        say(MESSAGES["game.menu_item"], i + 1, member.name)
 
     # Simple Choice 2: Choose one other family member to get in first
-    chosen_index = input(f"Enter choice (1 to {len(remaining_family)}): ")
+    chosen_index = yield Choice(f"Enter choice (1 to {len(remaining_family)}): ",
+                                [str(i + 1) for i in range(len(remaining_family))])
 
     try:
         chosen_index = int(chosen_index) - 1
@@ -134,38 +179,58 @@ def run_game():
             chosen_member = remaining_family.pop(chosen_index) # Remove chosen from remaining list
             h_car.add_occupant(homer) # Add Homer first (driver) - enforce multiplicity logic
             h_car.add_occupant(chosen_member) # Add the player's choice
-            # Add the rest of the family (up to the limit)
-            print("Adding the rest of the family...")
+            # Add the rest of the family (up to the limit), one narrated line each
+            narrate("Adding the rest of the family...")
             for member in remaining_family:
-                if len(h_car.occupants) < 5: # Check limit before adding
-                     h_car.add_occupant(member)
+                if h_car.occupants.free_seats: # Check limit before adding
+                    h_car.add_occupant(member)
                 else:
-                     print("Car is full!")
-                     break # Stop adding if car is full
+                    narrate("Car is full!")
+                    break # Stop adding if car is full
 
         else:
-            print("Invalid choice. The family just piles in.")
-            h_car.add_occupant(homer)
-            h_car.add_occupant(marge)
-            h_car.add_occupant(bart)
-            h_car.add_occupant(lisa)
-            h_car.add_occupant(maggie)
+            narrate("Invalid choice. The family just piles in.")
+            for member in (homer, marge, bart, lisa, maggie):
+                h_car.add_occupant(member)
 
     except ValueError:
-        print("Invalid input. The family just piles in.")
-        h_car.add_occupant(homer)
-        h_car.add_occupant(marge)
-        h_car.add_occupant(bart)
-        h_car.add_occupant(lisa)
-        h_car.add_occupant(maggie)
+        narrate("Invalid input. The family just piles in.")
+        for member in (homer, marge, bart, lisa, maggie):
+            h_car.add_occupant(member)
 
-    print(f"\nCurrent occupants in the car: {[o.name for o in h_car.occupants]}")
-    print(f"Car status: {h_car}") # Shows composed parts (Engine, Wheels) and occupants
+    say(MESSAGES["game.occupants"], [o.name for o in h_car.occupants])
+    say(MESSAGES["game.car_status"], h_car) # Shows composed parts (Engine, Wheels) and occupants
 
-    wait_for_player()
+    yield Pause()
 
-    print("\n--- End of Day ---")
-    print("Thanks for playing!")
+    narrate("\n--- End of Day ---")
+    narrate("Thanks for playing!")
+
+    return DayResult(choice1, [o.name for o in h_car.occupants])
+
+
+# --- Main Game Function ---
+def run_game(player=None):
+    """
+    Runs the main Simpsons RPG game.
+    By default a human answers the prompts; pass a headless player
+    (see players.py) to run the day without any input().
+    """
+    if player is None:
+        player = ConsolePlayer()
+
+    day = play_day()
+    answer = None
+    while True:
+        try:
+            prompt = day.send(answer)
+        except StopIteration as finished:
+            return finished.value # The DayResult
+        if type(prompt) is Pause:
+            player.wait(prompt.message)
+            answer = None
+        else:
+            answer = player.choose(prompt.prompt, prompt.options)
 
 # Run the game if this file is executed directly
 if __name__ == "__main__":
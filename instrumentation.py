@@ -0,0 +1,246 @@
+"""
+instrumentation.py - Opt-in call counters and timings for the domain classes
+
+enable() swaps each method listed in METHODS for a thin wrapper that counts
+the call and times it; disable() puts the original methods back. While
+instrumentation is off the classes hold their original functions, so it
+costs nothing at all.
+
+Timings go into a histogram per method (one bucket per power of two
+nanoseconds), which gives counts, totals and percentiles without keeping
+every sample. A snapshot can be exported as JSON or as a Prometheus text
+dump. profile() runs code under cProfile instead, for a view of every
+function (including the ones that are not instrumented).
+
+Usage:
+    python -m simpsons_rpg.instrumentation [days] [--json | --prometheus | --profile]
+"""
+
+import sys
+import time
+
+from simpsons_rpg.family import Family
+from simpsons_rpg.simpson_characters import Homer, Bart, Lisa
+from simpsons_rpg.vehicles import HomersCar
+
+# The methods that are instrumented, per class
+METHODS = {
+    Homer: ("go_to_work", "_get_dressed", "_drive", "_enter_building", "_clock_in",
+            "drink", "eat_donuts", "pay_for_item"),
+    Lisa: ("play",),
+    Bart: ("set_skateboard",),
+    Family: ("add_member", "add_members", "remove_member"),
+    HomersCar: ("set_driver", "add_occupant", "add_occupants", "remove_occupant", "drive_to", "__str__"),
+}
+
+# Histogram buckets: bucket b holds calls that took less than 2**b nanoseconds
+BUCKETS = 40 # The last bucket (over about 9 minutes) catches everything slower
+
+# Bucket edges written to Prometheus: a fixed set (64 ns to about 1 s) so
+# that every dump has the same series
+EXPORTED_BUCKETS = range(6, 31)
+
+
+class MethodStats:
+    """
+    Call count, total time and a latency histogram for one method.
+    """
+    __slots__ = ("name", "count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self, name):
+        """Initializes empty statistics for a method."""
+        self.name = name
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, elapsed_ns):
+        """Records one call."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """
+        Returns the latency (in seconds) below which 'fraction' of the calls
+        fall, to within a factor of two (the upper edge of its bucket).
+        """
+        if self.count == 0:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, calls in enumerate(self.buckets):
+            seen += calls
+            if seen >= wanted:
+                return min(2 ** bucket, self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def as_dict(self):
+        """Returns the statistics as a plain dictionary."""
+        return {
+            "count": self.count,
+            "total_seconds": self.total_ns / 1e9,
+            "mean_seconds": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "p50_seconds": self.percentile(0.50),
+            "p90_seconds": self.percentile(0.90),
+            "p99_seconds": self.percentile(0.99),
+            "max_seconds": self.max_ns / 1e9,
+        }
+
+
+# Method name ("Homer.go_to_work") -> MethodStats, filled while enabled
+stats = {}
+
+# (class, attribute) -> the original function, while enabled
+_originals = {}
+
+
+def _timed(func, method_stats):
+    """Wraps a function so that every call is counted and timed."""
+    clock = time.perf_counter_ns
+    record = method_stats.record
+
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(clock() - start)
+    timed.__name__, timed.__qualname__, timed.__doc__ = func.__name__, func.__qualname__, func.__doc__
+    timed.__wrapped__ = func
+    return timed
+
+
+# +enable() (Public function)
+def enable():
+    """Starts instrumenting the methods in METHODS (does nothing if already on)."""
+    if _originals:
+        return
+    for cls, names in METHODS.items():
+        for name in names:
+            func = cls.__dict__[name]
+            method_name = f"{cls.__name__}.{name}"
+            method_stats = stats.get(method_name)
+            if method_stats is None:
+                method_stats = stats[method_name] = MethodStats(method_name)
+            _originals[cls, name] = func
+            setattr(cls, name, _timed(func, method_stats))
+
+
+# +disable() (Public function)
+def disable():
+    """Puts the original methods back; the statistics are kept."""
+    for (cls, name), func in _originals.items():
+        setattr(cls, name, func)
+    _originals.clear()
+
+
+def is_enabled():
+    """Checks whether instrumentation is on."""
+    return bool(_originals)
+
+
+def reset():
+    """Forgets all statistics."""
+    for method_stats in stats.values():
+        method_stats.__init__(method_stats.name)
+
+
+class instrumented:
+    """
+    Instruments the domain classes inside a with-block.
+    (A small class rather than contextlib.contextmanager, like use_sink.)
+    """
+    def __enter__(self):
+        """Turns instrumentation on."""
+        enable()
+        return stats
+
+    def __exit__(self, *exc_info):
+        """Turns instrumentation off again."""
+        disable()
+
+
+# --- Exports ---
+def snapshot():
+    """Returns {method: statistics dict} for every method that has been called."""
+    return {name: method_stats.as_dict()
+            for name, method_stats in sorted(stats.items()) if method_stats.count}
+
+
+def to_json(indent=2):
+    """Returns the snapshot as JSON text."""
+    import json # Only exporting needs it
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_prometheus(prefix="simpsons_rpg_method"):
+    """
+    Returns the statistics in the Prometheus text exposition format:
+    one histogram (buckets, sum and count) per method, in seconds.
+    """
+    lines = [f"# HELP {prefix}_seconds Time spent in instrumented methods.",
+             f"# TYPE {prefix}_seconds histogram"]
+    for name, method_stats in sorted(stats.items()):
+        if not method_stats.count:
+            continue
+        label = f'method="{name}"'
+        for bucket in EXPORTED_BUCKETS:
+            cumulative = sum(method_stats.buckets[:bucket + 1])
+            lines.append(f'{prefix}_seconds_bucket{{{label},le="{2 ** bucket / 1e9:.9g}"}} {cumulative}')
+        lines.append(f'{prefix}_seconds_bucket{{{label},le="+Inf"}} {method_stats.count}')
+        lines.append(f"{prefix}_seconds_sum{{{label}}} {method_stats.total_ns / 1e9:.9g}")
+        lines.append(f"{prefix}_seconds_count{{{label}}} {method_stats.count}")
+    return "\n".join(lines) + "\n"
+
+
+def report():
+    """Returns a table of the statistics, slowest total first."""
+    rows = sorted(snapshot().items(), key=lambda item: -item[1]["total_seconds"])
+    lines = [f"{'method':<26}{'calls':>10}{'total ms':>11}{'mean us':>10}"
+             f"{'p50 us':>9}{'p99 us':>9}"]
+    for name, s in rows:
+        lines.append(f"{name:<26}{s['count']:>10,}{s['total_seconds'] * 1e3:>11.2f}"
+                     f"{s['mean_seconds'] * 1e6:>10.2f}{s['p50_seconds'] * 1e6:>9.2f}"
+                     f"{s['p99_seconds'] * 1e6:>9.2f}")
+    return "\n".join(lines)
+
+
+# --- cProfile ---
+def profile(func, *args, limit=25, sort="cumulative", stream=None):
+    """
+    Runs func(*args) under cProfile and prints the top 'limit' functions of
+    this package, sorted by 'sort'. Instrumentation is switched off while
+    profiling, so the profile shows the real methods. Returns func's result.
+    """
+    import cProfile
+    import pstats
+    was_enabled = is_enabled()
+    disable()
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args)
+    finally:
+        if was_enabled:
+            enable()
+    pstats.Stats(profiler, stream=stream or sys.stdout).sort_stats(sort).print_stats("simpsons_rpg", limit)
+    return result
+
+
+if __name__ == "__main__":
+    from simpsons_rpg.batch import run_batch
+    days = next((int(arg) for arg in sys.argv[1:] if arg.isdigit()), 1000)
+    if "--profile" in sys.argv:
+        profile(run_batch, days)
+    else:
+        with instrumented():
+            run_batch(days)
+        if "--json" in sys.argv:
+            print(to_json())
+        elif "--prometheus" in sys.argv:
+            print(to_prometheus(), end="")
+        else:
+            print(report())
@@ -8,6 +8,9 @@ class CanSpeak:
     A class inheriting from this should implement the 'speak' method.
     (Simpler version of the <<interface>> CanSpeak in UML)
     """
+    # No attributes of its own (empty __slots__ keeps subclasses free of __dict__)
+    __slots__ = ()
+
     def speak(self):
         """
         Placeholder method - subclasses should provide their own speaking behavior.
@@ -2,37 +2,45 @@
 items.py - Contains classes for various items and objects in the Simpsons RPG
 """
 
+from simpsons_rpg.flyweights import Flyweight, FlyweightRegistry
+
 # Association Class (Target of Homer's drinks association)
-class DuffBeer:
+class DuffBeer(Flyweight):
     """
     Represents a Duff Beer.
     Corresponds to the DuffBeer class in the UML diagram.
     """
+    __slots__ = ("brand",)
+
     def __init__(self, brand):
         """Initializes a Duff Beer."""
-        # Attribute: brand (Public)
-        self.brand = brand
+        # Attribute: brand (Public, read-only - beers are shared flyweights)
+        object.__setattr__(self, "brand", brand)
+        object.__setattr__(self, "_str", f"Duff {brand} Beer") # Rendered once
 
     def __str__(self):
         """String representation of Duff Beer."""
-        return f"Duff {self.brand} Beer"
+        return self._str
 
 
 # Aggregation Class (Part in Bart's owns aggregation)
-class Skateboard:
+class Skateboard(Flyweight):
     """
     Represents a Skateboard.
     Corresponds to the Skateboard class in the UML diagram.
     Part in Bart's aggregation.
     """
+    __slots__ = ("model",)
+
     def __init__(self, model):
         """Initializes a Skateboard."""
-        # Attribute: model (Public)
-        self.model = model
+        # Attribute: model (Public, read-only)
+        object.__setattr__(self, "model", model)
+        object.__setattr__(self, "_str", f"{model} Skateboard")
 
     def __str__(self):
         """String representation of Skateboard."""
-        return f"{self.model} Skateboard"
+        return self._str
 
 
 # Dependency Class (Homer depends on this for income context)
@@ -43,6 +51,8 @@ class NuclearPlant:
     Corresponds to the NuclearPlant class in the UML diagram.
     Homer depends on this (uses it for work).
     """
+    __slots__ = ("name",)
+
     def __init__(self, name):
         """Initializes the Nuclear Plant."""
         # Attribute: name (Public)
@@ -55,17 +65,43 @@ class NuclearPlant:
 
 # Dependency Class (Lisa depends on this to play)
 # Depicted by Lisa ..> Saxophone in UML
-class Saxophone:
+class Saxophone(Flyweight):
     """
     Represents a Saxophone.
     Corresponds to the Saxophone class in the UML diagram.
     Lisa depends on this (uses it to play).
     """
+    __slots__ = ("type",)
+
     def __init__(self, type):
         """Initializes a Saxophone."""
-        # Attribute: type (Public)
-        self.type = type
+        # Attribute: type (Public, read-only)
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "_str", f"{type} Saxophone")
 
     def __str__(self):
         """String representation of Saxophone."""
-        return f"{self.type} Saxophone"
+        return self._str
+
+
+# --- Flyweight Registries ---
+# Identical items are shared: get_duff_beer("Regular") always returns the
+# same DuffBeer object (as long as it has not been evicted).
+DUFF_BEERS = FlyweightRegistry(DuffBeer, maxsize=256)
+SKATEBOARDS = FlyweightRegistry(Skateboard, maxsize=256)
+SAXOPHONES = FlyweightRegistry(Saxophone, maxsize=64)
+
+
+def get_duff_beer(brand):
+    """Returns the shared DuffBeer for a brand."""
+    return DUFF_BEERS.get(brand)
+
+
+def get_skateboard(model):
+    """Returns the shared Skateboard for a model."""
+    return SKATEBOARDS.get(model)
+
+
+def get_saxophone(type):
+    """Returns the shared Saxophone for a type."""
+    return SAXOPHONES.get(type)
@@ -1,14 +1,18 @@
 """
 main.py - Entry point for the Simpsons RPG game
+
+Run from the directory that contains the simpsons_rpg package:
+    python -m simpsons_rpg
+(or python -m simpsons_rpg.main)
 """
 
-# Add the parent directory to the Python path so we can use relative imports
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import the game module
-from simpsons_rpg.game import run_game
+def main():
+    """Starts the game."""
+    # Imported here, not at the top, so importing main.py stays cheap
+    from simpsons_rpg.game import run_game
+    run_game()
+
 
 if __name__ == "__main__":
-    run_game()
+    main()
@@ -0,0 +1,200 @@
+"""
+messages.py - Contains the message catalog: every narration line as a template
+
+Each line the characters, the family and the car narrate is a Template
+here, compiled once from text such as
+    "{name} drinks a {beer}. 'Mmmm... {brand}!'"
+into its constant pieces and the positions where the values go, then into
+a tiny function that joins those pieces. Rendering a line does no parsing.
+
+say(template, *values) renders a line only if the current sink is
+listening: with a NullSink (batch runs, simulations) no line is built at
+all, and the values are never even turned into strings.
+
+Localization: set_language(translations) swaps the text of any template
+(the same {fields}, in any order); reset_language() goes back to English.
+The Template objects themselves never change identity, so modules can
+keep them in constants.
+"""
+
+import sys
+
+from simpsons_rpg import narration
+from simpsons_rpg.narration import narrate
+
+# The English text of every message. Fields are named in {braces}; the
+# order in which they first appear here is the order of say()'s values.
+ENGLISH = {
+    # Characters
+    "homer.speak": "D'oh!",
+    "marge.speak": "Hmmmm...",
+    "bart.speak": "Eat my shorts!",
+    "lisa.speak": "I'm going to become President someday!",
+    "maggie.speak": "*Pacifier sound*",
+    "homer.eat_donuts": "{name} eats some donuts. Mmm... donuts!",
+    "homer.go_to_work": "\n{name} groans. Time for work at the {plant}!",
+    "homer.get_dressed": "{name} puts on his white shirt and pants.",
+    "homer.drive": "{name} drives the {car} to work.",
+    "homer.walk": "{name} realizes he has no car and walks instead.",
+    "homer.enter_building": "{name} enters the {building}.",
+    "homer.clock_in": "{name} clocks in for work.",
+    "homer.drink": "{name} drinks a {beer}. 'Mmmm... {brand}!'",
+    "homer.pay_for_item": "{name} uses money from working at {plant} to pay for {item}.",
+    "bart.skateboard_set": "{name} now has a {skateboard} skateboard!",
+    "bart.skateboard_removed": "{name} no longer has a skateboard.",
+    "lisa.play": "{name} plays her {instrument} beautifully.",
+    # Family
+    "family.already_member": "{name} is already part of the {family} family.",
+    "family.member_added": "{name} is now part of the {family} family.",
+    "family.members_added": "{names} are now part of the {family} family.",
+    "family.member_removed": "{name} is no longer part of the {family} family.",
+    "family.not_member": "{name} is not part of the {family} family.",
+    # Car
+    "car.driver_set": "{name} is now driving the {car}.",
+    "car.no_driver": "The {car} has no driver.",
+    "car.already_in": "{name} is already in the {car}.",
+    "car.gets_in": "{name} gets in the {car}.",
+    "car.get_in": "{names} get in the {car}.",
+    "car.full": "The {car} is full! {names} can't get in.",
+    "car.gets_out": "{name} gets out of the {car}.",
+    "car.not_in": "{name} is not in the {car}.",
+    "car.driven": "{name} drives the {car} to {place}: {route} ({minutes} minutes).",
+    "car.drives": "The {car} drives to {place}: {route} ({minutes} minutes).",
+    # The day
+    "game.speaks": "{name}: {line}",
+    "game.in_car": "{name} is in the car.",
+    "game.spots_left": "There are {spots} spots left. Who gets in first?",
+    "game.menu_item": "{number}. {name}",
+    "game.occupants": "\nCurrent occupants in the car: {names}",
+    "game.car_status": "Car status: {car}",
+    # The world clock (scheduler.py)
+    "clock.new_day": "\n--- Day {day} ---",
+    # Joining names: "Homer", "Homer and Marge", "Homer, Marge and Bart"
+    "list.separator": ", ",
+    "list.last": "{names} and {last}",
+}
+
+
+class Template:
+    """
+    One precompiled message.
+    The text is split once into constant pieces and value slots, and turned
+    into a small function that joins them: "{name} clocks in." becomes
+        def render(values): return f"{values[0]} clocks in."
+    The f-string compiles to a single BUILD_STRING of the pieces (CPython's
+    own join), so rendering does no parsing or lookups at all.
+    """
+    __slots__ = ("key", "fields", "text", "render")
+
+    def __init__(self, key, text):
+        """Compiles the English text of a message; its fields are fixed from now on."""
+        self.key = key
+        self.fields = tuple(dict.fromkeys(_split(text)[1]))
+        self.compile(text)
+
+    def compile(self, text):
+        """(Re)compiles the template from text that uses this template's fields."""
+        constants, names = _split(text)
+        unknown = set(names) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Message {self.key!r} has unknown fields {sorted(unknown)}")
+        if not names: # A constant message: nothing to fill in
+            constant = sys.intern(constants[0])
+            self.render = lambda values=(): constant
+        else:
+            pieces = []
+            for constant, name in zip(constants, names + [None]):
+                pieces.append(constant.replace("{", "{{").replace("}", "}}"))
+                if name is not None:
+                    pieces.append(f"{{values[{self.fields.index(name)}]}}")
+            namespace = {}
+            exec(f"def render(values=()):\n    return f{''.join(pieces)!r}\n", namespace)
+            self.render = namespace["render"]
+        self.text = text
+
+    def __str__(self):
+        """String representation of the Template."""
+        return self.text
+
+
+def _split(text):
+    """Splits 'a{x}b{y}' into constants ['a', 'b', ''] and field names ['x', 'y']."""
+    constants = []
+    names = []
+    rest = text
+    while True:
+        start = rest.find("{")
+        if start < 0:
+            constants.append(rest)
+            return constants, names
+        end = rest.index("}", start)
+        constants.append(rest[:start])
+        names.append(rest[start + 1:end])
+        rest = rest[end + 1:]
+
+
+# key -> Template, compiled once at import
+MESSAGES = {key: Template(key, text) for key, text in ENGLISH.items()}
+
+
+# +say(template, values) (Public function)
+def say(template, *values):
+    """Narrates a message, rendering it only if the current sink is listening."""
+    if narration.listening:
+        narrate(template.render(values))
+
+
+# +text(key) (Public function)
+def text(key):
+    """Returns a message without fields (e.g. a catchphrase) in the current language."""
+    return MESSAGES[key].render()
+
+
+class NameList:
+    """
+    A list of people that becomes "A, B and C" only when it is rendered,
+    so an unheard message never joins the names.
+    """
+    __slots__ = ("people",)
+
+    def __init__(self, people):
+        """Remembers the people (anything with a name)."""
+        self.people = people
+
+    def __str__(self):
+        """Joins the names in the current language."""
+        names = [person.name for person in self.people]
+        if len(names) == 1:
+            return names[0]
+        separator = MESSAGES["list.separator"].render()
+        return MESSAGES["list.last"].render((separator.join(names[:-1]), names[-1]))
+
+
+# --- Localization ---
+def set_language(translations):
+    """
+    Replaces the text of the messages in 'translations' (key -> text).
+    Messages that are not translated keep their English text.
+    """
+    # Check everything first, so a bad translation changes nothing
+    for key, translated in translations.items():
+        if key not in MESSAGES:
+            raise ValueError(f"Unknown message {key!r}")
+        unknown = set(_split(translated)[1]) - set(MESSAGES[key].fields)
+        if unknown:
+            raise ValueError(f"Message {key!r} has unknown fields {sorted(unknown)}")
+    for key, translated in translations.items():
+        MESSAGES[key].compile(translated)
+
+
+def reset_language():
+    """Puts every message back to English."""
+    for key, english in ENGLISH.items():
+        MESSAGES[key].compile(english)
+
+
+def load_language(path):
+    """Reads translations from a JSON file (key -> text) and switches to them."""
+    import json # Only loading translations needs it
+    with open(path, encoding="utf-8") as f:
+        set_language(json.load(f))
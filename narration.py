@@ -0,0 +1,139 @@
+"""
+narration.py - Contains the narration sinks for the Simpsons RPG
+
+Characters, the family, the car and the game itself do not print directly.
+They call narrate(), which hands the line to the current sink. The default
+PrintSink prints each line exactly like before; the other sinks buffer the
+lines, keep them in memory or throw them away.
+
+A sink whose 'listening' attribute is False (the NullSink) tells the
+message catalog (messages.py) not to build lines at all.
+"""
+
+import sys
+
+
+class PrintSink:
+    """
+    Prints every line as soon as it is narrated (the original behavior).
+    """
+    listening = True
+
+    def write(self, line):
+        """Prints a narration line."""
+        print(line)
+
+    def flush(self):
+        """Nothing is buffered, so there is nothing to flush."""
+        pass
+
+
+class BufferedSink:
+    """
+    Collects narration lines and writes them to a stream in bulk.
+    One write() call per 'buffer_lines' lines instead of one per line.
+    """
+    listening = True
+
+    def __init__(self, stream=None, buffer_lines=1024):
+        """Initializes a buffered sink (stream defaults to sys.stdout)."""
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self._lines = []
+
+    def write(self, line):
+        """Buffers a narration line, flushing when the buffer is full."""
+        self._lines.append(line)
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered lines to the stream."""
+        if self._lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            stream.flush()
+
+
+class ListSink:
+    """
+    Keeps every narration line in memory, in order.
+    Useful for headless runs that want to inspect what happened.
+    """
+    listening = True
+
+    def __init__(self):
+        """Initializes an empty list of lines."""
+        self.lines = []
+
+    def write(self, line):
+        """Stores a narration line."""
+        self.lines.append(line)
+
+    def flush(self):
+        """Lines are kept in memory, so there is nothing to flush."""
+        pass
+
+
+class NullSink:
+    """
+    Throws every narration line away (narration off).
+    """
+    listening = False # Nothing reads these lines, so they need not be built
+
+    def write(self, line):
+        """Ignores a narration line."""
+        pass
+
+    def flush(self):
+        """Nothing is kept, so there is nothing to flush."""
+        pass
+
+
+# The sink that narrate() currently writes to
+_sink = PrintSink()
+
+# Whether the current sink wants lines (sinks without the attribute do)
+listening = True
+
+
+def narrate(line):
+    """Sends a narration line to the current sink."""
+    _sink.write(line)
+
+
+def get_sink():
+    """Returns the current narration sink."""
+    return _sink
+
+
+def set_sink(sink):
+    """Replaces the current narration sink and returns the previous one."""
+    global _sink, listening
+    previous = _sink
+    _sink = sink
+    listening = getattr(sink, "listening", True)
+    return previous
+
+
+class use_sink:
+    """
+    Narrates to 'sink' inside a with-block, flushing it at the end.
+    (A small class rather than contextlib.contextmanager, which would pull
+    contextlib into every start-up.)
+    """
+    def __init__(self, sink):
+        """Remembers the sink to switch to."""
+        self.sink = sink
+        self._previous = None
+
+    def __enter__(self):
+        """Switches to the sink."""
+        self._previous = set_sink(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info):
+        """Flushes the sink and switches back."""
+        self.sink.flush()
+        set_sink(self._previous)
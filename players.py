@@ -0,0 +1,89 @@
+"""
+players.py - Contains the player classes that answer the game's prompts
+
+A player is whatever sits on the other side of the game: it is asked to
+'wait' at pauses and to 'choose' at menus. The ConsolePlayer asks a human
+via input(); the headless players answer from a script, a seed or a policy
+so that run_game can be driven without anyone at the keyboard.
+"""
+
+from simpsons_rpg.narration import get_sink
+
+
+class ConsolePlayer:
+    """
+    Represents a human player at the keyboard.
+    This is the default player and keeps the original interactive behavior.
+    """
+    # +wait(message) (Public method)
+    def wait(self, message):
+        """Pauses the game and waits for the player to press Enter."""
+        get_sink().flush() # Show any buffered narration before the prompt
+        input(message)
+
+    # +choose(prompt, options) (Public method)
+    def choose(self, prompt, options):
+        """Asks the player for a choice and returns the raw answer."""
+        # The options are only a hint here - a human may type anything.
+        get_sink().flush()
+        return input(prompt)
+
+
+class HeadlessPlayer:
+    """
+    Base class for non-interactive players.
+    Pauses are skipped; subclasses decide how menu choices are answered.
+    """
+    def wait(self, message):
+        """Headless players never pause."""
+        pass
+
+    def choose(self, prompt, options):
+        """Placeholder method - subclasses should provide their own choices."""
+        raise NotImplementedError("Subclass must implement abstract method")
+
+
+class ScriptedPlayer(HeadlessPlayer):
+    """
+    Answers prompts from a fixed script of answers, in order.
+    Once the script runs out, the fallback answer is used (which, like a
+    human typing nothing, is not a valid menu option by default).
+    """
+    def __init__(self, answers, fallback=""):
+        """Initializes a player from an iterable of answers."""
+        self._answers = iter(answers)
+        self.fallback = fallback
+
+    def choose(self, prompt, options):
+        """Returns the next scripted answer."""
+        return next(self._answers, self.fallback)
+
+
+class RandomPlayer(HeadlessPlayer):
+    """
+    Picks a valid option uniformly at random.
+    Passing a seed makes the sequence of choices reproducible.
+    """
+    def __init__(self, seed=None):
+        """Initializes a player with its own random number generator."""
+        import random # Only headless runs need it - keeps interactive start-up lean
+        self._rng = random.Random(seed)
+
+    def choose(self, prompt, options):
+        """Returns a random option."""
+        return self._rng.choice(options)
+
+
+class PolicyPlayer(HeadlessPlayer):
+    """
+    Delegates every choice to a policy.
+    A policy is any callable taking (prompt, options) and returning an answer
+    (see policies.py for seeded, reproducible ones).
+    """
+    def __init__(self, policy):
+        """Initializes a player around a policy callable."""
+        self.policy = policy
+
+    def choose(self, prompt, options):
+        """Asks the policy for an answer."""
+        return self.policy(prompt, options)
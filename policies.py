@@ -0,0 +1,119 @@
+"""
+policies.py - Contains the choice policies for headless players
+
+A policy decides how a headless player answers the game's menus (Homer's
+evening choice and who gets in the car first). Policies are small,
+picklable settings objects; for_day(rng) turns one into the
+(prompt, options) -> answer callable that a PolicyPlayer asks.
+
+Randomness comes from day_rng(seed, day): every day gets its own random
+stream, derived by hashing the base seed and the day's index. A day's
+answers therefore depend only on (seed, day), never on which worker
+process played it or how the days were split into chunks, so a batch is
+reproducible bit for bit on one core or many, and on any machine.
+"""
+
+import hashlib
+import random
+
+from simpsons_rpg.players import PolicyPlayer
+
+
+# +day_rng(seed, day) (Public function)
+def day_rng(seed, day):
+    """Returns the independent random stream for day 'day' of a run seeded with 'seed'."""
+    digest = hashlib.blake2b(f"{seed}:{day}".encode(), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+class UniformPolicy:
+    """
+    Picks any valid option with equal probability.
+    """
+    def for_day(self, rng):
+        """Returns the policy for one day, drawing from 'rng'."""
+        return lambda prompt, options: rng.choice(options)
+
+    def __str__(self):
+        """String representation of the policy."""
+        return "uniform"
+
+
+class WeightedPolicy:
+    """
+    Picks options at random in proportion to their weights.
+    weights maps an answer to its weight (e.g. {"1": 3} makes "1" three
+    times as likely as any other option); options not listed weigh 1.
+    """
+    def __init__(self, weights):
+        """Initializes the policy with its weights."""
+        self.weights = dict(weights)
+
+    def for_day(self, rng):
+        """Returns the policy for one day, drawing from 'rng'."""
+        weights = self.weights
+
+        def choose(prompt, options):
+            return rng.choices(options, [weights.get(option, 1) for option in options])[0]
+        return choose
+
+    def __str__(self):
+        """String representation of the policy."""
+        return f"weighted {self.weights}"
+
+
+class ScriptedPolicy:
+    """
+    Gives the same answers in order every day, then the fallback.
+    """
+    def __init__(self, answers, fallback=""):
+        """Initializes the policy with the day's script."""
+        self.answers = list(answers)
+        self.fallback = fallback
+
+    def for_day(self, rng):
+        """Returns the policy for one day (the script ignores 'rng')."""
+        answers = iter(self.answers)
+        return lambda prompt, options: next(answers, self.fallback)
+
+    def __str__(self):
+        """String representation of the policy."""
+        return f"scripted {self.answers}"
+
+
+class GreedyPolicy:
+    """
+    Always picks the option with the highest value.
+    values maps an answer to its value; options not listed are worth 0,
+    and ties go to the first option, so no randomness is involved.
+    """
+    def __init__(self, values):
+        """Initializes the policy with the value of each answer."""
+        self.values = dict(values)
+
+    def for_day(self, rng):
+        """Returns the policy for one day (greedy choices ignore 'rng')."""
+        values = self.values
+        return lambda prompt, options: max(options, key=lambda option: values.get(option, 0))
+
+    def __str__(self):
+        """String representation of the policy."""
+        return f"greedy {self.values}"
+
+
+# Ready-made policies, by the name used on the command line
+POLICIES = {
+    "uniform": UniformPolicy(),
+    "duff-lover": WeightedPolicy({"1": 3}), # Beer 3:1, and Marge first more often
+    "scripted": ScriptedPolicy(["1", "1"]),
+    "greedy": GreedyPolicy({"2": 1}),       # Always donuts, and Bart always first in the car
+}
+
+
+# +policy_players(policy, seed, start) (Public function)
+def policy_players(policy, seed=0, start=0):
+    """
+    Returns a make_player(i) function for run_batch: session i plays day
+    start + i, with that day's own random stream.
+    """
+    return lambda i: PolicyPlayer(policy.for_day(day_rng(seed, start + i)))
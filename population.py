@@ -0,0 +1,343 @@
+"""
+population.py - Contains the Population class, a columnar model of a whole town
+
+One Simpson object per resident is fine for a family, but a town of a
+million residents needs a different layout. A Population keeps one NumPy
+array per attribute (ages, character kinds, assigned cars, beers drunk,
+shifts worked, ...) and one row per resident, and applies the daily
+routines to every row at once:
+    go_to_work()  every worker clocks in (like Homer.go_to_work)
+    drink()       the chosen residents each drink a beer (like Homer.drink)
+    board()       residents get into their assigned cars, 5 seats per car
+                  (the same cap as HomersCar.add_occupant)
+row(i) is a view of one resident that reads and writes the arrays and
+offers the Simpson interface (name, age, speak(), get_secret()) without
+being a Simpson object. character(i) builds an ordinary character object
+from a row instead: a copy, which later changes to either side do not reach.
+Unknown ages (None) are stored as UNKNOWN_AGE, and such residents are
+never counted as workers or drinkers.
+
+NumPy is optional for the rest of the game; only this module needs it.
+"""
+
+try:
+    import numpy as np
+except ImportError: # The rest of the game works without NumPy
+    np = None
+
+from simpsons_rpg.base_characters import Simpson
+from simpsons_rpg.interfaces import CanSpeak
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie, Resident
+
+# Character kinds, stored as a one-byte code per resident
+KINDS = (Simpson, Homer, Marge, Bart, Lisa, Maggie, Resident)
+KIND_CODES = {cls: code for code, cls in enumerate(KINDS)}
+RESIDENT = KIND_CODES[Resident]
+
+# Stored in 'ages' for a resident whose age is None
+UNKNOWN_AGE = -1
+
+# Seats per car (HomersCar has 5: the driver plus 4)
+CAR_SEATS = 5
+
+# Who counts as a worker when no worker flags are given
+WORKING_AGES = (18, 65)
+
+
+class Population:
+    """
+    A town stored column by column.
+    Residents are rows 0..size-1, cars are rows 0..car_count-1; a
+    resident's 'cars' entry is the index of their assigned car (-1 = none).
+    """
+    __slots__ = ("ages", "kinds", "cars", "seated", "beers", "shifts", "workers",
+                 "car_occupants", "names", "catchphrases")
+
+    def __init__(self, size, car_count=0):
+        """Initializes 'size' residents (age 0, no car) and 'car_count' empty cars."""
+        if np is None:
+            raise ImportError("Population needs NumPy (pip install numpy)")
+        # Resident columns
+        self.ages = np.zeros(size, dtype=np.int16)
+        self.kinds = np.full(size, RESIDENT, dtype=np.uint8)
+        self.cars = np.full(size, -1, dtype=np.int32)    # Assigned car
+        self.seated = np.zeros(size, dtype=bool)          # In their car right now
+        self.beers = np.zeros(size, dtype=np.uint32)      # Beers drunk
+        self.shifts = np.zeros(size, dtype=np.uint32)     # Days clocked in
+        self.workers = np.zeros(size, dtype=bool)
+        # Car columns
+        self.car_occupants = np.zeros(car_count, dtype=np.uint8)
+        # Optional per-resident text (None = generated on demand)
+        self.names = None
+        self.catchphrases = None
+
+    # --- Building populations ---
+    @classmethod
+    def generate(cls, size, seed=0, car_share=0.7):
+        """
+        Builds a random town of 'size' residents living in households of 1 to 7.
+        A share 'car_share' of households own one car that all members are
+        assigned to, so big households cannot all fit in it.
+        """
+        rng = np.random.default_rng(seed)
+        # Household sizes until everyone has a household (always enough: mean size is 4)
+        household_sizes = rng.integers(1, 8, size=size // 4 + 1)
+        while household_sizes.sum() < size:
+            household_sizes = np.concatenate([household_sizes, rng.integers(1, 8, size=size // 4 + 1)])
+        households = np.repeat(np.arange(len(household_sizes), dtype=np.int32), household_sizes)[:size]
+        household_count = int(households[-1]) + 1 if size else 0
+
+        owns_car = rng.random(household_count) < car_share
+        car_of_household = np.where(owns_car, np.cumsum(owns_car) - 1, -1).astype(np.int32)
+
+        population = cls(size, int(owns_car.sum()))
+        population.ages[:] = rng.integers(0, 91, size=size)
+        population.cars[:] = car_of_household[households]
+        population.workers[:] = ((population.ages >= WORKING_AGES[0])
+                                 & (population.ages < WORKING_AGES[1]))
+        return population
+
+    @classmethod
+    def from_characters(cls, characters, cars=()):
+        """
+        Builds a population from character objects (one row each, in order).
+        Homers are assigned to their car if it is in 'cars'; drunk beers are counted.
+        """
+        car_index = {id(car): i for i, car in enumerate(cars)}
+        population = cls(len(characters), len(cars))
+        population.names = [member.name for member in characters]
+        population.catchphrases = [getattr(member, "catchphrase", None) for member in characters]
+        for i, member in enumerate(characters):
+            population.ages[i] = UNKNOWN_AGE if member.age is None else member.age
+            population.kinds[i] = KIND_CODES.get(type(member), 0)
+            car = getattr(member, "car", None)
+            if car is not None and id(car) in car_index:
+                population.cars[i] = car_index[id(car)]
+            if isinstance(member, Homer):
+                population.beers[i] = member.drunk_beers.total()
+        population.workers[:] = ((population.ages >= WORKING_AGES[0])
+                                 & (population.ages < WORKING_AGES[1]))
+        return population
+
+    def __len__(self):
+        """Number of residents."""
+        return len(self.ages)
+
+    @property
+    def car_count(self):
+        """Number of cars."""
+        return len(self.car_occupants)
+
+    # --- Bulk routines ---
+    def _rows(self, who):
+        """Turns None (everyone), a boolean mask or an index array into sorted row indices."""
+        if who is None:
+            return np.arange(len(self.ages))
+        who = np.asarray(who)
+        if who.dtype == bool:
+            return np.flatnonzero(who)
+        return np.unique(who) # Sorted, each resident once
+
+    # +go_to_work() (Public method)
+    def go_to_work(self, who=None):
+        """
+        Every worker (among 'who', by default everyone) clocks in for the day.
+        Returns how many went to work.
+        """
+        working = self.workers if who is None else self.workers & self._mask(who)
+        self.shifts += working # True counts as 1
+        return int(np.count_nonzero(working))
+
+    # +drink(who, beers) (Public method)
+    def drink(self, who, beers=1):
+        """
+        The residents in 'who' each drink 'beers' beers. Listing a resident
+        twice in an index array counts twice. Returns the number of beers drunk.
+        """
+        who = np.asarray(who)
+        if who.dtype == bool:
+            self.beers += who * np.uint32(beers)
+            return int(np.count_nonzero(who)) * beers
+        np.add.at(self.beers, who, beers)
+        return len(who) * beers
+
+    # +board(who) (Public method)
+    def board(self, who=None):
+        """
+        Residents in 'who' (by default everyone) get into their assigned car,
+        in row order, until the car's 5 seats are taken. Residents without a
+        car or already seated are skipped. Returns (boarded, left_out).
+        """
+        rows = self._rows(who)
+        rows = rows[(self.cars[rows] >= 0) & ~self.seated[rows]]
+        if len(rows) == 0:
+            return 0, 0
+        cars = self.cars[rows]
+        order = np.argsort(cars, kind="stable") # Group by car, keep row order in each group
+        rows, cars = rows[order], cars[order]
+        # Position of each resident in their car's queue (0 for the first to arrive)
+        queue_position = np.arange(len(cars)) - np.searchsorted(cars, cars, side="left")
+        fits = queue_position < (CAR_SEATS - self.car_occupants[cars].astype(np.int64))
+        self.seated[rows[fits]] = True
+        self.car_occupants += np.bincount(cars[fits], minlength=self.car_count).astype(np.uint8)
+        boarded = int(np.count_nonzero(fits))
+        return boarded, len(rows) - boarded
+
+    # +leave_cars(who) (Public method)
+    def leave_cars(self, who=None):
+        """Residents in 'who' (by default everyone) get out of their car. Returns how many did."""
+        leaving = self.seated.copy() if who is None else self.seated & self._mask(who)
+        self.seated &= ~leaving
+        self.car_occupants -= np.bincount(self.cars[leaving], minlength=self.car_count).astype(np.uint8)
+        return int(np.count_nonzero(leaving))
+
+    # +day_step(rng, drink_probability) (Public method)
+    def day_step(self, rng, drink_probability=0.3):
+        """
+        One day for the whole town: workers go to work, adults (21+) drink a
+        beer with the given probability, then everyone piles into their car
+        for the evening outing and gets out again.
+        Returns a dict with what happened.
+        """
+        worked = self.go_to_work()
+        drinkers = (self.ages >= 21) & (rng.random(len(self.ages)) < drink_probability)
+        drunk = self.drink(drinkers)
+        boarded, left_out = self.board()
+        self.leave_cars()
+        return {"worked": worked, "beers": drunk, "boarded": boarded, "left_out": left_out}
+
+    def _mask(self, who):
+        """Turns a boolean mask or an index array into a boolean mask."""
+        who = np.asarray(who)
+        if who.dtype == bool:
+            return who
+        mask = np.zeros(len(self.ages), dtype=bool)
+        mask[who] = True
+        return mask
+
+    # --- Single residents ---
+    def name(self, index):
+        """Returns the name of resident 'index'."""
+        return self.names[index] if self.names is not None else f"Resident {index}"
+
+    def set_name(self, index, name):
+        """Renames resident 'index' (the first rename stores every name)."""
+        if self.names is None:
+            self.names = [f"Resident {i}" for i in range(len(self.ages))]
+        self.names[index] = name
+
+    def age(self, index):
+        """Returns the age of resident 'index', or None if it is unknown."""
+        age = int(self.ages[index])
+        return None if age == UNKNOWN_AGE else age
+
+    def set_age(self, index, age):
+        """
+        Sets the age of resident 'index' (None = unknown) and whether they
+        count as a worker, by WORKING_AGES (never, for an unknown age).
+        """
+        self.ages[index] = UNKNOWN_AGE if age is None else age
+        self.workers[index] = age is not None and WORKING_AGES[0] <= age < WORKING_AGES[1]
+
+    # +row(index) (Public method)
+    def row(self, index):
+        """Returns a view of resident 'index' that reads and writes the arrays."""
+        return ResidentRow(self, index)
+
+    # +character(index) (Public method)
+    def character(self, index):
+        """
+        Builds an ordinary character object with the values of resident 'index'.
+        It is a copy: changing it does not change the arrays (use row() for that).
+        """
+        kind = KINDS[self.kinds[index]]
+        name, age = self.name(index), self.age(index)
+        catchphrase = self.catchphrases[index] if self.catchphrases is not None else None
+        return kind(name, age, None, catchphrase=catchphrase)
+
+    def __str__(self):
+        """String representation of the Population."""
+        return f"Population of {len(self.ages):,} residents and {self.car_count:,} cars"
+
+
+class ResidentRow(CanSpeak):
+    """
+    One row of a Population, seen as a resident.
+    Reading or setting an attribute reads or writes the arrays, so a row is
+    cheap to create and never goes out of date. It offers the same interface
+    as a Simpson (name, age, speak(), get_secret(), str()) but is not one:
+    isinstance(row, Simpson) is False, and Homer's or Bart's own methods
+    are not available (use the Population routines, or character()).
+    """
+    __slots__ = ("population", "index")
+
+    def __init__(self, population, index):
+        """Initializes a view of row 'index'."""
+        self.population = population
+        self.index = index
+
+    @property
+    def name(self):
+        """The resident's name."""
+        return self.population.name(self.index)
+
+    @name.setter
+    def name(self, name):
+        self.population.set_name(self.index, name)
+
+    @property
+    def age(self):
+        """The resident's age, or None if it is unknown."""
+        return self.population.age(self.index)
+
+    @age.setter
+    def age(self, age):
+        self.population.set_age(self.index, age)
+
+    @property
+    def catchphrase(self):
+        """The resident's catchphrase, or None."""
+        catchphrases = self.population.catchphrases
+        return catchphrases[self.index] if catchphrases is not None else None
+
+    @property
+    def kind(self):
+        """The character class of the resident (Homer, Resident, ...)."""
+        return KINDS[self.population.kinds[self.index]]
+
+    @property
+    def car(self):
+        """Index of the resident's assigned car, or None."""
+        car = int(self.population.cars[self.index])
+        return None if car < 0 else car
+
+    @property
+    def seated(self):
+        """Whether the resident is in their car."""
+        return bool(self.population.seated[self.index])
+
+    @property
+    def beers(self):
+        """How many beers the resident has drunk."""
+        return int(self.population.beers[self.index])
+
+    @property
+    def shifts(self):
+        """How many days the resident has clocked in."""
+        return int(self.population.shifts[self.index])
+
+    def speak(self):
+        """Says what the resident's character class says, without building a character."""
+        catchphrase = self.catchphrase
+        if catchphrase is not None:
+            return catchphrase
+        # The classes' speak() only reads name and catchphrase, which a row has too
+        return self.kind.speak(self)
+
+    def get_secret(self):
+        """Returns the resident's secret: always None, a Population stores no secrets."""
+        return None
+
+    def __str__(self):
+        """String representation of the row."""
+        return self.name
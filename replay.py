@@ -0,0 +1,101 @@
+"""
+replay.py - Rebuilds Family and HomersCar state from a recorded event log
+
+The replayer applies each event to freshly created objects, with the
+narration silenced and no recorders attached, so a session can be
+reproduced without running the interactive flow again. A log can hold
+several sessions (see events.SessionStarted); one of them is rebuilt.
+"""
+
+from simpsons_rpg import events
+from simpsons_rpg.base_characters import Simpson
+from simpsons_rpg.family import Family
+from simpsons_rpg.items import get_duff_beer, get_skateboard
+from simpsons_rpg.narration import NullSink, use_sink
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie, Resident
+from simpsons_rpg.vehicles import HomersCar
+
+# Character classes by the name stored in MemberAdded events
+CHARACTER_CLASSES = {cls.__name__: cls for cls in (Simpson, Homer, Marge, Bart, Lisa, Maggie,
+                                                     Resident)}
+
+
+class ReplayedWorld:
+    """
+    The state rebuilt by a replay.
+    Families are keyed by last name, cars by their number in the log (see
+    events.car_id) and characters by name. Secrets are not recorded, so
+    they are None.
+    """
+    def __init__(self):
+        """Initializes an empty world."""
+        self.families = {}
+        self.cars = {}
+        self.characters = {}
+
+    def character(self, name, character="Simpson", age=None):
+        """Returns the named character, creating it the first time it is seen."""
+        member = self.characters.get(name)
+        if member is None:
+            cls = CHARACTER_CLASSES.get(character, Simpson)
+            member = self.characters[name] = cls(name, age, None)
+        return member
+
+    def apply(self, event):
+        """Applies one event to the world."""
+        if isinstance(event, events.MemberAdded):
+            family = self.families.get(event.family)
+            if family is None:
+                family = self.families[event.family] = Family(event.family)
+            family.add_member(self.character(event.member, event.character, event.age))
+        elif isinstance(event, events.MemberRemoved):
+            self.families[event.family].remove_member(event.member)
+        elif isinstance(event, events.CarBuilt):
+            self.cars[event.car] = HomersCar(event.model, event.color)
+        elif isinstance(event, events.DriverSet):
+            car = self.cars[event.car]
+            driver = self.character(event.driver) if event.driver else None
+            car.set_driver(driver)
+            if isinstance(driver, Homer):
+                driver.car = car
+        elif isinstance(event, events.OccupantAdded):
+            self.cars[event.car].add_occupant(self.character(event.member))
+        elif isinstance(event, events.OccupantRemoved):
+            self.cars[event.car].remove_occupant(self.character(event.member))
+        elif isinstance(event, events.SkateboardSet):
+            bart = self.character(event.bart, "Bart")
+            bart.set_skateboard(get_skateboard(event.skateboard) if event.skateboard else None)
+        elif isinstance(event, events.DrankBeer):
+            self.character(event.homer, "Homer").drink(get_duff_beer(event.brand))
+        # The remaining events (donuts, work, music, bills) change no state.
+
+
+def replay(log, session=None):
+    """
+    Rebuilds a ReplayedWorld from one session of an event log: session
+    number 'session', or the last one in the log. Events recorded before
+    any SessionStarted (e.g. in an EventList) are session 0.
+    'log' is either the bytes of a binary log or an iterable of events.
+    """
+    if isinstance(log, (bytes, bytearray, memoryview)):
+        log = events.read_events(bytes(log))
+    world = ReplayedWorld()
+    current = 0
+    seen = {0}
+    saved_recorders = events.recorders[:]
+    events.recorders.clear() # Replaying must not record the events again
+    try:
+        with use_sink(NullSink()):
+            for event in log:
+                if isinstance(event, events.SessionStarted):
+                    current = event.session
+                    seen.add(current)
+                    if session is None:
+                        world = ReplayedWorld() # Only the last session is kept
+                elif session is None or current == session:
+                    world.apply(event)
+    finally:
+        events.recorders[:] = saved_recorders
+    if session is not None and session not in seen:
+        raise ValueError(f"The log has no session {session}")
+    return world
@@ -0,0 +1,264 @@
+"""
+scheduler.py - Contains the world clock and its event-queue scheduler
+
+run_game plays one day as a fixed script. The Scheduler instead keeps a
+priority queue (a binary heap) of timed actions and runs them in time
+order, so any number of families can live through any number of days:
+scheduling and running an action cost O(log n) for n pending actions.
+
+Time is counted in minutes since the start of day 0. Daily routines
+(schedule_daily) keep a single entry in the queue that re-schedules itself
+for the next day after it runs, so the queue holds one entry per routine,
+not one per routine per day.
+
+Usage:
+    python -m simpsons_rpg.scheduler [days] [families] [seed]
+"""
+
+import heapq
+import random
+import sys
+
+from simpsons_rpg.catalog import default_catalog
+from simpsons_rpg.messages import MESSAGES, say
+from simpsons_rpg.simpson_characters import Homer, Lisa
+from simpsons_rpg.springfield_map import HOME, KWIK_E_MART, create_springfield_map
+from simpsons_rpg.vehicles import HomersCar
+
+MINUTES_PER_DAY = 24 * 60
+
+_NEW_DAY = MESSAGES["clock.new_day"]
+
+
+def at(day, hour, minute=0):
+    """Returns the time (in minutes) of day 'day' at hour:minute."""
+    return day * MINUTES_PER_DAY + hour * 60 + minute
+
+
+def clock_time(time):
+    """Formats a time as 'Day 3 08:00'."""
+    day, minutes = divmod(time, MINUTES_PER_DAY)
+    return f"Day {day} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class ScheduledAction:
+    """
+    One action waiting in the queue.
+    Returned by Scheduler.schedule so that it can be cancelled.
+    """
+    __slots__ = ("time", "func", "args", "cancelled")
+
+    def __init__(self, time, func, args):
+        """Initializes an action to run func(*args) at 'time'."""
+        self.time = time
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancels the action (it stays in the queue but will not run)."""
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    A discrete-event scheduler: a heap of (time, sequence, action) entries.
+    The sequence number keeps actions scheduled for the same minute in the
+    order they were scheduled (and means actions are never compared).
+    """
+    __slots__ = ("now", "_queue", "_sequence", "processed", "_day")
+
+    def __init__(self):
+        """Initializes an empty scheduler at time 0."""
+        self.now = 0
+        self._queue = []
+        self._sequence = 0
+        self.processed = 0 # Actions run so far
+        self._day = None # The last day whose header was narrated (kept across run calls)
+
+    def __len__(self):
+        """Number of pending entries (including cancelled ones not yet popped)."""
+        return len(self._queue)
+
+    # +schedule(time, func, args) (Public method)
+    def schedule(self, time, func, *args):
+        """Schedules func(*args) to run at 'time'. O(log n)."""
+        if time < self.now:
+            raise ValueError(f"Cannot schedule in the past ({clock_time(time)} < {clock_time(self.now)})")
+        action = ScheduledAction(time, func, args)
+        heapq.heappush(self._queue, (time, self._sequence, action))
+        self._sequence += 1
+        return action
+
+    # +schedule_in(delay, func, args) (Public method)
+    def schedule_in(self, delay, func, *args):
+        """Schedules func(*args) to run 'delay' minutes from now."""
+        return self.schedule(self.now + delay, func, *args)
+
+    # +schedule_daily(hour, minute, func, args) (Public method)
+    def schedule_daily(self, hour, minute, func, *args, days=None):
+        """
+        Runs func(day, *args) every day at hour:minute, starting today (or
+        tomorrow if that time has passed), for 'days' days or forever.
+        days=0 schedules nothing.
+        """
+        if days is not None:
+            if days < 0:
+                raise ValueError(f"days must be 0 or more, not {days}")
+            if days == 0:
+                return
+        first_day = self.now // MINUTES_PER_DAY
+        if at(first_day, hour, minute) < self.now:
+            first_day += 1
+        self.schedule(at(first_day, hour, minute), self._run_daily,
+                      func, args, first_day + days if days is not None else None)
+
+    def _run_daily(self, func, args, last_day):
+        """Internal step: runs a daily routine and books its next day."""
+        day = self.now // MINUTES_PER_DAY
+        func(day, *args)
+        if last_day is None or day + 1 < last_day:
+            self.schedule(self.now + MINUTES_PER_DAY, self._run_daily, func, args, last_day)
+
+    # +run(until) (Public method)
+    def run(self, until=None):
+        """
+        Runs actions in time order until the queue is empty or the next
+        action is after 'until', and then moves the clock to 'until' (if
+        given). Narrates a header whenever a new day starts, once per day
+        even across several run calls. Returns the number of actions run.
+        """
+        queue = self._queue
+        pop = heapq.heappop
+        ran = 0
+        day = self._day
+        while queue:
+            time, _, action = queue[0]
+            if until is not None and time > until:
+                break
+            pop(queue)
+            if action.cancelled:
+                continue
+            self.now = time
+            if time // MINUTES_PER_DAY != day:
+                day = self._day = time // MINUTES_PER_DAY
+                say(_NEW_DAY, day)
+            action.func(*action.args)
+            ran += 1
+        if until is not None and until > self.now:
+            self.now = until # Also when the queue ran out before 'until'
+        self.processed += ran
+        return ran
+
+
+# --- Routines ---
+def _go_to_work(day, homer, plant):
+    """Homer's weekday morning: off to the plant."""
+    if day % 7 < 5:
+        homer.go_to_work(plant)
+
+
+def _evening(day, homer, beer, rng):
+    """Homer's evening: home from work, then a beer or some donuts."""
+    if homer.car is not None and homer.car.location != HOME:
+        homer.car.drive_to(HOME)
+    if rng.random() < 0.5:
+        homer.drink(beer)
+    else:
+        homer.eat_donuts()
+
+
+def _practice(day, lisa, instrument):
+    """Lisa's afternoon practice."""
+    lisa.play(instrument)
+
+
+def _weekend_trip(day, scheduler, car, family):
+    """
+    On weekends the whole family drives to the Kwik-E-Mart, shops for an
+    hour and drives back (a two-hour drive for a car that is not on a map).
+    """
+    if day % 7 < 5:
+        return
+    car.add_occupants(family.members)
+    route = car.drive_to(KWIK_E_MART)
+    if route is None:
+        scheduler.schedule_in(120, _trip_over, car)
+    else:
+        scheduler.schedule_in(route.minutes + 60, _trip_over, car)
+
+
+def _trip_over(car):
+    """The car drives home (if it is on a map) and everyone gets out."""
+    car.drive_to(HOME)
+    for occupant in list(car.occupants):
+        car.remove_occupant(occupant)
+
+
+def add_family_routines(scheduler, family, car, plant, beer, instrument, rng, days=None):
+    """
+    Schedules the daily life of a family for 'days' days (or forever):
+    every Homer goes to work at 08:00 on weekdays (days 0-4 of each week)
+    and has his evening at 18:00, every Lisa practices at 16:00, and on
+    weekends the family takes the car to the Kwik-E-Mart at 10:00.
+    Returns the number of routines scheduled.
+    """
+    routines = 0
+    for member in family.members:
+        if isinstance(member, Homer):
+            scheduler.schedule_daily(8, 0, _go_to_work, member, plant, days=days)
+            scheduler.schedule_daily(18, 0, _evening, member, beer, rng, days=days)
+            routines += 2
+        elif isinstance(member, Lisa):
+            scheduler.schedule_daily(16, 0, _practice, member, instrument, days=days)
+            routines += 1
+    if car is not None:
+        scheduler.schedule_daily(10, 0, _weekend_trip, scheduler, car, family, days=days)
+        routines += 1
+    return routines
+
+
+def create_town(families, cast=None, springfield=None):
+    """
+    Builds 'families' Simpson households from the catalog, each with its
+    own HomersCar driven by its Homer. Given a SpringfieldMap, every car is
+    parked on it at HOME. Returns [(family, car)].
+    """
+    cast = cast if cast is not None else default_catalog()
+    town = []
+    for _ in range(families):
+        family = cast.create_family("Simpson")
+        car = HomersCar("Sedan", "Pink")
+        homer = family.get("Homer")
+        homer.car = car
+        car.set_driver(homer)
+        if springfield is not None:
+            car.map, car.location = springfield, HOME
+        town.append((family, car))
+    return town
+
+
+def simulate_town(days, families, seed=0):
+    """
+    Lives 'days' days in a town of 'families' Simpson households, whose
+    cars all drive on one map of Springfield (routes are shared through
+    its cache). Returns the Scheduler ('processed' counts the actions).
+    """
+    cast = default_catalog()
+    plant, beer, sax = cast.place("plant"), cast.item("duff"), cast.item("saxophone")
+    rng = random.Random(seed)
+    scheduler = Scheduler()
+    springfield = create_springfield_map(cast)
+    for family, car in create_town(families, cast, springfield):
+        add_family_routines(scheduler, family, car, plant, beer, sax, rng, days=days)
+    scheduler.run()
+    return scheduler
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    days = args[0] if len(args) > 0 else 7
+    families = args[1] if len(args) > 1 else 1
+    seed = args[2] if len(args) > 2 else 0
+    scheduler = simulate_town(days, families, seed)
+    print(f"\n{scheduler.processed} actions over {days} days ({clock_time(scheduler.now)})")
@@ -0,0 +1,136 @@
+"""
+server.py - Hosts many concurrent game sessions over a local socket
+
+Each connection gets its own day in Springfield (its own Family, HomersCar
+and characters). The day is the play_day generator from game.py, so a
+session is just a suspended generator plus a stream: waiting for a player
+costs no thread and no CPU, and thousands of idle sessions fit in one
+process (raise 'ulimit -n' for 10k connections).
+
+Protocol (text, one line each way):
+    server -> client   narration lines, then a prompt line starting with "> "
+    client -> server   one line: the answer (anything, for a pause)
+The server closes the connection after the last narration line. An answer
+that is not UTF-8 or is longer than the stream limit (64 KiB) gets one
+line starting with "! " saying why, and the connection is closed.
+
+Usage:
+    python -m simpsons_rpg.server [--host 127.0.0.1] [--port 8765] [--unix PATH]
+"""
+
+import argparse
+import asyncio
+
+from simpsons_rpg.game import Pause, play_day
+from simpsons_rpg.narration import use_sink
+
+PROMPT_PREFIX = "> "
+ERROR_PREFIX = "! "
+
+
+class SessionSink:
+    """
+    Collects one session's narration until it is sent to the client.
+    """
+    __slots__ = ("lines",)
+
+    def __init__(self):
+        """Initializes an empty sink."""
+        self.lines = []
+
+    def write(self, line):
+        """Stores a narration line."""
+        self.lines.append(line)
+
+    def flush(self):
+        """Lines are sent by the session, so there is nothing to flush."""
+        pass
+
+    def take(self):
+        """Returns the stored lines as text (ending in a newline) and clears them."""
+        text = "\n".join(self.lines) + "\n" if self.lines else ""
+        self.lines.clear()
+        return text
+
+
+class GameServer:
+    """
+    Accepts connections and plays one day per connection.
+    Keeps simple counters so the load generator can see what happened.
+    """
+    def __init__(self):
+        """Initializes a server with no sessions yet."""
+        self.active_sessions = 0
+        self.finished_sessions = 0
+        self._server = None
+
+    async def handle(self, reader, writer):
+        """Plays one session on a connection."""
+        self.active_sessions += 1
+        sink = SessionSink()
+        day = play_day()
+        answer = None
+        try:
+            while True:
+                # Narration is global, so point it at this session's sink while
+                # the day runs; the day never awaits, so sessions cannot interleave.
+                with use_sink(sink):
+                    try:
+                        prompt = day.send(answer)
+                    except StopIteration:
+                        break
+                text = prompt.message if type(prompt) is Pause else prompt.prompt
+                writer.write((sink.take() + PROMPT_PREFIX + text + "\n").encode())
+                await writer.drain()
+                try:
+                    line = await reader.readline()
+                    if not line: # The client went away
+                        return
+                    answer = None if type(prompt) is Pause else line.decode().strip()
+                except UnicodeDecodeError:
+                    await self._refuse(writer, "answers must be UTF-8 text")
+                    return
+                except (ValueError, asyncio.LimitOverrunError): # readline's "line too long"
+                    await self._refuse(writer, "answer line too long")
+                    return
+            writer.write(sink.take().encode())
+            await writer.drain()
+            self.finished_sessions += 1
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            day.close()
+            writer.close()
+
+    async def _refuse(self, writer, reason):
+        """Internal step: tells the client why the session ends (the caller closes it)."""
+        writer.write(f"{ERROR_PREFIX}{reason}\n".encode())
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Starts listening on a TCP port or, if unix_path is given, a Unix socket."""
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self.handle, unix_path, backlog=4096)
+        else:
+            self._server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Starts the server, says where it listens and runs until cancelled."""
+        server = await self.start(host, port, unix_path)
+        print(f"Springfield is open on {unix_path or f'{host}:{port}'}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simpsons RPG game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer().serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,363 @@
+"""
+shared_state.py - Contains SharedWorldState, the world's numbers in shared memory
+
+Sending a Family/HomersCar/character graph to a worker process means
+pickling every object and unpickling it again on the other side. For
+reporting, workers only need the numbers: each member's age and kind,
+who sits in which car seat, how many beers each Homer drank and who has
+a skateboard. export_state() writes those into one block of shared
+memory with a fixed layout:
+
+    header        magic, version, seats per car, character and car counts
+    ages          int16  per character (population.UNKNOWN_AGE = -1 if None)
+    kinds         uint8  per character (codes of population.KINDS)
+    beers         uint32 per character (0 for everyone but Homers)
+    skateboards   uint8  per character (1 if they own one)
+    seats         int32  per car seat (character index, -1 = empty)
+    drivers       int32  per car (character index, -1 = none)
+    name_offsets  uint32 per character + 1, into...
+    names         UTF-8 names, back to back
+
+Each column starts on an 8-byte boundary. A worker attaches by name and
+reads the columns in place through memoryviews (or NumPy arrays), so
+nothing is copied or unpickled however big the town is. The same bytes
+can be saved to a file and memory-mapped with map_file().
+
+Usage:
+    python -m simpsons_rpg.shared_state [families] [workers]
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from multiprocessing import shared_memory
+
+from simpsons_rpg.population import CAR_SEATS, KIND_CODES, UNKNOWN_AGE
+from simpsons_rpg.simpson_characters import Homer, Bart
+
+MAGIC = b"SRPG"
+VERSION = 1
+
+# Header: magic, version, seats per car, characters, cars, bytes of names
+_HEADER = struct.Struct("=4sHHIII")
+HEADER_SIZE = 32
+
+# The columns in layout order: (name, memoryview/NumPy type code)
+COLUMNS = (
+    ("ages", "h"),
+    ("kinds", "B"),
+    ("beers", "I"),
+    ("skateboards", "B"),
+    ("seats", "i"),
+    ("drivers", "i"),
+    ("name_offsets", "I"),
+)
+
+
+def _lengths(characters, cars, seats):
+    """The number of entries in every column."""
+    return {"ages": characters, "kinds": characters, "beers": characters,
+            "skateboards": characters, "seats": cars * seats, "drivers": cars,
+            "name_offsets": characters + 1}
+
+
+def layout(characters, cars, names_size, seats=CAR_SEATS):
+    """
+    Returns ({column: (offset, length)}, total size) for a state holding
+    'characters' characters and 'cars' cars. The names follow the columns.
+    """
+    lengths = _lengths(characters, cars, seats)
+    offsets = {}
+    offset = HEADER_SIZE
+    for name, code in COLUMNS:
+        offsets[name] = (offset, lengths[name])
+        offset += lengths[name] * struct.calcsize(code)
+        offset = (offset + 7) & ~7 # Next column starts on an 8-byte boundary
+    offsets["names"] = (offset, names_size)
+    return offsets, offset + names_size
+
+
+class SharedWorldState:
+    """
+    A fixed-layout view of the world's numbers in a shared buffer.
+    The exporting process owns the shared memory (and unlinks it); readers
+    attach to it by name, or map a saved file, and only read.
+    Views handed out by column() are released by close(); slices of them
+    and NumPy arrays from arrays() must be deleted before close(), as they
+    hold the buffer too.
+    """
+    __slots__ = ("name", "characters", "cars", "seats", "_offsets", "_buffer",
+                 "_memory", "_views", "_owner")
+
+    def __init__(self, memory, buffer, name=None, owner=False):
+        """Reads the header of a buffer that holds a state (use export_state, attach or map_file)."""
+        magic, version, seats, characters, cars, names_size = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a shared world state (or a different version)")
+        self.name = name
+        self.characters = characters
+        self.cars = cars
+        self.seats = seats
+        self._offsets = layout(characters, cars, names_size, seats)[0]
+        self._memory = memory # The SharedMemory or mmap behind the buffer
+        self._buffer = buffer if owner else buffer.toreadonly()
+        self._views = {} # column -> memoryview, made on first use
+        self._owner = owner
+
+    # +attach(name) (Public method)
+    @classmethod
+    def attach(cls, name):
+        """Attaches to a state exported by another process (read-only)."""
+        memory = _open_shared_memory(name)
+        return cls(memory, memory.buf, name)
+
+    # +column(name) (Public method)
+    def column(self, name):
+        """Returns a column as a flat memoryview (read-only unless this process exported it)."""
+        view = self._views.get(name)
+        if view is None:
+            offset, length = self._offsets[name]
+            code = dict(COLUMNS)[name]
+            view = self._views[name] = self._buffer[offset:offset + length * struct.calcsize(code)].cast(code)
+        return view
+
+    @property
+    def ages(self):
+        """Age of every character (UNKNOWN_AGE where it is None)."""
+        return self.column("ages")
+
+    @property
+    def kinds(self):
+        """Character class code of every character (see population.KINDS)."""
+        return self.column("kinds")
+
+    @property
+    def beers(self):
+        """Beers drunk by every character."""
+        return self.column("beers")
+
+    @property
+    def skateboards(self):
+        """1 for every character who owns a skateboard."""
+        return self.column("skateboards")
+
+    @property
+    def drivers(self):
+        """Index of every car's driver (-1 = none)."""
+        return self.column("drivers")
+
+    def occupants(self, car):
+        """Returns the character index (or -1) in each seat of car 'car'."""
+        return self.column("seats")[car * self.seats:(car + 1) * self.seats]
+
+    def character_name(self, index):
+        """Returns the name of character 'index'."""
+        offsets = self.column("name_offsets")
+        start = self._offsets["names"][0]
+        return bytes(self._buffer[start + offsets[index]:start + offsets[index + 1]]).decode("utf-8")
+
+    # +arrays() (Public method)
+    def arrays(self):
+        """
+        Returns the columns as NumPy arrays over the shared bytes (no copy),
+        with the seats shaped (cars, seats per car). Needs NumPy.
+        """
+        import numpy as np # Only the NumPy views need it
+        arrays = {}
+        for name, code in COLUMNS:
+            offset, length = self._offsets[name]
+            arrays[name] = np.frombuffer(self._buffer, dtype=code, count=length, offset=offset)
+        arrays["seats"] = arrays["seats"].reshape(self.cars, self.seats)
+        return arrays
+
+    def summary(self):
+        """Totals over the whole state, read straight from the columns."""
+        known = [age for age in self.ages if age != UNKNOWN_AGE]
+        seated = sum(1 for index in self.column("seats") if index >= 0)
+        return {
+            "characters": self.characters,
+            "cars": self.cars,
+            "mean_age": sum(known) / len(known) if known else 0.0,
+            "beers": sum(self.beers),
+            "skateboards": sum(self.skateboards),
+            "seated": seated,
+        }
+
+    # +write(characters, cars) (Public method)
+    def write(self, characters, cars):
+        """
+        Refreshes the numbers in place (exporting process only). The
+        characters and cars must be the same ones, in the same order, as
+        when the state was exported.
+        """
+        if not self._owner:
+            raise ValueError("Only the exporting process can write the state")
+        if len(characters) != self.characters or len(cars) != self.cars:
+            raise ValueError("write() needs the same characters and cars as the export")
+        _fill(self, characters, cars)
+
+    # +save(path) (Public method)
+    def save(self, path):
+        """Writes the state to a file that map_file() can open."""
+        with open(path, "wb") as f:
+            f.write(self._buffer)
+
+    # +close() (Public method)
+    def close(self):
+        """Releases the views and detaches from the buffer (the state stays for others)."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._buffer.release()
+        self._memory.close()
+
+    # +unlink() (Public method)
+    def unlink(self):
+        """Frees the shared memory for good (exporting process only, after close())."""
+        if self._owner:
+            if sys.version_info < (3, 13):
+                # Readers in child processes share this process's resource tracker, and
+                # _open_shared_memory's unregister removed our registration too; put it
+                # back (registering twice is harmless) so unlink's unregister finds it
+                from multiprocessing import resource_tracker
+                resource_tracker.register(self._memory._name, "shared_memory")
+            self._memory.unlink()
+
+    def __enter__(self):
+        """Uses the state in a with-block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the state, and frees it if this process exported it."""
+        self.close()
+        self.unlink()
+
+    def __len__(self):
+        """Size of the state in bytes."""
+        return len(self._buffer)
+
+    def __str__(self):
+        """String representation of the SharedWorldState."""
+        return (f"Shared world state {self.name or ''} with {self.characters} characters "
+                f"and {self.cars} cars ({len(self._buffer):,} bytes)")
+
+
+def _open_shared_memory(name):
+    """
+    Attaches to existing shared memory without leaving it registered with
+    this process's resource tracker, which would otherwise free it when a
+    reader exits. Python 3.13 has track=False for this; before that,
+    attaching always registers, so the registration is undone right away.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    memory = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+def _fill(state, characters, cars):
+    """Writes the numeric columns of 'characters' and 'cars' into a state."""
+    index_of = {id(character): index for index, character in enumerate(characters)}
+    state.column("ages")[:] = array("h", [UNKNOWN_AGE if character.age is None else character.age
+                                          for character in characters])
+    state.column("kinds")[:] = array("B", [KIND_CODES.get(type(character), 0)
+                                           for character in characters])
+    state.column("beers")[:] = array("I", [character.drunk_beers.total()
+                                           if isinstance(character, Homer) else 0
+                                           for character in characters])
+    state.column("skateboards")[:] = array("B", [isinstance(character, Bart)
+                                                 and character.skateboard is not None
+                                                 for character in characters])
+    seats = array("i")
+    drivers = array("i")
+    for car in cars:
+        car_seats = car.occupants.seats()
+        if len(car_seats) != state.seats:
+            raise ValueError(f"Cars must have {state.seats} seats, not {len(car_seats)}")
+        seats.extend(-1 if occupant is None else index_of.get(id(occupant), -1)
+                     for occupant in car_seats)
+        drivers.append(-1 if car.driver is None else index_of.get(id(car.driver), -1))
+    state.column("seats")[:] = seats
+    state.column("drivers")[:] = drivers
+
+
+# +export_state(characters, cars, name) (Public function)
+def export_state(characters, cars, name=None):
+    """
+    Copies the numbers of 'characters' and 'cars' into new shared memory
+    and returns the owning SharedWorldState. Characters are numbered in
+    the order given; seated occupants and drivers that are not among
+    them are stored as -1. Pass state.name to workers so they can attach.
+    """
+    characters = list(characters)
+    names = [character.name.encode("utf-8") for character in characters]
+    names_size = sum(len(encoded) for encoded in names)
+    offsets, size = layout(len(characters), len(cars), names_size)
+
+    memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+    try:
+        buffer = memory.buf
+        _HEADER.pack_into(buffer, 0, MAGIC, VERSION, CAR_SEATS, len(characters), len(cars), names_size)
+        state = SharedWorldState(memory, buffer, memory.name, owner=True)
+        _fill(state, characters, cars)
+        name_offsets = state.column("name_offsets")
+        start = offsets["names"][0]
+        position = 0
+        for index, encoded in enumerate(names):
+            name_offsets[index] = position
+            buffer[start + position:start + position + len(encoded)] = encoded
+            position += len(encoded)
+        name_offsets[len(names)] = position
+    except BaseException:
+        memory.close()
+        memory.unlink()
+        raise
+    return state
+
+
+def export_world(world, name=None):
+    """Exports a World's characters (in World.characters order) and cars."""
+    return export_state(world.characters.values(), world.cars, name)
+
+
+def map_file(path):
+    """Opens a state saved with save() by memory-mapping the file (read-only)."""
+    with open(path, "rb") as f:
+        memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return SharedWorldState(memory, memoryview(memory))
+
+
+# +summarize(name) (Public function)
+def summarize(name):
+    """
+    Worker task: attaches to an exported state by name and returns its
+    summary. Only the name goes to the worker and only the totals come back.
+    """
+    state = SharedWorldState.attach(name)
+    try:
+        return state.summary()
+    finally:
+        state.close()
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+    from simpsons_rpg.narration import NullSink, use_sink
+    from simpsons_rpg.scheduler import create_town
+
+    args = [int(arg) for arg in sys.argv[1:3]]
+    families = args[0] if len(args) > 0 else 1000
+    workers = args[1] if len(args) > 1 else 2
+    with use_sink(NullSink()):
+        town = create_town(families)
+        for family, car in town:
+            car.add_occupants(family.members)
+    characters = [member for family, _ in town for member in family.members]
+    with export_state(characters, [car for _, car in town]) as state:
+        print(state)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for summary in pool.map(summarize, [state.name] * workers):
+                print(summary)
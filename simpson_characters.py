@@ -2,82 +2,168 @@
 simpson_characters.py - Contains the specific Simpson character classes
 """
 
+from simpsons_rpg import events
 from simpsons_rpg.base_characters import Simpson
+from simpsons_rpg.beer_log import BeerList
+from simpsons_rpg.messages import MESSAGES, say, text
+
+# Narration templates (see messages.py), looked up once
+_EAT_DONUTS = MESSAGES["homer.eat_donuts"]
+_GO_TO_WORK = MESSAGES["homer.go_to_work"]
+_GET_DRESSED = MESSAGES["homer.get_dressed"]
+_DRIVE = MESSAGES["homer.drive"]
+_WALK = MESSAGES["homer.walk"]
+_ENTER_BUILDING = MESSAGES["homer.enter_building"]
+_CLOCK_IN = MESSAGES["homer.clock_in"]
+_DRINK = MESSAGES["homer.drink"]
+_PAY_FOR_ITEM = MESSAGES["homer.pay_for_item"]
+_SKATEBOARD_SET = MESSAGES["bart.skateboard_set"]
+_SKATEBOARD_REMOVED = MESSAGES["bart.skateboard_removed"]
+_PLAY = MESSAGES["lisa.play"]
+
+
+class _CountedInFamilies:
+    """
+    Mixin for characters whose changes are counted in their families'
+    FamilyStats (Homer's beers, Bart's skateboard). The class keeps a _stats
+    slot of weak references to those stats, filled in by Family.
+    """
+    __slots__ = ()
+
+    def _family_stats(self):
+        """Internal step: the FamilyStats to report to (forgetting families that are gone)."""
+        found = [stats for stats in (ref() for ref in self._stats) if stats is not None]
+        if len(found) < len(self._stats):
+            self._stats = tuple(ref for ref in self._stats if ref() is not None)
+        return found
+
+    def __getstate__(self):
+        """Copies and pickles leave out the links to family stats (the copy is in no family)."""
+        slots = {}
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot != "__weakref__" and hasattr(self, slot):
+                    slots[slot] = getattr(self, slot)
+        slots["_stats"] = ()
+        return None, slots
+
 
 # --- Subclasses (Inheritance) ---
 # Represents the "is-a" relationship (e.g., Homer is a Simpson)
-class Homer(Simpson):
+class Homer(_CountedInFamilies, Simpson):
     """
     Represents Homer Simpson, inheriting from Simpson.
     Corresponds to the Homer class in the UML diagram.
+    Add beers with drink(): it (and assigning drunk_beers) keeps the beer
+    totals of Homer's families up to date, appending to the log directly does not.
     """
-    def __init__(self, name, age, secret):
-        """Initializes Homer Simpson."""
+    __slots__ = ("_drunk_beers", "car", "_stats")
+
+    def __init__(self, name, age, secret, beer_log=None, catchphrase=None):
+        """
+        Initializes Homer Simpson.
+        beer_log decides how drunk beers are remembered: by default a BeerList
+        keeps all of them; pass a BeerTally for long sessions (see beer_log.py).
+        """
         # Inheritance: Call the parent class (Simpson) constructor
-        super().__init__(name, age, secret)
+        super().__init__(name, age, secret, catchphrase)
+        # -_stats: weak references to the FamilyStats of Homer's families (kept by Family)
+        self._stats = ()
         # Association: Homer drinks 0..* DuffBeer
-        # This is implemented by holding a list of DuffBeer objects.
-        self.drunk_beers = []
+        # This is implemented by holding a collection of DuffBeer objects.
+        self.drunk_beers = BeerList() if beer_log is None else beer_log
         # Association: Homer drives 0 or 1 HomersCar
         # This is implemented by holding a reference to a HomersCar object, or None.
         self.car = None # None indicates 0 (Optional)
 
+    @property
+    def drunk_beers(self):
+        """The log of the beers Homer drank (a BeerList or BeerTally)."""
+        return self._drunk_beers
+
+    @drunk_beers.setter
+    def drunk_beers(self, beer_log):
+        # A plain list (or any iterable of beers) still works: it becomes a BeerList
+        if not hasattr(beer_log, "total"):
+            beer_log = BeerList(beer_log)
+        # Replacing the log changes the families' beer totals by the difference
+        change = beer_log.total() - (self._drunk_beers.total() if hasattr(self, "_drunk_beers") else 0)
+        self._drunk_beers = beer_log
+        if change and self._stats:
+            for stats in self._family_stats():
+                stats.beers += change
+
     # Overriding the speak method with Homer's unique sound
     # +speak() (Public method, overrides parent)
     def speak(self):
-        """Homer's unique speak sound."""
-        return "D'oh!"
+        """Homer's unique speak sound (unless the catalog gives Homer a catchphrase)."""
+        if self.catchphrase is not None:
+            return self.catchphrase
+        return text("homer.speak")
 
     # +eat_donuts() (Public method)
     def eat_donuts(self):
         """Homer eats donuts."""
-        print(f"{self.name} eats some donuts. Mmm... donuts!")
+        say(_EAT_DONUTS, self.name)
+        if events.recorders:
+            events.record(events.AteDonuts(self.name))
 
     # +go_to_work() (Public method)
     # Dependency: This method depends on (uses) a NuclearPlant object.
     # Abstraction: This public method hides the complex internal steps of going to work.
     def go_to_work(self, plant): # Depends on 'plant' object
         """Initiates Homer's work routine, demonstrating abstraction and dependency."""
-        print(f"\n{self.name} groans. Time for work at the {plant.name}!")
+        say(_GO_TO_WORK, self.name, plant.name)
         # Calling internal/private methods that are part of the abstraction
         self._get_dressed() # Calling a 'private' internal method
-        self._drive(self.car) # Calling an internal method that depends on self.car
+        self._drive(self.car, plant.name) # Calling an internal method that depends on self.car
         self._enter_building(plant) # Calling an internal method that depends on 'plant'
         self._clock_in() # Calling another internal method
+        if events.recorders:
+            events.record(events.ClockedIn(self.name, plant.name))
 
     # -_get_dressed() (Private method - internal implementation detail)
     def _get_dressed(self):
         """Internal step: Homer gets dressed."""
-        print(f"{self.name} puts on his white shirt and pants.")
+        say(_GET_DRESSED, self.name)
 
-    # -_drive(car) (Private method with dependency on car)
-    def _drive(self, car):
-        """Internal step: Homer drives the car."""
+    # -_drive(car, destination) (Private method with dependency on car)
+    def _drive(self, car, destination=None):
+        """Internal step: Homer drives the car (along its route, if the car is on a map)."""
         if car:
-            print(f"{self.name} drives the {car} to work.")
+            # On a map the car narrates the route; otherwise Homer just drives to work
+            if destination is None or car.drive_to(destination) is None:
+                say(_DRIVE, self.name, car)
         else:
-            print(f"{self.name} realizes he has no car and walks instead.")
+            say(_WALK, self.name)
 
     def _enter_building(self, building):
         """Internal step: Homer enters a building."""
-        print(f"{self.name} enters the {building}.")
+        say(_ENTER_BUILDING, self.name, building)
 
     def _clock_in(self):
         """Internal step: Homer clocks in."""
-        print(f"{self.name} clocks in for work.")
+        say(_CLOCK_IN, self.name)
 
     # +drink(beer) (Public method with dependency on beer)
     def drink(self, beer):
         """Homer drinks a Duff Beer."""
-        self.drunk_beers.append(beer) # Add to the list of drunk beers
-        print(f"{self.name} drinks a {beer}. 'Mmmm... {beer.brand}!'")
+        self._drunk_beers.append(beer) # Add to the list of drunk beers
+        if self._stats: # Keep the families' beer totals up to date
+            for stats in self._family_stats():
+                stats.beers += 1
+        say(_DRINK, self.name, beer, beer.brand)
+        if events.recorders:
+            events.record(events.DrankBeer(self.name, beer.brand))
 
     # +pay_for_item(item, plant) (Public method with multiple dependencies)
     # Demonstrates dependency chain: Homer depends on plant for money to pay for item
     def pay_for_item(self, item, plant):
         """Homer uses earnings (from plant) to pay for an item."""
         # This method depends on both 'item' and 'plant' objects
-        print(f"{self.name} uses money from working at {plant.name} to pay for {item}.")
+        say(_PAY_FOR_ITEM, self.name, plant.name, item)
+        if events.recorders:
+            events.record(events.PaidForItem(self.name, str(item), plant.name))
 
 
 class Marge(Simpson):
@@ -85,39 +171,68 @@ class Marge(Simpson):
     Represents Marge Simpson, inheriting from Simpson.
     Corresponds to the Marge class in the UML diagram.
     """
+    __slots__ = ()
+
     # Overriding the speak method with Marge's unique sound
     def speak(self):
-        """Marge's unique speak sound."""
-        return "Hmmmm..."
+        """Marge's unique speak sound (unless the catalog gives Marge a catchphrase)."""
+        if self.catchphrase is not None:
+            return self.catchphrase
+        return text("marge.speak")
 
 
-class Bart(Simpson):
+class Bart(_CountedInFamilies, Simpson):
     """
     Represents Bart Simpson, inheriting from Simpson.
     Corresponds to the Bart class in the UML diagram.
     """
-    def __init__(self, name, age, secret):
+    __slots__ = ("_skateboard", "_stats")
+
+    def __init__(self, name, age, secret, catchphrase=None):
         """Initializes Bart Simpson."""
         # Inheritance: Call the parent class constructor
-        super().__init__(name, age, secret)
+        super().__init__(name, age, secret, catchphrase)
+        # -_stats: weak references to the FamilyStats of Bart's families (kept by Family)
+        self._stats = ()
         # Aggregation: Bart owns 0..1 Skateboard
         # This is implemented by holding a reference to a Skateboard object, or None.
         self.skateboard = None # None indicates 0 (Optional)
 
+    @property
+    def skateboard(self):
+        """Bart's skateboard, or None."""
+        return self._skateboard
+
+    @skateboard.setter
+    def skateboard(self, skateboard):
+        # Every change goes through here, so the families' skateboard owners stay up to date
+        self._skateboard = skateboard
+        if self._stats:
+            for stats in self._family_stats():
+                if skateboard is None:
+                    stats.skateboarders.discard(self)
+                else:
+                    stats.skateboarders.add(self)
+
     # Overriding the speak method with Bart's unique sound
     def speak(self):
-        """Bart's unique speak sound."""
-        return "Eat my shorts!"
+        """Bart's unique speak sound (unless the catalog gives Bart a catchphrase)."""
+        if self.catchphrase is not None:
+            return self.catchphrase
+        return text("bart.speak")
 
     # +set_skateboard(skateboard) (Public method)
     def set_skateboard(self, skateboard):
         """Sets or removes Bart's skateboard."""
         # This method demonstrates aggregation - Bart "has-a" skateboard
-        self.skateboard = skateboard
+        self.skateboard = skateboard # The property keeps the families' totals up to date
+        if events.recorders:
+            events.record(events.SkateboardSet(self.name,
+                                               skateboard.model if skateboard else None))
         if skateboard:
-            print(f"{self.name} now has a {skateboard} skateboard!")
+            say(_SKATEBOARD_SET, self.name, skateboard)
         else:
-            print(f"{self.name} no longer has a skateboard.")
+            say(_SKATEBOARD_REMOVED, self.name)
 
 
 class Lisa(Simpson):
@@ -125,16 +240,22 @@ class Lisa(Simpson):
     Represents Lisa Simpson, inheriting from Simpson.
     Corresponds to the Lisa class in the UML diagram.
     """
+    __slots__ = ()
+
     # Overriding the speak method with Lisa's unique sound
     def speak(self):
-        """Lisa's unique speak sound."""
-        return "I'm going to become President someday!"
+        """Lisa's unique speak sound (unless the catalog gives Lisa a catchphrase)."""
+        if self.catchphrase is not None:
+            return self.catchphrase
+        return text("lisa.speak")
 
     # +play(instrument) (Public method with dependency on instrument)
     def play(self, instrument):
         """Lisa plays an instrument."""
         # This method depends on an 'instrument' object
-        print(f"{self.name} plays her {instrument} beautifully.")
+        say(_PLAY, self.name, instrument)
+        if events.recorders:
+            events.record(events.Played(self.name, str(instrument)))
 
 
 class Maggie(Simpson):
@@ -142,7 +263,21 @@ class Maggie(Simpson):
     Represents Maggie Simpson, inheriting from Simpson.
     Corresponds to the Maggie class in the UML diagram.
     """
+    __slots__ = ()
+
     # Overriding the speak method with Maggie's unique sound
     def speak(self):
-        """Maggie's unique speak sound."""
-        return "*Pacifier sound*"
+        """Maggie's unique speak sound (unless the catalog gives Maggie a catchphrase)."""
+        if self.catchphrase is not None:
+            return self.catchphrase
+        return text("maggie.speak")
+
+
+class Resident(Simpson):
+    """
+    Any other Springfield resident (Ned, Moe, Apu, ...).
+    One data-driven class instead of one class per character: the line a
+    resident speaks is data (its catchphrase, see catalog.py), not a method
+    override. Without a catchphrase a resident gives the generic greeting.
+    """
+    __slots__ = ()
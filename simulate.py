@@ -0,0 +1,124 @@
+"""
+simulate.py - Entry point for large headless simulations of Springfield days
+
+Every day is independent (a fresh family, car and cast), so days are split
+into chunks and farmed out to a pool of worker processes. Each worker plays
+its chunk with the narration silenced and sends back only the tallies.
+
+Usage:
+    python -m simpsons_rpg.simulate [days] [workers] [chunk_size] [seed] [policy]
+where policy is one of the names in policies.POLICIES (default: uniform).
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from simpsons_rpg.batch import run_batch
+from simpsons_rpg.policies import POLICIES, UniformPolicy, policy_players
+
+# What each answer at the evening menu means (anything else is "couch")
+EVENING_CHOICES = {"1": "Duff Beer", "2": "Donuts"}
+
+
+class SimulationStats:
+    """
+    Aggregated outcome statistics for a simulation.
+    Only counters are kept, so the size does not grow with the number of days.
+    """
+    def __init__(self):
+        """Initializes empty statistics."""
+        self.days = 0
+        self.evening_choices = Counter()
+        self.seating_orders = Counter()
+        self.seconds = 0.0
+
+    def add_day(self, day):
+        """Counts one DayResult."""
+        self.days += 1
+        self.evening_choices[EVENING_CHOICES.get(day.evening_choice, "Couch")] += 1
+        self.seating_orders[tuple(day.seating)] += 1
+
+    def merge(self, other):
+        """Adds the counts of another SimulationStats into this one."""
+        self.days += other.days
+        self.evening_choices.update(other.evening_choices)
+        self.seating_orders.update(other.seating_orders)
+
+    @property
+    def days_per_second(self):
+        """Throughput of the simulation."""
+        if self.seconds == 0:
+            return float("inf")
+        return self.days / self.seconds
+
+    def __str__(self):
+        """String representation of the statistics."""
+        lines = [f"{self.days} days in {self.seconds:.3f}s "
+                 f"({self.days_per_second:,.0f} days/second)",
+                 "Homer's evening choice:"]
+        for choice, count in self.evening_choices.most_common():
+            lines.append(f"  {choice}: {count} ({count / self.days:.1%})")
+        lines.append("Car seating orders:")
+        for order, count in self.seating_orders.most_common():
+            lines.append(f"  {' > '.join(order)}: {count} ({count / self.days:.1%})")
+        return "\n".join(lines)
+
+
+def _play_chunk(start, stop, seed, policy):
+    """Worker task: plays days [start, stop) and returns their tallies."""
+    stats = SimulationStats()
+    batch = run_batch(stop - start, policy_players(policy, seed, start))
+    for day in batch.days:
+        stats.add_day(day)
+    return stats
+
+
+def _chunks(days, chunk_size):
+    """Splits range(days) into (start, stop) work units."""
+    for start in range(0, days, chunk_size):
+        yield start, min(start + chunk_size, days)
+
+
+def simulate(days, workers=None, chunk_size=1000, seed=0, policy=None):
+    """
+    Plays 'days' headless days across a process pool and aggregates the outcomes.
+    Choices come from 'policy' (see policies.py; uniform by default). Day i
+    always draws from the random stream of (seed, i), so the totals do not
+    depend on how many workers are used or how the days are chunked.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if policy is None:
+        policy = UniformPolicy()
+
+    total = SimulationStats()
+    start = time.perf_counter()
+    if workers == 1:
+        # No pool needed - avoids the process start-up cost for small runs
+        for lo, hi in _chunks(days, chunk_size):
+            total.merge(_play_chunk(lo, hi, seed, policy))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            units = list(_chunks(days, chunk_size))
+            results = pool.map(_play_chunk,
+                               [lo for lo, _ in units],
+                               [hi for _, hi in units],
+                               [seed] * len(units),
+                               [policy] * len(units))
+            for stats in results:
+                total.merge(stats)
+    total.seconds = time.perf_counter() - start
+    return total
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:5]]
+    days = args[0] if len(args) > 0 else 100_000
+    workers = args[1] if len(args) > 1 else None
+    chunk_size = args[2] if len(args) > 2 else 1000
+    seed = args[3] if len(args) > 3 else 0
+    policy = POLICIES[sys.argv[5] if len(sys.argv) > 5 else "uniform"]
+    print(simulate(days, workers, chunk_size, seed, policy))
@@ -0,0 +1,349 @@
+"""
+snapshot.py - Saves and restores whole object graphs in a compact binary format
+
+A snapshot can hold a World, a dict or list of game objects, or a single
+object. Cross-references (HomersCar.driver -> Homer, Homer.car -> HomersCar,
+Family.members -> characters) are kept: every object is written once and
+referred to by its ID, so a restored graph has the same shape.
+
+Format:
+    MAGIC
+    strings  := varint(count) (varint(len) utf8)*    every string, once
+    classes  := varint(count) varint(string id)*     class names used
+    objects  := varint(count) varint(class index)*   one class per object ID
+    records  := (varint(count) value*)*              each object's fields, in ID order
+    root     := value
+Values are tagged: None, False, True, int (zigzag varint), float (8 bytes,
+IEEE 754 little-endian), string (ID), object reference (ID), list, tuple,
+dict, or flyweight (class index + its whole spec as a tuple).
+Flyweights (beers, skateboards, engines, ...) are plain values and come
+back as the shared instances from their registries.
+"""
+
+import struct
+
+from simpsons_rpg.base_characters import Simpson
+from simpsons_rpg.beer_log import BeerList, BeerTally
+from simpsons_rpg.family import Family
+from simpsons_rpg.items import (DuffBeer, NuclearPlant, Saxophone, Skateboard,
+                                get_duff_beer, get_saxophone, get_skateboard)
+from simpsons_rpg.simpson_characters import Homer, Marge, Bart, Lisa, Maggie, Resident
+from simpsons_rpg.springfield_map import SpringfieldMap
+from simpsons_rpg.vehicles import Engine, HomersCar, SeatSlots, Wheel, get_engine, get_wheel
+from simpsons_rpg.world import World
+
+MAGIC = b"SRPGSN1\n"
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _STR, _REF, _LIST, _TUPLE, _DICT, _FLYWEIGHT, _FLOAT = range(11)
+
+_DOUBLE = struct.Struct("<d")
+
+# Flyweight classes and how to get their shared instance back
+FLYWEIGHTS = {DuffBeer: get_duff_beer, Skateboard: get_skateboard, Saxophone: get_saxophone,
+              Engine: get_engine, Wheel: get_wheel}
+
+# Classes that are stored as objects (by reference)
+CLASSES = {cls.__name__: cls for cls in
+           (Simpson, Homer, Marge, Bart, Lisa, Maggie, Resident, Family, HomersCar, NuclearPlant,
+            BeerList, BeerTally, SpringfieldMap, World)}
+CLASSES.update({cls.__name__: cls for cls in FLYWEIGHTS})
+
+
+# --- What is stored for each kind of object ---
+def _fields(obj):
+    """Returns the list of values stored for an object."""
+    if isinstance(obj, Simpson):
+        fields = [obj.name, obj.age, obj._secret]
+        if isinstance(obj, Homer):
+            fields += [obj.drunk_beers, obj.car]
+        if isinstance(obj, Bart):
+            fields.append(obj.skateboard)
+        fields.append(obj.catchphrase)
+        return fields
+    if isinstance(obj, Family):
+        return [obj.lastName, list(obj.members)]
+    if isinstance(obj, HomersCar):
+        return [obj.model, obj.color, obj.engine, obj.wheels,
+                obj.occupants.seats(), obj.driver, obj.map, obj.location]
+    if isinstance(obj, SpringfieldMap):
+        return [obj.caching, obj.places(), obj.roads()]
+    if isinstance(obj, BeerList):
+        return [list(obj)]
+    if isinstance(obj, BeerTally):
+        return [obj._total, obj._counts, obj._recent.maxlen, list(obj._recent)]
+    if isinstance(obj, NuclearPlant):
+        return [obj.name]
+    if isinstance(obj, World):
+        return [obj.families, obj.cars, obj.characters, obj.places, obj.items]
+    raise TypeError(f"Cannot snapshot {type(obj).__name__} objects")
+
+
+def _shell(cls):
+    """Creates an empty object of a class, to be filled by _fill."""
+    if cls is BeerList:
+        return BeerList()
+    if cls is BeerTally:
+        return BeerTally()
+    if cls is World:
+        return World()
+    if cls is SpringfieldMap:
+        return SpringfieldMap()
+    return cls.__new__(cls) # No __init__: no narration, no events
+
+
+def _fill(obj, fields):
+    """Restores an object's state from its stored values."""
+    if isinstance(obj, Simpson):
+        obj.name, obj.age, obj._secret = fields[:3]
+        rest = fields[3:]
+        if isinstance(obj, Homer):
+            obj._stats = () # Linked again when a family's stats are next read
+            obj.drunk_beers, obj.car = rest[:2]
+            rest = rest[2:]
+        if isinstance(obj, Bart):
+            obj._stats = ()
+            obj.skateboard = rest[0]
+            rest = rest[1:]
+        # Snapshots made before every Simpson had a catchphrase only stored a Resident's
+        obj.catchphrase = rest[0] if rest else None
+    elif isinstance(obj, Family):
+        obj.__init__(fields[0])
+        obj._by_name = fields[1] # A list until _finish keys it by name
+    elif isinstance(obj, HomersCar):
+        model, color, engine, wheels, seats, driver = fields[:6]
+        obj._model, obj._color = model, color
+        obj._engine, obj._wheels = engine, tuple(wheels)
+        obj._label, obj._str = f"{color} {model}", None
+        obj.occupants = SeatSlots.from_seats(seats)
+        obj.driver = driver
+        # Snapshots made before cars had a map have 6 fields
+        obj.map, obj.location = fields[6:] or (None, None)
+        obj._event_id = 0 # A restored car gets a new number when it is next recorded
+    elif isinstance(obj, SpringfieldMap):
+        caching, places, roads = fields
+        obj.caching = caching
+        for place in places:
+            obj.add_place(place)
+        for a, b, minutes in roads:
+            obj.add_road(a, b, minutes)
+    elif isinstance(obj, BeerList):
+        obj.extend(fields[0])
+    elif isinstance(obj, BeerTally):
+        total, counts, history, recent = fields
+        obj.__init__(history)
+        obj._total, obj._counts = total, counts
+        obj._recent.extend(recent)
+    elif isinstance(obj, NuclearPlant):
+        obj.name = fields[0]
+    elif isinstance(obj, World):
+        obj.families, obj.cars, obj.characters, obj.places, obj.items = fields
+
+
+def _finish(obj):
+    """Rebuilds derived state once every object has been filled."""
+    if isinstance(obj, Family):
+        members = obj._by_name
+        obj._members = {id(member): member for member in members}
+        obj._by_name = {member.name: member for member in members}
+
+
+# --- Encoding ---
+def _varint(out, number):
+    """Appends a non-negative integer as a varint."""
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+class _Encoder:
+    """Walks an object graph, giving each object and string an ID."""
+    def __init__(self):
+        self.strings = {}
+        self.classes = {}
+        self.object_ids = {}
+        self.objects = []
+
+    def string(self, text):
+        """Returns the ID of a string."""
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+        return string_id
+
+    def class_index(self, cls):
+        """Returns the index of a class in the class table."""
+        index = self.classes.get(cls)
+        if index is None:
+            index = self.classes[cls] = len(self.classes)
+        return index
+
+    def value(self, out, value):
+        """Appends a tagged value."""
+        if value is None:
+            out.append(_NONE)
+        elif value is True or value is False:
+            out.append(_TRUE if value else _FALSE)
+        elif type(value) is int:
+            out.append(_INT)
+            _varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1)) # zigzag
+        elif type(value) is float:
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif type(value) is str:
+            out.append(_STR)
+            _varint(out, self.string(value))
+        elif type(value) in (list, tuple):
+            out.append(_LIST if type(value) is list else _TUPLE)
+            _varint(out, len(value))
+            for item in value:
+                self.value(out, item)
+        elif type(value) is dict:
+            out.append(_DICT)
+            _varint(out, len(value))
+            for key, item in value.items():
+                self.value(out, key)
+                self.value(out, item)
+        elif type(value) in FLYWEIGHTS:
+            out.append(_FLYWEIGHT)
+            _varint(out, self.class_index(type(value)))
+            self.value(out, value.spec())
+        else:
+            object_id = self.object_ids.get(id(value))
+            if object_id is None:
+                if type(value).__name__ not in CLASSES:
+                    raise TypeError(f"Cannot snapshot {type(value).__name__} objects")
+                object_id = self.object_ids[id(value)] = len(self.objects)
+                self.objects.append(value)
+                self.class_index(type(value))
+            out.append(_REF)
+            _varint(out, object_id)
+
+
+def dumps(root):
+    """Serializes a World (or any dict, list or game object) to bytes."""
+    encoder = _Encoder()
+    root_bytes = bytearray()
+    encoder.value(root_bytes, root)
+    records = bytearray()
+    i = 0
+    while i < len(encoder.objects): # Records can reference new objects, growing the list
+        fields = _fields(encoder.objects[i])
+        _varint(records, len(fields))
+        for field in fields:
+            encoder.value(records, field)
+        i += 1
+
+    out = bytearray(MAGIC)
+    # The string table (class names are strings too, so intern them first)
+    class_name_ids = [encoder.string(cls.__name__) for cls in encoder.classes]
+    _varint(out, len(encoder.strings))
+    for text in encoder.strings:
+        data = text.encode("utf-8")
+        _varint(out, len(data))
+        out += data
+    _varint(out, len(class_name_ids))
+    for string_id in class_name_ids:
+        _varint(out, string_id)
+    _varint(out, len(encoder.objects))
+    for obj in encoder.objects:
+        _varint(out, encoder.classes[type(obj)])
+    out += records
+    out += root_bytes
+    return bytes(out)
+
+
+# --- Decoding ---
+class _Decoder:
+    """Reads values back, resolving string and object IDs."""
+    def __init__(self, data):
+        self.data = data
+        self.pos = len(MAGIC)
+        self.strings = []
+        self.classes = []
+        self.objects = []
+
+    def varint(self):
+        """Reads a varint."""
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def value(self):
+        """Reads a tagged value."""
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _REF:
+            return self.objects[self.varint()]
+        if tag == _STR:
+            return self.strings[self.varint()]
+        if tag == _INT:
+            number = self.varint()
+            return (number >> 1) if not number & 1 else -((number + 1) >> 1)
+        if tag == _NONE:
+            return None
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _TUPLE:
+            return tuple(self.value() for _ in range(self.varint()))
+        if tag == _DICT:
+            return {self.value(): self.value() for _ in range(self.varint())}
+        if tag == _FLYWEIGHT:
+            cls = self.classes[self.varint()]
+            spec = self.value()
+            if type(spec) is not tuple: # Older snapshots stored a one-value spec bare
+                spec = (spec,)
+            return FLYWEIGHTS[cls](*spec)
+        if tag == _FLOAT:
+            (number,) = _DOUBLE.unpack_from(self.data, self.pos)
+            self.pos += _DOUBLE.size
+            return number
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        raise ValueError(f"Corrupt snapshot: unknown tag {tag}")
+
+
+def loads(data):
+    """Restores what dumps() saved, with all cross-references intact."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a Simpsons RPG snapshot")
+    decoder = _Decoder(data)
+    for _ in range(decoder.varint()):
+        length = decoder.varint()
+        decoder.strings.append(data[decoder.pos:decoder.pos + length].decode("utf-8"))
+        decoder.pos += length
+    for _ in range(decoder.varint()):
+        name = decoder.strings[decoder.varint()]
+        if name not in CLASSES:
+            raise ValueError(f"Snapshot contains unknown class {name}")
+        decoder.classes.append(CLASSES[name])
+    # First every object is created empty, so references can point forwards...
+    decoder.objects = [_shell(decoder.classes[decoder.varint()])
+                       for _ in range(decoder.varint())]
+    # ...then each one is filled in
+    for obj in decoder.objects:
+        _fill(obj, [decoder.value() for _ in range(decoder.varint())])
+    for obj in decoder.objects:
+        _finish(obj)
+    return decoder.value()
+
+
+def save(root, path):
+    """Writes a snapshot to a file."""
+    with open(path, "wb") as f:
+        f.write(dumps(root))
+
+
+def load(path):
+    """Reads a snapshot from a file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,236 @@
+"""
+springfield_map.py - Contains the map of Springfield and its route finding
+
+Places (742 Evergreen Terrace, the Kwik-E-Mart, the school, the plant,
+...) are the nodes of a graph and two-way roads, each with a travel time
+in minutes, are its edges. route() finds the quickest way between two
+places with Dijkstra's algorithm.
+
+Routing is cached at two levels: the shortest-path tree of every source
+place that has been asked about (one Dijkstra run each), and every Route
+that has been built from one. Thousands of cars commuting between the
+same places therefore cost one dictionary lookup each. Both caches are
+bounded (TREE_CACHE_SIZE trees, ROUTE_CACHE_SIZE routes) and forget the
+least recently used entry first, so a big map does not grow them without
+limit. Adding or removing a road or a place clears both caches, so
+answers are always for the map as it is now.
+
+Usage:
+    python -m simpsons_rpg.springfield_map [from] [to]
+"""
+
+import heapq
+import sys
+from collections import OrderedDict
+
+from simpsons_rpg.catalog import default_catalog
+
+# Where the Simpsons (and the families of scheduler.create_town) live
+HOME = "742 Evergreen Terrace"
+
+# Where the family drives to on weekends
+KWIK_E_MART = "Kwik-E-Mart"
+
+# How many shortest-path trees and Routes a map keeps (least recently used go first)
+TREE_CACHE_SIZE = 256
+ROUTE_CACHE_SIZE = 10_000
+
+
+class Route:
+    """
+    A trip: the places passed through, from start to end, and its length.
+    Routes are shared by everyone who asks for the same trip, so they are
+    never changed (stops is a tuple).
+    """
+    __slots__ = ("stops", "minutes", "_str")
+
+    def __init__(self, stops, minutes):
+        """Initializes a route through 'stops' that takes 'minutes' minutes."""
+        self.stops = tuple(stops)
+        self.minutes = minutes
+        self._str = None
+
+    @property
+    def start(self):
+        """Where the route starts."""
+        return self.stops[0]
+
+    @property
+    def end(self):
+        """Where the route ends."""
+        return self.stops[-1]
+
+    def __str__(self):
+        """String representation of the Route."""
+        if self._str is None:
+            self._str = " -> ".join(self.stops)
+        return self._str
+
+
+class SpringfieldMap:
+    """
+    A road graph: place -> {neighbouring place: minutes}.
+    Shortest paths are cached per source place; set 'caching' to False to
+    run Dijkstra for every query instead (e.g. to measure the cache).
+    """
+    __slots__ = ("_roads", "_trees", "_routes", "caching")
+
+    def __init__(self, caching=True):
+        """Initializes an empty map."""
+        self._roads = {}
+        self._trees = OrderedDict()  # source -> (minutes to each place, previous place on the way)
+        self._routes = OrderedDict() # (start, end) -> Route, least recently used first
+        self.caching = caching
+
+    def _changed(self):
+        """Internal step: forgets every cached path (the map changed)."""
+        self._trees.clear()
+        self._routes.clear()
+
+    # +add_place(place) (Public method)
+    def add_place(self, place):
+        """Adds a place (with no roads yet)."""
+        if place not in self._roads:
+            self._roads[place] = {}
+            self._changed()
+
+    # +add_road(a, b, minutes) (Public method)
+    def add_road(self, a, b, minutes):
+        """Adds a two-way road between two places (replacing any road between them)."""
+        if minutes <= 0:
+            raise ValueError(f"A road must take some time, not {minutes} minutes")
+        if a == b:
+            raise ValueError(f"A road must join two different places, not {a!r} to itself")
+        self._roads.setdefault(a, {})[b] = minutes
+        self._roads.setdefault(b, {})[a] = minutes
+        self._changed()
+
+    # +remove_road(a, b) (Public method)
+    def remove_road(self, a, b):
+        """Closes the road between two places. Returns False if there is none."""
+        if b not in self._roads.get(a, ()):
+            return False
+        del self._roads[a][b]
+        del self._roads[b][a]
+        self._changed()
+        return True
+
+    # +remove_place(place) (Public method)
+    def remove_place(self, place):
+        """Removes a place and its roads. Returns False if it is not on the map."""
+        neighbours = self._roads.pop(place, None)
+        if neighbours is None:
+            return False
+        for neighbour in neighbours:
+            del self._roads[neighbour][place]
+        self._changed()
+        return True
+
+    def places(self):
+        """Returns the places on the map."""
+        return list(self._roads)
+
+    def roads(self):
+        """Returns every road once, as (place, place, minutes)."""
+        seen = set()
+        roads = []
+        for a, neighbours in self._roads.items():
+            seen.add(a)
+            for b, minutes in neighbours.items():
+                if b not in seen:
+                    roads.append((a, b, minutes))
+        return roads
+
+    # +shortest_paths(source) (Public method)
+    def shortest_paths(self, source):
+        """
+        Returns ({place: minutes}, {place: previous place}) for the quickest
+        routes from 'source' to every reachable place (Dijkstra's algorithm,
+        with a binary heap of places to visit).
+        """
+        tree = self._trees.get(source) if self.caching else None
+        if tree is not None:
+            self._trees.move_to_end(source)
+            return tree
+        if source not in self._roads:
+            raise ValueError(f"{source!r} is not on the map")
+        roads = self._roads
+        minutes = {source: 0}
+        previous = {}
+        done = set()
+        queue = [(0, source)]
+        while queue:
+            so_far, place = heapq.heappop(queue)
+            if place in done:
+                continue # An older, longer entry for a place already settled
+            done.add(place)
+            for neighbour, length in roads[place].items():
+                total = so_far + length
+                if total < minutes.get(neighbour, total + 1):
+                    minutes[neighbour] = total
+                    previous[neighbour] = place
+                    heapq.heappush(queue, (total, neighbour))
+        tree = (minutes, previous)
+        if self.caching:
+            self._trees[source] = tree
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return tree
+
+    # +route(start, end) (Public method)
+    def route(self, start, end):
+        """Returns the quickest Route from start to end (ValueError if there is none)."""
+        if self.caching:
+            route = self._routes.get((start, end))
+            if route is not None:
+                self._routes.move_to_end((start, end))
+                return route
+        minutes, previous = self.shortest_paths(start)
+        if end not in minutes:
+            if end not in self._roads:
+                raise ValueError(f"{end!r} is not on the map")
+            raise ValueError(f"There is no road from {start!r} to {end!r}")
+        stops = [end]
+        while stops[-1] != start:
+            stops.append(previous[stops[-1]])
+        stops.reverse()
+        route = Route(stops, minutes[end])
+        if self.caching:
+            self._routes[start, end] = route
+            if len(self._routes) > ROUTE_CACHE_SIZE:
+                self._routes.popitem(last=False)
+        return route
+
+    def travel_time(self, start, end):
+        """Minutes from start to end by the quickest route."""
+        return self.route(start, end).minutes
+
+    def __contains__(self, place):
+        """Checks whether a place is on the map."""
+        return place in self._roads
+
+    def __len__(self):
+        """Number of places."""
+        return len(self._roads)
+
+    def __str__(self):
+        """String representation of the SpringfieldMap."""
+        return f"Map of Springfield with {len(self._roads)} places and {len(self.roads())} roads"
+
+
+def create_springfield_map(catalog=None, caching=True):
+    """Builds the map from the roads of a catalog (the shipped one by default)."""
+    cast = catalog if catalog is not None else default_catalog()
+    springfield = SpringfieldMap(caching)
+    for a, b, minutes in cast.roads:
+        springfield.add_road(a, b, minutes)
+    return springfield
+
+
+if __name__ == "__main__":
+    springfield = create_springfield_map()
+    start = sys.argv[1] if len(sys.argv) > 1 else HOME
+    end = sys.argv[2] if len(sys.argv) > 2 else "Springfield Nuclear Power Plant"
+    print(springfield)
+    route = springfield.route(start, end)
+    print(f"{route} ({route.minutes} minutes)")
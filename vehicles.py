@@ -2,6 +2,22 @@
 vehicles.py - Contains classes for vehicles and their components in the Simpsons RPG
 """
 
+from simpsons_rpg import events
+from simpsons_rpg.flyweights import Flyweight, FlyweightRegistry
+from simpsons_rpg.messages import MESSAGES, NameList, say
+
+# Narration templates (see messages.py)
+_DRIVER_SET = MESSAGES["car.driver_set"]
+_NO_DRIVER = MESSAGES["car.no_driver"]
+_ALREADY_IN = MESSAGES["car.already_in"]
+_GETS_IN = MESSAGES["car.gets_in"]
+_GET_IN = MESSAGES["car.get_in"]
+_FULL = MESSAGES["car.full"]
+_GETS_OUT = MESSAGES["car.gets_out"]
+_NOT_IN = MESSAGES["car.not_in"]
+_DRIVEN = MESSAGES["car.driven"]
+_DRIVES = MESSAGES["car.drives"]
+
 # Composition Class (Whole)
 # Depicted by HomersCar *-- Engine and HomersCar *-- Wheel
 class HomersCar:
@@ -9,97 +25,477 @@ class HomersCar:
     Represents Homer's Car.
     Corresponds to the HomersCar class in the UML diagram.
     Composed of Engine and Wheels (the parts).
+    The "color model" label used in narration and the full string are
+    rendered once and re-rendered only when model, color, engine or
+    wheels are replaced (they are properties for that reason).
     """
-    def __init__(self, model, color):
+    __slots__ = ("_model", "_color", "_engine", "_wheels", "occupants", "driver",
+                 "_label", "_str", "map", "location", "_event_id")
+
+    def __init__(self, model, color, engine_type="V8", wheel_size=16):
         """Initializes Homer's Car."""
-        # Attributes: model, color (Public)
-        self.model = model
-        self.color = color
+        # Attributes: model, color (Public, via properties below)
+        self._model = model
+        self._color = color
         
-        # Composition: Car has exactly 1 Engine (created here)
-        # This is implemented by creating the Engine object within the Car constructor.
-        self.engine = Engine("V8") # Create the Engine part
+        # Composition: Car has exactly 1 Engine (chosen here)
+        # Parts are immutable flyweights, so identical engines are shared between cars.
+        self._engine = get_engine(engine_type) # Get the Engine part
         
-        # Composition: Car has exactly 4 Wheels (created here)
-        # This is implemented by creating the Wheel objects within the Car constructor.
-        self.wheels = [Wheel(16) for _ in range(4)] # Create 4 Wheel parts
+        # Composition: Car has exactly 4 Wheels (chosen here)
+        # The four identical wheels are the same shared Wheel object.
+        # A tuple, so the wheels can only be changed by replacing all of them.
+        self._wheels = (get_wheel(wheel_size),) * 4 # 4 Wheel parts
+
+        # Cached renderings
+        self._label = f"{color} {model}"
+        self._str = None
         
         # Aggregation: Car has 0..5 occupants
-        # This is implemented by holding a list of Simpson objects.
-        self.occupants = [] # Start with an empty list
+        # This is implemented by a fixed set of 5 seats (see SeatSlots below).
+        self.occupants = SeatSlots(5) # Start with every seat empty
         
         # Association: Car has 0 or 1 driver
         # This is implemented by holding a reference to a Simpson object, or None.
         self.driver = None # None indicates no driver (0)
 
+        # Where the car is, on which SpringfieldMap (None: the car is not on a map)
+        self.map = None
+        self.location = None
+
+        # Number of the car in event logs (0 until it is first recorded)
+        self._event_id = 0
+
+        if events.recorders:
+            events.record(events.CarBuilt(events.car_id(self), model, color))
+
+    # --- Public attributes that affect the car's string ---
+    @property
+    def model(self):
+        """The car's model."""
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+        self._label = f"{self._color} {model}"
+        self._str = None
+
+    @property
+    def color(self):
+        """The car's color."""
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        self._color = color
+        self._label = f"{color} {self._model}"
+        self._str = None
+
+    @property
+    def engine(self):
+        """The car's Engine part."""
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine):
+        self._engine = engine
+        self._str = None
+
+    @property
+    def wheels(self):
+        """The car's four Wheel parts (a tuple)."""
+        return self._wheels
+
+    @wheels.setter
+    def wheels(self, wheels):
+        self._wheels = tuple(wheels)
+        self._str = None
+
     # +set_driver(driver) (Public method)
     def set_driver(self, driver):
         """Sets or removes the driver of the car."""
         # This method demonstrates association - Car "has-a" driver
         self.driver = driver
+        if events.recorders:
+            events.record(events.DriverSet(events.car_id(self),
+                                           driver.name if driver else None))
         if driver:
-            print(f"{driver.name} is now driving the {self.color} {self.model}.")
+            say(_DRIVER_SET, driver.name, self._label)
         else:
-            print(f"The {self.color} {self.model} has no driver.")
+            say(_NO_DRIVER, self._label)
 
     # +add_occupant(occupant) (Public method)
     def add_occupant(self, occupant):
-        """Adds an occupant to the car."""
+        """Adds an occupant to the car. Returns True if they got a seat."""
         # This method demonstrates aggregation - Car "has" occupants
-        if len(self.occupants) < 5: # Check multiplicity constraint (0..5)
-            self.occupants.append(occupant)
-            print(f"{occupant.name} gets in the {self.color} {self.model}.")
-        else:
-            print(f"The {self.color} {self.model} is full! {occupant.name} can't get in.")
+        if occupant in self.occupants:
+            say(_ALREADY_IN, occupant.name, self._label)
+            return False
+        if self.occupants.add(occupant) is not None: # Fails when all 5 seats are taken (0..5)
+            if events.recorders:
+                events.record(events.OccupantAdded(events.car_id(self), occupant.name))
+            say(_GETS_IN, occupant.name, self._label)
+            return True
+        say(_FULL, self._label, occupant.name)
+        return False
+
+    # +add_occupants(occupants) (Public method)
+    def add_occupants(self, occupants):
+        """
+        Seats several occupants in one go, in order, until the car is full.
+        Produces one narration line for the whole group and returns the
+        occupants that did not fit.
+        """
+        seated = []
+        left_out = []
+        for occupant in occupants:
+            if occupant in self.occupants:
+                continue
+            if self.occupants.add(occupant) is None:
+                left_out.append(occupant)
+            else:
+                seated.append(occupant)
+                if events.recorders:
+                    events.record(events.OccupantAdded(events.car_id(self), occupant.name))
+        if len(seated) == 1:
+            say(_GETS_IN, seated[0].name, self._label)
+        elif seated:
+            say(_GET_IN, NameList(seated), self._label)
+        if left_out:
+            say(_FULL, self._label, NameList(left_out))
+        return left_out
 
     # +remove_occupant(occupant) (Public method)
     def remove_occupant(self, occupant):
         """Removes an occupant from the car."""
         # This method demonstrates aggregation - Car "has" occupants
-        if occupant in self.occupants:
-            self.occupants.remove(occupant)
-            print(f"{occupant.name} gets out of the {self.color} {self.model}.")
+        if self.occupants.remove(occupant):
+            if events.recorders:
+                events.record(events.OccupantRemoved(events.car_id(self), occupant.name))
+            say(_GETS_OUT, occupant.name, self._label)
+        else:
+            say(_NOT_IN, occupant.name, self._label)
+
+    # +drive_to(destination) (Public method)
+    def drive_to(self, destination):
+        """
+        Drives the car to 'destination' by the quickest route on its map and
+        returns the Route. A car that is not on a map (no map or no location),
+        or whose map has no route there (a place off the map, or no road to
+        it), just ends up at 'destination', without narration, and returns
+        None, so callers can fall back to their own narration.
+        """
+        if self.map is None or self.location is None:
+            self.location = destination
+            return None
+        try:
+            route = self.map.route(self.location, destination) # Cached by the map
+        except ValueError:
+            self.location = destination
+            return None
+        self.location = destination
+        if self.driver:
+            say(_DRIVEN, self.driver.name, self._label, destination, route, route.minutes)
         else:
-            print(f"{occupant.name} is not in the {self.color} {self.model}.")
+            say(_DRIVES, self._label, destination, route, route.minutes)
+        return route
 
     def __str__(self):
         """String representation of the Car, including composed parts."""
         # This method demonstrates composition - Car "is made of" Engine and Wheels
-        return (f"{self.color} {self.model} with {self.engine} and "
-                f"{len(self.wheels)} {self.wheels[0]}")
+        if self._str is None:
+            self._str = (f"{self._label} with {self._engine} and "
+                         f"{len(self._wheels)} {self._wheels[0]}")
+        return self._str
+
+
+# Occupancy structure for HomersCar
+# Seat counts up to this are searched by scanning the seats, which is faster
+# than a dictionary at that size and keeps every car small
+_SCAN_LIMIT = 8
+
+
+class SeatSlots:
+    """
+    A fixed number of seats.
+    Every car has one, so the state is kept small: the occupant of each
+    seat (a list), the free seats as the bits of an int (the lowest free
+    seat is filled first) and, only above _SCAN_LIMIT seats, a dictionary
+    from occupant to seat. Smaller cars scan their few seats instead, so
+    adding, removing and 'in' checks are O(1) for every capacity.
+    Occupants are matched by identity. Iterating yields them in seat order.
+    """
+    __slots__ = ("_seats", "_seat_of", "_free")
+
+    def __init__(self, capacity):
+        """Initializes 'capacity' empty seats."""
+        self._seats = [None] * capacity
+        self._seat_of = {} if capacity > _SCAN_LIMIT else None
+        self._free = (1 << capacity) - 1 # Bit n is set while seat n is free
+
+    @classmethod
+    def from_seats(cls, seats):
+        """Builds the seats from a list holding an occupant (or None) per seat."""
+        slots = cls(len(seats))
+        for seat, occupant in enumerate(seats):
+            if occupant is not None:
+                slots._seats[seat] = occupant
+                slots._free ^= 1 << seat
+                if slots._seat_of is not None:
+                    slots._seat_of[occupant] = seat
+        return slots
+
+    def seats(self):
+        """Returns a list with the occupant (or None) of every seat."""
+        return list(self._seats)
+
+    @property
+    def capacity(self):
+        """Total number of seats."""
+        return len(self._seats)
+
+    @property
+    def free_seats(self):
+        """Number of empty seats."""
+        return self._free.bit_count()
+
+    def add(self, occupant):
+        """Seats an occupant and returns the seat number, or None if the car is full."""
+        if not self._free or self.seat_of(occupant) is not None:
+            return None
+        seat = (self._free & -self._free).bit_length() - 1 # Lowest set bit
+        self._free ^= 1 << seat
+        self._seats[seat] = occupant
+        if self._seat_of is not None:
+            self._seat_of[occupant] = seat
+        return seat
+
+    def remove(self, occupant):
+        """Frees an occupant's seat. Returns False if they were not seated."""
+        seat = self.seat_of(occupant)
+        if seat is None:
+            return False
+        self._seats[seat] = None
+        self._free |= 1 << seat
+        if self._seat_of is not None:
+            del self._seat_of[occupant]
+        return True
+
+    def seat_of(self, occupant):
+        """Returns the seat number of an occupant, or None."""
+        if self._seat_of is not None:
+            return self._seat_of.get(occupant)
+        for seat, seated in enumerate(self._seats):
+            if seated is occupant:
+                return seat
+        return None
+
+    def __contains__(self, occupant):
+        """Whether an occupant is seated."""
+        return self.seat_of(occupant) is not None
+
+    def __len__(self):
+        """Number of seated occupants."""
+        return len(self._seats) - self._free.bit_count()
+
+    def __iter__(self):
+        """Iterates over the occupants in seat order."""
+        return (occupant for occupant in self._seats if occupant is not None)
+
+
+class SeatingReport:
+    """
+    The result of seat_families: who sits in which car and who was left behind.
+    """
+    def __init__(self):
+        """Initializes an empty report."""
+        # {car: [occupants seated by this call]}
+        self.assignments = {}
+        self.left_behind = []
+
+    def __str__(self):
+        """String representation of the report."""
+        lines = [f"{car.color} {car.model}: {NameList(people)}"
+                 for car, people in self.assignments.items()]
+        if self.left_behind:
+            lines.append(f"Left behind: {NameList(self.left_behind)}")
+        return "\n".join(lines)
+
+
+def seat_families(families, cars):
+    """
+    Assigns whole families to a fleet of cars in one call.
+    Each family goes into the car whose free seats fit it most tightly, so
+    families stay together when possible; a family that fits nowhere is
+    spread over the emptiest cars. 'families' may hold Family objects or
+    plain lists of members. A character in several families is seated
+    once, with the first of them, and anyone already sitting in one of
+    the cars stays where they are. Returns a SeatingReport.
+    Cars are bucketed by their number of free seats, so finding a car is
+    O(capacity) instead of a scan over the fleet.
+    """
+    cars = list(cars)
+    most_seats = max((car.occupants.capacity for car in cars), default=0)
+    buckets = [[] for _ in range(most_seats + 1)]
+    for car in cars:
+        buckets[car.occupants.free_seats].append(car)
+
+    report = SeatingReport()
+    # id() of everyone already handled, starting with whoever already sits in the fleet
+    placed = {id(occupant) for car in cars
+              for occupant in car.occupants.seats() if occupant is not None}
+    for family in families:
+        waiting = []
+        for member in getattr(family, "members", family):
+            if id(member) not in placed:
+                placed.add(id(member))
+                waiting.append(member)
+        while waiting:
+            # Tightest car that takes everyone still waiting...
+            free = next((k for k in range(len(waiting), most_seats + 1) if buckets[k]), None)
+            # ...or else the emptiest car there is
+            if free is None:
+                free = next((k for k in range(most_seats, 0, -1) if buckets[k]), None)
+            if free is None:
+                report.left_behind.extend(waiting)
+                break
+            car = buckets[free].pop()
+            group, waiting = waiting[:free], waiting[free:]
+            report.left_behind.extend(car.add_occupants(group))
+            # add_occupants may still turn someone away, so check who is seated
+            # now and recount the car's free seats
+            report.assignments.setdefault(car, []).extend(
+                p for p in group if car.occupants.seat_of(p) is not None)
+            buckets[car.occupants.free_seats].append(car)
+    return report
 
 
 # Composition Class (Part in HomersCar composition)
-class Engine:
+class Engine(Flyweight):
     """
     Represents a Car Engine.
     Corresponds to the Engine class in the UML diagram.
     Part of HomersCar composition.
     """
+    __slots__ = ("type",)
+
     def __init__(self, type):
         """Initializes an Engine."""
-        # Attribute: type (Public)
-        self.type = type
+        # Attribute: type (Public, read-only - engines are shared flyweights)
+        object.__setattr__(self, "type", type)
+        object.__setattr__(self, "_str", f"{type} Engine") # Rendered once
         # No back-reference to Car usually in Composition part - highlights dependency on the whole
 
     def __str__(self):
         """String representation of Engine."""
-        return f"{self.type} Engine"
+        return self._str
 
 
 # Composition Class (Part in HomersCar composition)
-class Wheel:
+class Wheel(Flyweight):
     """
     Represents a Car Wheel.
     Corresponds to the Wheel class in the UML diagram.
     Part of HomersCar composition.
     """
+    __slots__ = ("size",)
+
     def __init__(self, size):
         """Initializes a Wheel."""
-        # Attribute: size (Public)
-        self.size = size
+        # Attribute: size (Public, read-only - wheels are shared flyweights)
+        object.__setattr__(self, "size", size)
+        object.__setattr__(self, "_str", f"{size}-inch Wheels") # Rendered once
         # No back-reference to Car usually in Composition part - highlights dependency on the whole
 
     def __str__(self):
         """String representation of Wheel."""
-        return f"{self.size}-inch Wheels"
+        return self._str
+
+
+# --- Flyweight Registries ---
+# Car parts are shared: every car with a V8 uses the same Engine object.
+ENGINES = FlyweightRegistry(Engine, maxsize=64)
+WHEELS = FlyweightRegistry(Wheel, maxsize=64)
+
+
+def get_engine(type):
+    """Returns the shared Engine for a type."""
+    return ENGINES.get(type)
+
+
+def get_wheel(size):
+    """Returns the shared Wheel for a size."""
+    return WHEELS.get(size)
+
+
+# Largest number an unsigned 16-bit ("H") array entry can hold
+_MAX_CODE = 0xFFFF
+
+
+# Struct-of-arrays store for many cars
+class CarFleet:
+    """
+    Stores the parts of many cars as flat arrays instead of objects.
+    One array holds an engine type code per car and one holds the four
+    wheel sizes of every car back to back, so a car costs a few bytes
+    instead of six objects. Cars are addressed by index; car(i) builds a
+    full HomersCar with the same attributes when one is needed.
+    Both arrays hold unsigned 16-bit numbers: wheel sizes must be whole
+    inches from 0 to 65535, and a fleet can have up to 65536 engine types.
+    """
+    __slots__ = ("models", "colors", "engine_codes", "wheel_sizes", "_engine_types", "_engine_ids")
+
+    def __init__(self):
+        """Initializes an empty fleet."""
+        from array import array # Only fleets need it
+        self.models = []
+        self.colors = []
+        # One entry per car: index into _engine_types
+        self.engine_codes = array("H")
+        # Four entries per car: wheel sizes in inches
+        self.wheel_sizes = array("H")
+        # Engine types are stored once and referred to by code
+        self._engine_types = []
+        self._engine_ids = {}
+
+    def __len__(self):
+        """Number of cars in the fleet."""
+        return len(self.models)
+
+    # +add_car(model, color, engine_type, wheel_size) (Public method)
+    def add_car(self, model, color, engine_type="V8", wheel_size=16):
+        """
+        Adds a car to the fleet and returns its index.
+        Raises ValueError, before anything is stored, if the wheel size or a
+        new engine type does not fit the arrays.
+        """
+        # Checked first, so a car that does not fit leaves every column untouched
+        if not isinstance(wheel_size, int) or not 0 <= wheel_size <= _MAX_CODE:
+            raise ValueError(f"CarFleet wheel sizes are whole inches from 0 to {_MAX_CODE}, "
+                             f"not {wheel_size!r}")
+        code = self._engine_ids.get(engine_type)
+        if code is None:
+            if len(self._engine_types) > _MAX_CODE:
+                raise ValueError(f"CarFleet holds at most {_MAX_CODE + 1} engine types")
+            code = self._engine_ids[engine_type] = len(self._engine_types)
+            self._engine_types.append(engine_type)
+        self.models.append(model)
+        self.colors.append(color)
+        self.engine_codes.append(code)
+        self.wheel_sizes.extend((wheel_size,) * 4)
+        return len(self.models) - 1
+
+    def engine_type(self, index):
+        """Returns the engine type of car 'index'."""
+        return self._engine_types[self.engine_codes[index]]
+
+    def wheel_sizes_of(self, index):
+        """Returns the four wheel sizes of car 'index'."""
+        return self.wheel_sizes[4 * index:4 * index + 4]
+
+    def car(self, index):
+        """Builds a HomersCar object for car 'index'."""
+        car = HomersCar(self.models[index], self.colors[index], self.engine_type(index))
+        car.wheels = [get_wheel(size) for size in self.wheel_sizes_of(index)]
+        return car
@@ -0,0 +1,84 @@
+"""
+world.py - Contains the World class that holds one simulated Springfield
+
+run_game creates its objects as local variables. A World keeps the same
+objects together (families, cars, characters, places and items) so that
+they can be saved, restored, scheduled or exported as a whole.
+"""
+
+from simpsons_rpg.catalog import default_catalog
+from simpsons_rpg.vehicles import HomersCar
+
+
+class World:
+    """
+    Everything in one simulated Springfield.
+    Families are keyed by last name, characters and places by name and
+    items by a short key (e.g. "duff"); cars are kept in a list.
+    """
+    __slots__ = ("families", "cars", "characters", "places", "items")
+
+    def __init__(self):
+        """Initializes an empty world."""
+        self.families = {}
+        self.cars = []
+        self.characters = {}
+        self.places = {}
+        self.items = {}
+
+    # +add_family(family) (Public method)
+    def add_family(self, family):
+        """Adds a family and its members to the world."""
+        self.families[family.lastName] = family
+        for member in family.members:
+            self.characters[member.name] = member
+
+    def __str__(self):
+        """String representation of the World."""
+        return (f"World with {len(self.families)} families, {len(self.characters)} characters "
+                f"and {len(self.cars)} cars")
+
+
+def create_simpsons_world():
+    """
+    Builds the world of run_game: the five Simpsons, their car (driven by
+    Homer), Bart's skateboard, Lisa's saxophone, a Duff and the plant.
+    The relationships narrate as usual; silence them with a NullSink.
+    """
+    world = World()
+    cast = default_catalog()
+    plant = cast.place("plant")
+    world.places[plant.name] = plant
+    for key in ("duff", "skateboard", "saxophone"):
+        world.items[key] = cast.item(key)
+
+    family = cast.create_family("Simpson")
+    world.add_family(family)
+    homer, bart = family.get("Homer"), family.get("Bart")
+
+    bart.set_skateboard(world.items["skateboard"])
+    car = HomersCar("Sedan", "Pink")
+    homer.car = car
+    car.set_driver(homer)
+    world.cars.append(car)
+    return world
+
+
+def create_catalog_world(catalog=None):
+    """
+    Builds a world with everyone in a catalog (the shipped one by default):
+    every family, every resident without a family, every place and item.
+    """
+    cast = catalog if catalog is not None else default_catalog()
+    world = World()
+    for key in cast.places:
+        place = cast.place(key)
+        world.places[place.name] = place
+    for key in cast.items:
+        world.items[key] = cast.item(key)
+    for last_name in cast.family_names():
+        world.add_family(cast.create_family(last_name))
+    for record in cast.characters:
+        if record[5] is None: # Residents without a family
+            world.characters[record[1]] = cast.create(record[1])
+    return world